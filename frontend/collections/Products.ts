@@ -257,6 +257,15 @@ export const Products: CollectionConfig = {
                     { name: 'costPrice', label: 'Собівартість', type: 'number', min: 0 },
                   ],
                 },
+                {
+                  type: 'row',
+                  fields: [
+                    { name: 'quantity', label: 'Обʼєм / вага', type: 'number', min: 0, index: true },
+                    { name: 'unit', label: 'Одиниця', type: 'select', index: true, options: [{ label: 'мл', value: 'ml' }, { label: 'г', value: 'g' }] },
+                    { name: 'pricePer100', label: 'Ціна за 100 мл/г', type: 'number', min: 0, index: true },
+                    { name: 'costPer100', label: 'Собівартість за 100 мл/г', type: 'number', min: 0 },
+                  ],
+                },
                 {
                   type: 'row',
                   fields: [
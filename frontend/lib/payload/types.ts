@@ -185,6 +185,10 @@ export interface PayloadVariant {
   compareAtPrice?: number
   supplierCode?: string
   articleCode?: string
+  quantity?: number | null
+  unit?: 'ml' | 'g' | null
+  pricePer100?: number | null
+  costPer100?: number | null
   inStock: boolean
   inventory: number
 }
@@ -0,0 +1,1054 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the catalog extraction code in extract-catalog-data.py.
+Runs against synthetic data (generated supplier catalogs included), no
+catalog files needed. Results are appended to bench-results.jsonl so runs
+can be compared; --check fails when throughput regresses.
+
+Usage: python scripts/bench-catalog.py [--rows 100000] [--titles 200000] [--no-legacy]
+                                       [--products 3000] [--xls-rows 20000] [--image-pages 40]
+                                       [--check [--threshold 0.2]] [--no-save]
+"""
+import sys
+import os
+import io
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+import importlib.util
+import re
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(BASE_DIR, 'bench-results.jsonl')
+# Earlier runs (with the same sizes) that --check compares against
+BASELINE_RUNS = 5
+
+
+def load_extractor():
+    """Import extract-catalog-data.py (not importable by name because of the dashes)."""
+    spec = importlib.util.spec_from_file_location(
+        'extract_catalog_data', os.path.join(BASE_DIR, 'extract-catalog-data.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # so inspect finds the source of its classes (cache keys)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ═══════════════════════════════════════════════════════════════
+# ELGON XLS
+# ═══════════════════════════════════════════════════════════════
+def synthetic_elgon_frame(rows, seed=0):
+    """Elgon-like price sheet: 10 header lines, nested category rows, products."""
+    rng = random.Random(seed)
+    lines = ['Прайс-лист', 'Elgon'] + [''] * 8
+    data = [[None, None, None, line or None, None, None] for line in lines]
+    series = ['Догляд', 'Фарба для волосся', 'AFFIXX', 'YES Essential', 'Primaria']
+    volumes = ['100 мл', '250 мл', '1000 мл', '500 гр', '50 ml']
+    while len(data) < rows + 10:
+        r = rng.random()
+        if r < 0.05:
+            indent = ' ' * rng.choice([0, 2, 4, 6])
+            data.append([None, None, None, f"{indent}{rng.choice(series)} {rng.randint(1, 99)}", None, None])
+        elif r < 0.07:
+            data.append([None, None, None, None, None, None])
+        else:
+            cost = rng.choice([rng.randint(50, 2000), rng.uniform(50, 2000), None, 0, 'н/д'])
+            price = rng.choice([rng.randint(80, 3000), rng.uniform(80, 3000), None])
+            data.append([
+                None,
+                f"EL{len(data):07d}",
+                rng.choice([rng.randint(10000, 99999), None]),
+                f"        Шампунь Elgon {rng.randint(1, 999)}, {rng.choice(volumes)}",
+                cost,
+                price,
+            ])
+    return pd.DataFrame(data)
+
+
+def legacy_parse_elgon_frame(df, extract_volume):
+    """The original row-by-row parse_elgon loop, kept as a reference."""
+    products = []
+    current_categories = []
+    for i in range(10, len(df)):
+        row = df.iloc[i]
+        art = str(row[1]).strip() if pd.notna(row[1]) else ''
+        code = str(row[2]).strip() if pd.notna(row[2]) else ''
+        name_raw = str(row[3]) if pd.notna(row[3]) else ''
+        name = name_raw.strip()
+        cost_val = row[4] if pd.notna(row[4]) else None
+        price_val = row[5] if pd.notna(row[5]) else None
+        if not name:
+            continue
+        indent = len(name_raw) - len(name_raw.lstrip())
+        if not art:
+            current_categories = [(lvl, cat) for lvl, cat in current_categories if lvl < indent]
+            current_categories.append((indent, name))
+            continue
+        try:
+            cost = int(float(cost_val)) if cost_val else None
+            price = int(float(price_val)) if price_val else None
+        except (ValueError, TypeError):
+            cost = None
+            price = None
+        if not price and not cost:
+            continue
+        cat_name = current_categories[-1][1] if current_categories else ''
+        products.append({
+            'title': name, 'brand': 'elgon', 'categoryHint': cat_name,
+            'articleCode': art, 'supplierCode': code, 'price': price,
+            'costPrice': cost, 'volume': extract_volume(name), 'inStock': True,
+        })
+    return products
+
+
+def bench_elgon(extractor, rows, results, legacy=True):
+    print(f"\n📊 Elgon XLS parsing — {rows:,} synthetic rows")
+    df = synthetic_elgon_frame(rows)
+
+    start = time.perf_counter()
+    products = extractor.parse_elgon_frame(df)
+    elapsed = time.perf_counter() - start
+    print(f"  column-wise: {elapsed:7.3f}s  {rows / elapsed:12,.0f} rows/s  ({len(products):,} products)")
+    results['parse_elgon_frame'] = {'seconds': round(elapsed, 4), 'rate': round(rows / elapsed, 1), 'unit': 'rows/s'}
+
+    if legacy:
+        start = time.perf_counter()
+        expected = legacy_parse_elgon_frame(df, extractor.extract_volume)
+        legacy_elapsed = time.perf_counter() - start
+        print(f"  row-by-row:  {legacy_elapsed:7.3f}s  {rows / legacy_elapsed:12,.0f} rows/s")
+        print(f"  speedup:     {legacy_elapsed / elapsed:.1f}x")
+        print(f"  identical output: {'yes' if products == expected else 'NO'}")
+        return products == expected
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════
+# TEXT NORMALIZATION
+# ═══════════════════════════════════════════════════════════════
+LEGACY_TRANSLITERATION = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ye', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'yi', 'й': 'y',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'yu', 'я': 'ya', 'ъ': '', 'ы': 'y',
+    'э': 'e', "'": '',
+}
+
+
+def legacy_slugify_extract(text):
+    """The original slugify from extract-catalog-data.py."""
+    text = text.lower().strip()
+    result = []
+    for ch in text:
+        if ch in LEGACY_TRANSLITERATION:
+            result.append(LEGACY_TRANSLITERATION[ch])
+        elif ch.isascii() and (ch.isalnum() or ch == '-'):
+            result.append(ch)
+        elif ch in (' ', '_', '.', '/'):
+            result.append('-')
+    slug = '-'.join(part for part in ''.join(result).split('-') if part)
+    return slug[:80]
+
+
+def legacy_slugify_seed(text):
+    """The original slugify from seed-payload.py."""
+    lower = text.lower().strip()
+    result = []
+    for ch in lower:
+        if ch in LEGACY_TRANSLITERATION:
+            result.append(LEGACY_TRANSLITERATION[ch])
+        elif re.match(r'[a-z0-9-]', ch):
+            result.append(ch)
+        elif ch in ' _./':
+            result.append('-')
+    slug = re.sub(r'-+', '-', ''.join(result)).strip('-')
+    return slug[:80]
+
+
+def legacy_extract_volume(name):
+    """The original extract_volume."""
+    m = re.search(r'(\d+)\s*(мл|гр|ml|gr|g)\b', name, re.IGNORECASE)
+    if m:
+        return f"{m.group(1)} {m.group(2).lower()}"
+    m = re.search(r'(\d+)\s*(мл|гр)', name)
+    if m:
+        return f"{m.group(1)} {m.group(2)}"
+    return None
+
+
+def synthetic_titles(count, seed=0):
+    """Product-title-like strings, plus separators, case and Unicode edge cases."""
+    rng = random.Random(seed)
+    words = ['Шампунь', 'маска', 'для', 'ФАРБОВАНОГО', 'волосся', "М'ЯКИЙ", 'Ґудзик', 'щоденний',
+             'Elgon', 'MOOD', 'Ice-Cream', 'Style_In', 'pH', '5.5', 'N°7', 'Ø', 'ß', 'İstanbul',
+             'K', 'ёлка', 'ЪЫЭ', '---', ' / ', '  ', '\t', '№12', '№', '½']
+    volumes = ['250 мл', '250мл', '1000ML', '500 гр', '50 g', '100gr', '30 ГР', '75млx', '5 мл.', '']
+    titles = []
+    for _ in range(count):
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 12))]
+        parts.insert(rng.randint(0, len(parts)), rng.choice(volumes))
+        titles.append(rng.choice(['', ' ', '-', '_']).join(parts) + f" {rng.randint(1, 10**6)}")
+    return titles
+
+
+def _timed(func, items):
+    start = time.perf_counter()
+    result = [func(item) for item in items]
+    return result, time.perf_counter() - start
+
+
+def bench_text(text, count, results, legacy=True):
+    print(f"\n📊 Text normalization — {count:,} synthetic titles")
+    titles = synthetic_titles(count)
+
+    text.slugify.cache_clear()
+    text.extract_volume.cache_clear()
+    start = time.perf_counter()
+    slugs = text.slugify_all(titles)
+    slug_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    volumes = text.extract_volumes(titles)
+    volume_elapsed = time.perf_counter() - start
+    repeated = titles[-text.CACHE_SIZE:]
+    start = time.perf_counter()
+    text.slugify_all(repeated)
+    text.extract_volumes(repeated)
+    warm_elapsed = time.perf_counter() - start
+    print(f"  slugify:        {slug_elapsed:7.3f}s  {count / slug_elapsed:12,.0f} titles/s")
+    print(f"  extract_volume: {volume_elapsed:7.3f}s  {count / volume_elapsed:12,.0f} titles/s")
+    print(f"  both, cached:   {warm_elapsed:7.3f}s  {len(repeated) / warm_elapsed:12,.0f} titles/s")
+    results['slugify'] = {'seconds': round(slug_elapsed, 4), 'rate': round(count / slug_elapsed, 1), 'unit': 'titles/s'}
+    results['extract_volume'] = {'seconds': round(volume_elapsed, 4), 'rate': round(count / volume_elapsed, 1),
+                                 'unit': 'titles/s'}
+
+    if not legacy:
+        return True
+    ok = True
+    for label, legacy_func, elapsed, result in [
+        ('slugify (extract)', legacy_slugify_extract, slug_elapsed, slugs),
+        ('slugify (seed)', legacy_slugify_seed, slug_elapsed, slugs),
+        ('extract_volume', legacy_extract_volume, volume_elapsed, volumes),
+    ]:
+        expected, legacy_elapsed = _timed(legacy_func, titles)
+        same = result == expected
+        ok = ok and same
+        print(f"  legacy {label:18} {legacy_elapsed:7.3f}s  speedup {legacy_elapsed / elapsed:5.1f}x  "
+              f"identical output: {'yes' if same else 'NO'}")
+    return ok
+
+
+def load_text():
+    """Import catalog_text.py from this directory."""
+    sys.path.insert(0, BASE_DIR)
+    import catalog_text
+    return catalog_text
+
+
+# ═══════════════════════════════════════════════════════════════
+# CATEGORY ASSIGNMENT
+# ═══════════════════════════════════════════════════════════════
+def legacy_assign_category(product):
+    """The original if-chain assign_category, kept as the reference for CATEGORY_RULES."""
+    title = product['title'].lower()
+    hint = product.get('categoryHint', '').lower()
+
+    # Hair dye / color
+    if any(w in title for w in ['фарба', 'крем-фарба', 'color', 'colour']):
+        if any(w in title for w in ['безаміачн', 'bionic']):
+            return 'bezamіachna-farba'
+        if any(w in title for w in ['деміперманент', 'demi']):
+            return 'demipermanentna-farba'
+        return 'permanentna-farba'
+
+    # Toning
+    if any(w in title for w in ['тонуюч', 'i-care', 'i-light', 'тонер', 'tonalight', 'пігмент прямої']):
+        return 'tonuyuchi-zasoby'
+
+    # Oxidants
+    if any(w in title for w in ['окисл', 'оксид', 'окисник', 'активатор', 'activator', 'oxidant', 'oxydant']):
+        return 'okyslyuvachi'
+
+    # Bleach/lightening
+    if any(w in title for w in ['пудра', 'знебарвл', 'освітл', 'bleach', 'blonde', 'lightener']):
+        return 'osvitlennya-ta-znebarvlennya'
+
+    # Color masks
+    if any(w in hint for w in ['кольоров', 'terrae']):
+        return 'kolorovi-masky'
+
+    # Perm / waving
+    if any(w in title for w in ['завивк', 'waving', 'fixing lotion', 'біозавівк']):
+        return 'khimichna-zavyvka'
+
+    # Sets
+    if any(w in title for w in ['набір', 'gift box', 'kit']):
+        return 'nabory'
+
+    # Men
+    if any(w in title for w in ['man ', 'man,', 'для чоловік', 'elgon man']):
+        return 'dlya-cholovikiv'
+    if 'для чоловік' in hint:
+        return 'dlya-cholovikiv'
+
+    # Suncare
+    if any(w in title for w in ['сонцезахис', 'suncare', 'aftersun', 'sun ']):
+        return 'sontsezakhyst'
+    if 'suncare' in hint.lower():
+        return 'sontsezakhyst'
+
+    # Scalp care
+    if any(w in title for w in ['проти лупи', 'purifying', 'purif']):
+        return 'proty-lupy'
+    if any(w in title for w in ['проти випад', 'anti hairloss', 'stimulat', 'випадіння', 'anti-hairloss', 'scalp awake']):
+        return 'proty-vypadinnya'
+    if any(w in title for w in ['детокс', 'detox', 'пілінг', 'peeling', 'глибокого очищення шкіри', 'rebalancing', 'deep clean']):
+        return 'detoks'
+    if any(w in title for w in ['скальп', 'scalp', 'шкіри голови', 'шкіри гол']):
+        return 'skalp-doglyad'
+
+    # Color care
+    if any(w in title for w in ['colorcare', 'color protect', 'color sublime', 'за кольором', 'silver shamp', 'silver cond', 'anti-red', 'anti-yellow', 'фіолетовими пігмент', 'нейтралізац']):
+        return 'doglyad-za-kolorom'
+    if 'silver' in hint.lower() or 'anti-red' in hint.lower() or 'color' in hint.lower():
+        if not any(w in title for w in ['фарба', 'color,', 'крем-фарба']):
+            return 'doglyad-za-kolorom'
+
+    # Keratin
+    if any(w in title for w in ['кератин', 'keratin']):
+        return 'keratynovi-zasoby'
+
+    # Lamination
+    if any(w in title for w in ['ламінуванн', 'lamination']):
+        return 'laminuvannya'
+
+    # Ampoules
+    if any(w in title for w in ['ампул', 'лосьйон', 'lotion', 'концентрат', 'treatment']):
+        if 'випадіння' in title or 'hairloss' in title:
+            return 'proty-vypadinnya'
+        if 'лупи' in title or 'purif' in title:
+            return 'proty-lupy'
+        return 'ampuly-ta-kontsentraty'
+
+    # Styling products
+    if any(w in title for w in ['лак ', 'лак,', 'hairspray', 'hair spray', 'fix it', 'eco spray', 'total fix', 'logic style']):
+        return 'laky'
+    if any(w in title for w in ['мус ', 'мус,', 'mousse', 'піна', 'foam']):
+        return 'musy-ta-piny'
+    if any(w in title for w in ['паста', 'paste', 'віск', 'wax', 'гума', 'gum', 'гель', 'gel', 'пудра для об', 'hair lift', 'volumizing powder']):
+        if 'знебарвл' not in title:
+            return 'pasty-ta-vosky'
+    if any(w in title for w in ['термозахис', 'thermo', 'heat defend', 'straight look']):
+        return 'termozakhyst'
+    if any(w in hint for w in ['стайлінг', 'styling', 'affixx', 'bodyguard', 'style-in']):
+        return 'staylinh'
+
+    # Care products
+    if any(w in title for w in ['шампунь', 'shampoo', 'cleanser', 'cleancer']):
+        return 'shampuni'
+    if any(w in title for w in ['маска', 'mask', 'pack']):
+        return 'masky-ta-balzamy'
+    if any(w in title for w in ['кондиціонер', 'conditioner', 'бальзам']):
+        return 'kondytsionery'
+    if any(w in title for w in ['незмивн', 'leave-in', 'leave in', 'крем для', 'cream', 'флюїд', 'fluid', 'праймер', 'primer']):
+        return 'nezmyvni-zasoby'
+    if any(w in title for w in ['олія', 'oil', 'сироватк', 'serum']):
+        return 'oliyi-ta-syrovatky'
+    if any(w in title for w in ['спрей', 'spray', 'mist', 'тонік', 'tonic']):
+        return 'spreyi'
+
+    # Fallback to parent care
+    return 'doglyad-za-volossynam'
+
+
+def synthetic_category_products(extractor, count, seed=0):
+    """Titles and hints mixing CATEGORY_RULES keywords (any case, glued or split) with filler words."""
+    rng = random.Random(seed)
+    words = {'title': set(), 'hint': set()}
+    for _, required, excluded in extractor.CATEGORY_RULES:
+        for field, group in required + excluded:
+            words[field].update(group)
+    title_words = sorted(words['title'] | words['hint'])
+    hint_words = sorted(words['hint']) + ['DREAM CURLS', 'NEV COLOR', 'ФАРБА', 'Перманентна', 'KARYN']
+    filler = ['Elgon', 'MOOD', 'для', 'волосся', 'professional', '250 мл', 'N°7', 'man', 'sun', 'лак', 'мус']
+    products = []
+    for _ in range(count):
+        parts = [rng.choice(title_words) for _ in range(rng.randint(0, 3))]
+        parts += [rng.choice(filler) for _ in range(rng.randint(0, 4))]
+        rng.shuffle(parts)
+        title = ''.join(p + rng.choice([' ', ' ', ', ', '', '-']) for p in parts)
+        title = rng.choice([str.lower, str.upper, str.title, str])(title)
+        hint = rng.choice(['', '', rng.choice(hint_words), f"{rng.choice(hint_words)} {rng.choice(filler)}"])
+        products.append({'title': title, 'categoryHint': rng.choice([hint, hint.upper()])})
+    return products
+
+
+def bench_categories(extractor, count, results, legacy=True):
+    print(f"\n📊 Category assignment — {count:,} synthetic title/hint pairs")
+    products = synthetic_category_products(extractor, count)
+    extractor.CLASSIFIER.classify.cache_clear()
+    start = time.perf_counter()
+    extractor.assign_categories(products)
+    elapsed = time.perf_counter() - start
+    print(f"  classifier: {elapsed:7.3f}s  {count / elapsed:12,.0f} products/s")
+    results['assign_category'] = {'seconds': round(elapsed, 4), 'rate': round(count / elapsed, 1),
+                                  'unit': 'products/s'}
+
+    if not legacy:
+        return True
+    expected, legacy_elapsed = _timed(legacy_assign_category, products)
+    mismatches = [(p['title'], p['categoryHint'], p['category'], want)
+                  for p, want in zip(products, expected) if p['category'] != want]
+    print(f"  if-chain:   {legacy_elapsed:7.3f}s  {count / legacy_elapsed:12,.0f} products/s  "
+          f"speedup {legacy_elapsed / elapsed:5.1f}x")
+    print(f"  identical output: {'yes' if not mismatches else f'NO ({len(mismatches)} differ)'}")
+    for title, hint, got, want in mismatches[:5]:
+        print(f"    {title[:40]!r} / {hint[:20]!r}: {got} (if-chain: {want})")
+    return not mismatches
+
+
+# ═══════════════════════════════════════════════════════════════
+# SYNTHETIC CATALOGS
+# ═══════════════════════════════════════════════════════════════
+# Same file names and line layouts as the real supplier files, so the
+# extractor's find_* functions and parsers run unmodified against them.
+def _write_pdf(path, lines, per_page=45, images=()):
+    """PDF with `per_page` text lines per page; images = [(page, stream, rect)]."""
+    import fitz
+    doc = fitz.open()
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_text((40, 40), '\n'.join(lines[start:start + per_page]), fontname='china-s', fontsize=9)
+    for page_num, stream, rect in images:
+        doc[page_num % len(doc)].insert_image(fitz.Rect(*rect), stream=stream)
+    doc.save(path)
+    doc.close()
+
+
+def _photo(width, height, rng, image_format='JPEG', mode='RGB'):
+    """Noisy photo-like image, encoded."""
+    from PIL import Image
+    im = Image.effect_noise((width, height), rng.randint(20, 80)).convert(mode)
+    buf = io.BytesIO()
+    im.save(buf, image_format)
+    return buf.getvalue()
+
+
+def write_elgon_xls(path, rows, seed=0):
+    """Elgon price sheet (written as xlsx; pandas sniffs the format, not the suffix)."""
+    df = synthetic_elgon_frame(rows, seed)
+    tmp = path + '.xlsx'
+    df.to_excel(tmp, header=False, index=False, engine='openpyxl')
+    os.replace(tmp, path)
+
+
+def mood_lines(products, rng):
+    sections = ['DREAM CURLS', 'BODY BUILDER', 'ULTRA CARE', 'KERATIN', 'SUNCARE', 'DAILY']
+    lines = []
+    for n in range(products):
+        if n % 25 == 0:
+            lines.append(f"{rng.choice(sections)} line")
+        sku = 500000 + n
+        lines.append(f"Шампунь MOOD для волосся {n}")
+        lines.append(rng.choice([f"{sku}", f"{sku} - 250 мл", f"{sku}-1000 мл"]))
+        if rng.random() < 0.5:
+            lines.append(rng.choice(['250 мл', '100 гр', '50 ml']))
+        lines += ['Ціна салону', f"{rng.randint(100, 900)} грн", 'РРЦ', f"{rng.randint(100, 900)} грн"]
+    return lines
+
+
+def nevitaly_pages(products, rng):
+    sections = ['NEV COLOR', 'CURL SUBLIME', 'HYDRA SOURCE', 'DETOX', 'TERRAE', 'STYLING']
+    pages = []
+    for start in range(0, products, 8):
+        lines = [rng.choice(sections)]
+        for n in range(start, min(start + 8, products)):
+            lines += [f"Маска Nevitaly зволожуюча {n}", "Об'єм", f"{1000000 + n}",
+                      str(rng.choice([100, 250, 1000])), str(rng.randint(200, 3000)),
+                      str(rng.randint(200, 3000)), 'pH 5.5']
+        pages.append(lines)
+    return pages
+
+
+def inebrya_lines(products, rng, multiplier=1.0):
+    sections = ['НОВИНКИ', 'ФАРБА', 'ICE CREAM', 'KARYN', 'HAIR LIFT', 'Перманентна']
+    lines = []
+    for n in range(products):
+        if n % 20 == 0:
+            lines.append(rng.choice(sections))
+        lines += [f"{2000000 + n}", f"Шампунь Inebrya для волосся {n}", 'з олією льону',
+                  rng.choice(['250 мл', '1000 мл', '100 гр']),
+                  f"{int(rng.randint(100, 900) * multiplier)} грн", f"{int(rng.randint(100, 900) * multiplier)} грн"]
+    return lines
+
+
+def write_synthetic_catalogs(directory, products, xls_rows, seed=0):
+    """Price lists of every supplier; returns {name: (path, pages)}."""
+    import fitz
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    files = {
+        'elgon': os.path.join(directory, 'Elgon_price.xls'),
+        'mood': os.path.join(directory, 'MOOD price 2026.pdf'),
+        'nevitaly': os.path.join(directory, 'Kataloh Nevitaly prays.pdf'),
+        'inebrya': os.path.join(directory, 'Прайс Inebrya 2026 магазини друк.pdf'),
+    }
+    write_elgon_xls(files['elgon'], xls_rows, seed)
+    _write_pdf(files['mood'], mood_lines(products, rng))
+    doc = fitz.open()
+    for lines in nevitaly_pages(products, rng):
+        doc.new_page().insert_text((40, 40), '\n'.join(lines), fontname='china-s', fontsize=9)
+    doc.save(files['nevitaly'])
+    doc.close()
+    _write_pdf(files['inebrya'], inebrya_lines(products, rng))
+    _write_pdf(os.path.join(directory, 'Прайс Inebrya 2026 салони друк.pdf'), inebrya_lines(products, rng, 0.7))
+
+    pages = {}
+    for name, path in files.items():
+        if path.endswith('.pdf'):
+            with fitz.open(path) as doc:
+                pages[name] = len(doc)
+        else:
+            pages[name] = None
+    return {name: (path, pages[name]) for name, path in files.items()}
+
+
+def write_image_catalog(directory, pages, seed=0):
+    """Image-heavy catalog PDF: per page a JPEG photo, a PNG with alpha and a small icon."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'Kataloh Elgon UA.pdf')
+    lines = [f"Сторінка каталогу {n}" for n in range(pages)]
+    images = []
+    for n in range(pages):
+        images.append((n, _photo(rng.randint(400, 1200), rng.randint(400, 1200), rng), (40, 80, 300, 340)))
+        images.append((n, _photo(rng.randint(200, 600), rng.randint(200, 600), rng, 'PNG', 'RGBA'), (320, 80, 560, 340)))
+        images.append((n, _photo(48, 48, rng, 'PNG'), (40, 400, 64, 424)))
+    _write_pdf(path, lines, per_page=1, images=images)
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARSER EQUIVALENCE
+# ═══════════════════════════════════════════════════════════════
+# The PDF price parsers as they were before LineTokenizer, run on the same
+# page texts as the current ones. They take page texts instead of a file.
+def legacy_parse_mood(extractor, pages):
+    products = []
+    seen = set()
+    current_section = ''
+    for previous, raw_line, following in extractor.iter_windows(extractor.iter_lines(pages), 7, 9):
+        line = raw_line.strip()
+
+        if line and len(line) > 3 and not any(c.isdigit() for c in line[:3]):
+            if any(kw in line.upper() for kw in ['DREAM CURLS', 'BODY BUILDER', 'ULTRA CARE', 'KERATIN',
+                'INTENSE REPAIR', 'SILVER SPECIFIC', 'DERMA CLEANSING', 'COLOR PROTECT',
+                'DAILY', 'CELL FORCE', 'BODYGUARD', 'SUNCARE', 'HAIR BODYGUARD']):
+                current_section = line
+                continue
+
+        sku_match = re.match(r'^(\d{6,10})\s*(?:-\s*)?(\d+\s*(?:мл|гр|ml))?\s*$', line)
+        if not sku_match:
+            sku_match = re.match(r'^(\d{6,10})\s*-\s*(\d+\s*(?:мл|гр|ml))\s*$', line)
+        if not sku_match:
+            sku_match = re.match(r'^(\d{6,10})$', line)
+        if not sku_match:
+            continue
+
+        sku = sku_match.group(1)
+        volume_from_sku = sku_match.group(2) if sku_match.lastindex and sku_match.lastindex >= 2 else None
+
+        name = ''
+        for prev_line in reversed(previous):
+            prev = prev_line.strip()
+            if prev and not re.match(r'^\d+\s*(грн|мл|гр|Vol|%)', prev) and len(prev) > 5:
+                if not re.match(r'^(Ціна|РРЦ|салону)', prev):
+                    name = prev
+                    break
+
+        cost_price = None
+        retail_price = None
+        volume = volume_from_sku
+        for following_line in following:
+            next_line = following_line.strip()
+            vol_m = re.match(r'^(\d+)\s*(мл|гр|ml)\s*$', next_line)
+            if vol_m and not volume:
+                volume = f"{vol_m.group(1)} {vol_m.group(2)}"
+                continue
+            price_m = re.match(r'^(\d+)\s*грн$', next_line)
+            if price_m:
+                val = int(price_m.group(1))
+                if cost_price is None:
+                    cost_price = val
+                elif retail_price is None:
+                    retail_price = val
+                    break
+                continue
+            if 'РРЦ' in next_line or 'салону' in next_line:
+                continue
+            if re.match(r'^(\d{6,10})', next_line):
+                break
+
+        if name and (retail_price or cost_price) and sku not in seen:
+            if retail_price and cost_price and retail_price < cost_price:
+                cost_price, retail_price = retail_price, cost_price
+            seen.add(sku)
+            products.append({
+                'title': name, 'brand': 'mood', 'categoryHint': current_section, 'articleCode': sku,
+                'supplierCode': '', 'price': retail_price or cost_price,
+                'costPrice': cost_price if retail_price else None, 'volume': volume, 'inStock': True,
+            })
+    return products
+
+
+def legacy_parse_nevitaly(pages):
+    products = []
+    for text in pages:
+        lines = text.split('\n')
+        current_section = ''
+        for i in range(len(lines)):
+            line = lines[i].strip()
+
+            for sec in ['NEV COLOR', 'CURL SUBLIME', 'FILLER SUBLIME', 'COLOR SUBLIME',
+                       'HYDRA SOURCE', 'SHIMMER', 'PRECIOUS', 'BLONDE SUBLIME', 'BLOND SUBLIME',
+                       'STYLING', 'GENTLE', 'SCALP', 'PURIFYING', 'ENERGY', 'SOOTHING',
+                       'DETOX', 'AHA', 'TERRAE', 'SYNUOSA']:
+                if sec in line.upper():
+                    current_section = line
+                    break
+
+            sku_m = re.match(r'^(10\d{5})\s*$', line)
+            if not sku_m:
+                sku_m = re.match(r'^(10\d{5,7})\s*$', line)
+            if not sku_m:
+                continue
+            sku = sku_m.group(1)
+
+            name = ''
+            for j in range(i-1, max(i-10, -1), -1):
+                prev = lines[j].strip()
+                if prev and len(prev) > 5 and not re.match(r'^[\d\s,\.грн]+$', prev):
+                    if not re.match(r'^(Об\'єм|Ціна|мл|грн|pH|рН)', prev):
+                        name = prev
+                        break
+
+            volume = None
+            cost_price = None
+            retail_price = None
+            for j in range(i-5, min(i+10, len(lines))):
+                check = lines[j].strip() if 0 <= j < len(lines) else ''
+                vol_m = re.match(r'^(\d+)$', check)
+                if vol_m and not volume:
+                    val = int(vol_m.group(1))
+                    if 50 <= val <= 1500:
+                        volume = f"{val} мл"
+                price_m = re.match(r'^(\d{3,5})$', check)
+                if price_m:
+                    val = int(price_m.group(1))
+                    if 200 <= val <= 5000:
+                        if cost_price is None:
+                            cost_price = val
+                        elif retail_price is None:
+                            retail_price = val
+
+            if name and (cost_price or retail_price):
+                if retail_price and cost_price and retail_price < cost_price:
+                    cost_price, retail_price = retail_price, cost_price
+                products.append({
+                    'title': name, 'brand': 'nevitaly', 'categoryHint': current_section, 'articleCode': sku,
+                    'supplierCode': '', 'price': retail_price or cost_price,
+                    'costPrice': cost_price if retail_price else None, 'volume': volume, 'inStock': True,
+                })
+    return _first_per_sku(products)
+
+
+def legacy_parse_inebrya_list(pages):
+    products = []
+    current_section = ''
+    for text in pages:
+        lines = text.split('\n')
+        for i in range(len(lines)):
+            line = lines[i].strip()
+
+            for sec in ['НОВИНКИ', 'ФАРБА', 'ОКИСНИК', 'ОСВІТЛЕННЯ', 'BLONDESSE',
+                       'ICE CREAM', 'STYLE-IN', 'SHECARE', 'COLOR PERFECT',
+                       'KARYN', 'HAIR LIFT', 'Перманентна', 'Деміперманентна']:
+                if sec in line:
+                    current_section = line
+                    break
+
+            sku_m = re.match(r'^(10\d{5})\s*$', line)
+            if not sku_m:
+                sku_m = re.match(r'^(\d{7})\s*$', line)
+            if not sku_m:
+                continue
+            sku = sku_m.group(1)
+
+            name = ''
+            volume = None
+            shop_price = None
+            retail_price = None
+            for j in range(i+1, min(i+12, len(lines))):
+                next_l = lines[j].strip()
+                if not name and len(next_l) > 10 and re.search(r'[а-яА-ЯіІїЇєЄґҐ]', next_l):
+                    if not re.match(r'^[\d\s,\.грн]+$', next_l):
+                        name = next_l
+                        if j+1 < len(lines):
+                            cont = lines[j+1].strip()
+                            if cont and re.search(r'[а-яА-ЯіІїЇєЄ]', cont) and not re.match(r'^\d+\s*(мл|гр|грн)', cont):
+                                if len(cont) > 3 and not re.match(r'^(Ціна|РРЦ)', cont):
+                                    name += ' ' + cont
+                        continue
+                vol_m = re.match(r'^(\d+)\s*(мл|гр)\s*$', next_l)
+                if vol_m:
+                    volume = f"{vol_m.group(1)} {vol_m.group(2)}"
+                    continue
+                price_m = re.match(r'^(\d+)\s*грн$', next_l)
+                if price_m:
+                    val = int(price_m.group(1))
+                    if shop_price is None:
+                        shop_price = val
+                    elif retail_price is None:
+                        retail_price = val
+                        break
+                if re.match(r'^\d{7}$', next_l):
+                    break
+
+            if name and (shop_price or retail_price):
+                if retail_price and shop_price and retail_price < shop_price:
+                    shop_price, retail_price = retail_price, shop_price
+                products.append({
+                    'title': name, 'brand': 'inebrya', 'categoryHint': current_section, 'articleCode': sku,
+                    'supplierCode': '', 'price': retail_price or shop_price,
+                    'costPrice': shop_price if retail_price else None, 'volume': volume, 'inStock': True,
+                })
+    return _first_per_sku(products)
+
+
+def _first_per_sku(products):
+    seen = set()
+    unique = []
+    for p in products:
+        if p['articleCode'] not in seen:
+            seen.add(p['articleCode'])
+            unique.append(p)
+    return unique
+
+
+NOISE_LINES = ['Ціна салону', 'РРЦ', "Об'єм", 'pH 5.5', 'рН 4', '250 мл', '1000 мл', '100 гр', '50 ml',
+               '350 грн', '1200', '75', '4500', '', '  ', '12 Vol', '6%', 'мл', 'Новинка 2026',
+               'Засіб для волосся Ультра', 'Маска відновлююча для пошкодженого волосся', 'ФАРБА Перманентна',
+               'DAILY care', 'NEV COLOR', '1000123', '5123456', '10012345', '517908 - 250 мл', 'з олією аргани']
+
+
+def noisy(lines, rng, rate=0.15):
+    """`lines` with lines randomly dropped, repeated and mixed with price-list-like noise."""
+    out = []
+    for line in lines:
+        r = rng.random()
+        if r < rate / 3:
+            continue
+        out.append(line)
+        if r > 1 - rate / 3:
+            out.append(line)
+        elif r > 1 - rate:
+            out.append(rng.choice(NOISE_LINES))
+    return out
+
+
+def write_noisy_catalogs(directory, products, seed=0):
+    """MOOD, Nevitaly and Inebrya shop price lists with noisy layouts; returns {brand: path}."""
+    import fitz
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    files = {
+        'mood': os.path.join(directory, 'MOOD price 2026.pdf'),
+        'nevitaly': os.path.join(directory, 'Kataloh Nevitaly prays.pdf'),
+        'inebrya': os.path.join(directory, 'Прайс Inebrya 2026 магазини друк.pdf'),
+    }
+    _write_pdf(files['mood'], noisy(mood_lines(products, rng), rng))
+    doc = fitz.open()
+    for lines in nevitaly_pages(products, rng):
+        doc.new_page().insert_text((40, 40), '\n'.join(noisy(lines, rng)), fontname='china-s', fontsize=9)
+    doc.save(files['nevitaly'])
+    doc.close()
+    _write_pdf(files['inebrya'], noisy(inebrya_lines(products, rng), rng))
+    return files
+
+
+def check_inebrya_continuation(extractor):
+    """The one intended difference from the legacy Inebrya parser: a name continuation line
+    whose only Cyrillic letter is ґ/Ґ is now joined to the name (LineTokenizer uses one
+    Cyrillic class for both lines), where the legacy parser left it out.
+
+    The page text is passed straight to the parser, the synthetic PDFs' font has no Ґ.
+    """
+    pages = ['\n'.join(['2000001', 'Шампунь Inebrya для волосся', 'Ґ-Pro complex', '250 мл', '300 грн', '450 грн',
+                        '2000002', 'Маска Inebrya для волосся', 'з олією льону', '250 мл', '320 грн', '480 грн'])]
+    iter_pdf_pages = extractor.iter_pdf_pages
+    extractor.iter_pdf_pages = lambda path, pool=None: iter(pages)
+    try:
+        result = extractor._parse_inebrya_list('Прайс Inebrya магазини.pdf')
+    finally:
+        extractor.iter_pdf_pages = iter_pdf_pages
+    expected = legacy_parse_inebrya_list(pages)
+    left_out = expected[0]['title'] == 'Шампунь Inebrya для волосся' and len(expected) == 2
+    expected[0] = {**expected[0], 'title': 'Шампунь Inebrya для волосся Ґ-Pro complex'}
+    same = left_out and result == expected
+    print(f"  inebrya   ґ/Ґ-only continuation joined, rest as legacy: {'yes' if same else 'NO'}")
+    return same
+
+
+def check_parsers(extractor, products, seed=0):
+    """Compare the tokenizer-based PDF parsers with the legacy ones on noisy synthetic price lists."""
+    print(f"\n📊 PDF parser equivalence — {products:,} noisy products per price list")
+    work = tempfile.mkdtemp(prefix='bench-parsers-')
+    try:
+        files = write_noisy_catalogs(work, products, seed)
+        extractor.USE_CACHE = False
+        extractor.CATALOG_DIR = work
+        checks = [
+            ('mood', lambda: extractor.parse_mood(), lambda pages: legacy_parse_mood(extractor, pages)),
+            ('nevitaly', lambda: extractor.parse_nevitaly(), legacy_parse_nevitaly),
+            ('inebrya', lambda: extractor._parse_inebrya_list(files['inebrya']), legacy_parse_inebrya_list),
+        ]
+        ok = True
+        for brand, parse, legacy_parse in checks:
+            result = _quiet(parse)
+            expected = legacy_parse(extractor.read_pdf_pages(files[brand]))
+            same = result == expected
+            ok = ok and same
+            print(f"  {brand:9} {len(result):6,} products  identical output: {'yes' if same else 'NO'}")
+        return check_inebrya_continuation(extractor) and ok
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# MISSING SOURCE FILES
+# ═══════════════════════════════════════════════════════════════
+def check_missing_source(extractor, products, xls_rows, seed=0):
+    """Extract twice, the second time with the MOOD price list gone or empty: products-mood
+    and its delta must stay as they were, so nothing is queued for retirement."""
+    print(f"\n📊 Missing source files — {products:,} products per PDF price list")
+    work = tempfile.mkdtemp(prefix='bench-missing-')
+    try:
+        catalogs = write_synthetic_catalogs(os.path.join(work, 'prices'), products, xls_rows, seed)
+        mood_pdf = catalogs['mood'][0]
+        original = shutil.copy(mood_pdf, os.path.join(work, 'mood.pdf'))
+        extractor.USE_CACHE = False
+        extractor.SEED_DIR = os.path.join(work, 'seed-data')
+        extractor.CATALOG_DIR = os.path.dirname(mood_pdf)
+        snapshot = os.path.join(extractor.SEED_DIR, 'products-mood.json')
+        ok = True
+        for argv in (['products'], ['products', '--merge-duplicates']):
+            for case in ('missing', 'empty'):
+                shutil.rmtree(extractor.SEED_DIR, ignore_errors=True)
+                shutil.copy(original, mood_pdf)
+                _quiet(extractor.extract, extractor.parse_args(argv))
+                with open(snapshot, 'rb') as f:
+                    before = f.read()
+                delta = extractor.load_delta(extractor.SEED_DIR)['mood']
+
+                os.remove(mood_pdf)
+                if case == 'empty':
+                    _write_pdf(mood_pdf, ['Прайс оновлюється'])
+                _quiet(extractor.extract, extractor.parse_args(argv))
+                with open(snapshot, 'rb') as f:
+                    kept = f.read() == before and extractor.load_delta(extractor.SEED_DIR)['mood'] == delta
+                ok = ok and kept
+                print(f"  {' '.join(argv):28} MOOD PDF {case:8} products-mood kept: {'yes' if kept else 'NO'}")
+        return ok
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARSER & IMAGE THROUGHPUT
+# ═══════════════════════════════════════════════════════════════
+def measure(func, memory=True):
+    """Run func twice: timed, then under tracemalloc. Returns (result, seconds, peak MB or None)."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _quiet(func, *args):
+    """Call func with its progress prints suppressed."""
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        return func(*args)
+    finally:
+        sys.stdout = stdout
+
+
+def bench_catalogs(extractor, products, xls_rows, image_pages, results, workers=1, memory=True):
+    print(f"\n📊 Supplier catalogs — {products:,} products per PDF price list, "
+          f"{xls_rows:,} XLS rows, {image_pages} image pages")
+    work = tempfile.mkdtemp(prefix='bench-catalog-')
+    try:
+        start = time.perf_counter()
+        catalogs = write_synthetic_catalogs(os.path.join(work, 'prices'), products, xls_rows)
+        image_pdf = write_image_catalog(os.path.join(work, 'images'), image_pages)
+        print(f"  generated in {time.perf_counter() - start:.1f}s")
+
+        extractor.USE_CACHE = False
+        extractor.SEED_DIR = os.path.join(work, 'seed-data')
+        extractor.CATALOG_DIR = os.path.join(work, 'prices')
+        for brand in ('elgon', 'mood', 'nevitaly', 'inebrya'):
+            parse = getattr(extractor, f"parse_{brand}")
+            path, pages = catalogs[brand]
+            items, elapsed, peak = measure(lambda: _quiet(parse), memory)
+            if isinstance(items, tuple):  # parsers joining two lists also return the join report
+                items = items[0]
+            if pages:
+                rate, unit = pages / elapsed, 'pages/s'
+            else:
+                rate, unit = xls_rows / elapsed, 'rows/s'
+            results[f"parse_{brand}"] = {'seconds': round(elapsed, 4), 'rate': round(rate, 1), 'unit': unit,
+                                         'peak_mb': peak and round(peak, 1), 'products': len(items)}
+            print(f"  parse_{brand:9} {elapsed:7.3f}s  {rate:10,.0f} {unit:8} {len(items) / elapsed:10,.0f} products/s"
+                  + (f"  peak {peak:6.1f} MB" if peak is not None else ''))
+
+        extractor.CATALOG_DIR = os.path.dirname(image_pdf)
+        pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
+
+        def run_images():
+            shutil.rmtree(extractor.SEED_DIR, ignore_errors=True)  # no blob reuse between runs
+            return _quiet(extractor.extract_images, pool)
+
+        try:
+            manifest, elapsed, peak = measure(run_images, memory)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        results['extract_images'] = {'seconds': round(elapsed, 4), 'rate': round(len(manifest) / elapsed, 1),
+                                     'unit': 'images/s', 'peak_mb': peak and round(peak, 1),
+                                     'pages_per_sec': round(image_pages / elapsed, 1)}
+        print(f"  extract_images  {elapsed:7.3f}s  {len(manifest) / elapsed:10,.1f} images/s "
+              f"{image_pages / elapsed:8,.1f} pages/s" + (f"  peak {peak:6.1f} MB" if peak is not None else ''))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESULTS & REGRESSION CHECK
+# ═══════════════════════════════════════════════════════════════
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_runs(path, params):
+    """Stored runs with the same benchmark parameters, oldest first."""
+    if not os.path.exists(path):
+        return []
+    runs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                if run.get('params') == params:
+                    runs.append(run)
+    return runs
+
+
+def check_regressions(results, runs, threshold):
+    """Compare each rate to the median of earlier runs; True if none dropped by more than threshold."""
+    if not runs:
+        print('\n  No earlier runs with these parameters to compare against')
+        return True
+    print(f"\n📉 Regression check (vs median of last {len(runs)} runs, threshold {threshold:.0%})")
+    ok = True
+    for name, result in results.items():
+        earlier = [run['results'][name]['rate'] for run in runs if name in run['results']]
+        if not earlier:
+            continue
+        baseline = statistics.median(earlier)
+        change = result['rate'] / baseline - 1
+        regressed = change < -threshold
+        ok = ok and not regressed
+        print(f"  {'FAIL' if regressed else 'ok':4}  {name:20} {result['rate']:12,.1f} {result['unit']:9} "
+              f"baseline {baseline:12,.1f}  {change:+6.1%}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark catalog extraction on synthetic data.')
+    parser.add_argument('--rows', type=int, default=100_000, help='rows in the synthetic Elgon sheet')
+    parser.add_argument('--titles', type=int, default=200_000, help='titles for the text normalization benchmark')
+    parser.add_argument('--no-legacy', action='store_true', help='skip the slow reference implementations')
+    parser.add_argument('--products', type=int, default=3000, help='products per synthetic PDF price list')
+    parser.add_argument('--xls-rows', type=int, default=20_000, help='rows in the synthetic Elgon XLS file')
+    parser.add_argument('--image-pages', type=int, default=40, help='pages of the synthetic image catalog')
+    parser.add_argument('--workers', type=int, default=1, help='process pool size for extract_images')
+    parser.add_argument('--no-catalogs', action='store_true', help='skip the synthetic catalog benchmarks')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak-memory runs')
+    parser.add_argument('--results', default=RESULTS_FILE, help='JSONL file runs are appended to')
+    parser.add_argument('--no-save', action='store_true', help='do not append this run to the results file')
+    parser.add_argument('--check', action='store_true',
+                        help=f'fail if a rate dropped vs the median of the last {BASELINE_RUNS} comparable runs')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative drop for --check (default 0.2)')
+    args = parser.parse_args()
+
+    print('=' * 60)
+    print('  HAIR LAB — Catalog Extraction Benchmarks')
+    print('=' * 60)
+
+    params = {'rows': args.rows, 'titles': args.titles, 'workers': args.workers,
+              'products': None if args.no_catalogs else args.products,
+              'xls_rows': None if args.no_catalogs else args.xls_rows,
+              'image_pages': None if args.no_catalogs else args.image_pages}
+    results = {}
+    extractor = load_extractor()
+    ok = bench_elgon(extractor, args.rows, results, legacy=not args.no_legacy)
+    ok = bench_text(load_text(), args.titles, results, legacy=not args.no_legacy) and ok
+    ok = bench_categories(extractor, args.titles, results, legacy=not args.no_legacy) and ok
+    if not args.no_catalogs and not args.no_legacy:
+        ok = check_parsers(extractor, args.products) and ok
+    if not args.no_catalogs:
+        ok = check_missing_source(extractor, args.products, args.xls_rows) and ok
+        bench_catalogs(extractor, args.products, args.xls_rows, args.image_pages, results,
+                       workers=args.workers, memory=not args.no_memory)
+
+    if args.check:
+        earlier = load_runs(args.results, params)[-BASELINE_RUNS:]
+        ok = check_regressions(results, earlier, args.threshold) and ok
+
+    if not args.no_save:
+        run = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'revision': git_revision(),
+               'python': sys.version.split()[0], 'params': params, 'results': results}
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run, ensure_ascii=False) + '\n')
+        print(f"\n  💾 Appended results to {os.path.relpath(args.results)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
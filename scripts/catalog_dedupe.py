@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate products across all parsed brands: the same product with
+different spacing, punctuation, volume spelling ('250ml' / '250 мл') or a
+reissued SKU, which the parsers' exact articleCode checks can't see.
+
+Titles are normalized and cut into character shingles, each title gets a
+MinHash signature, and locality-sensitive hashing (bands of the signature)
+puts similar titles in a shared bucket. Only titles sharing a bucket are
+compared, by exact shingle Jaccard similarity, so the cost grows roughly
+linearly with the catalog instead of with every pair of products. Products
+with different volumes are never duplicates (those are variants), nor are
+titles whose other numbers differ (shade 7/1 vs 7/11).
+
+Imported by extract-catalog-data.py (dedupe stage, duplicates-report.json).
+"""
+import re
+import zlib
+from collections import defaultdict
+
+from catalog_text import parse_quantity, strip_volume
+
+SHINGLE_SIZE = 4
+NUM_PERM = 120
+# 20 bands of 6 rows: a pair with Jaccard 0.8 shares a bucket 99.8% of the
+# time, 0.5 27% of the time, 0.3 1.4%
+BANDS = 20
+# Shingle Jaccard needed to report two products as duplicates / to auto-merge them
+DUPLICATE_THRESHOLD = 0.8
+MERGE_THRESHOLD = 0.9
+REPORT_FILE = 'duplicates-report.json'
+
+_PRIME = (1 << 31) - 1
+_CHUNK = 1024  # products per vectorized MinHash batch
+_NON_WORD = re.compile(r'[\W_]+')
+_DIGITS = re.compile(r'\d+')
+
+
+def normalize_title(title):
+    """Lowercase title with canonical volumes ('250мл', '0,25 l' -> '250 ml') and no punctuation."""
+    text = strip_volume(title.lower(), lambda quantity, unit: f" {quantity} {unit} ")
+    return _NON_WORD.sub(' ', text).strip()
+
+
+def volume_key(product):
+    """(quantity, unit) of a product's volume, from 'volume' or the title; None if unknown."""
+    quantity, unit = parse_quantity(product.get('volume'))
+    if quantity is None:
+        quantity, unit = parse_quantity(product.get('title', ''))
+    return None if quantity is None else (quantity, unit)
+
+
+def number_key(title):
+    """Numbers in a title other than its volume (shade, line or model numbers)."""
+    return _DIGITS.findall(strip_volume(title))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of `size`-character substrings (the whole text if shorter)."""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=1):
+    """(n, num_perm) uint32 array of MinHash signatures, one row per shingle set.
+
+    Every distinct shingle is hashed with CRC32 (stable across runs) and
+    permuted once with num_perm multiply-shift hashes ((a*x + b) mod 2^64) >> 32;
+    signatures are then batches of table lookups reduced per product with
+    reduceat. Catalog titles share most of their shingles, so the table is
+    far smaller than the total shingle count.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+    vocabulary = {}
+    ids = np.fromiter((vocabulary.setdefault(s, len(vocabulary)) for sh in shingle_sets for s in sh), dtype=np.intp)
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in vocabulary), dtype=np.uint64, count=len(vocabulary))
+    table = ((hashes[:, None] * a + b) >> np.uint64(32)).astype(np.uint32)  # (shingles, num_perm)
+
+    offsets = np.zeros(len(shingle_sets) + 1, dtype=np.intp)
+    np.cumsum([len(sh) for sh in shingle_sets], out=offsets[1:])
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    for start in range(0, len(shingle_sets), _CHUNK):
+        stop = min(start + _CHUNK, len(shingle_sets))
+        lo, hi = offsets[start], offsets[stop]
+        signatures[start:stop] = np.minimum.reduceat(table[ids[lo:hi]], offsets[start:stop] - lo, axis=0)
+    return signatures
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """Index pairs (i < j) that share at least one band bucket.
+
+    Each band of a signature is folded into one 64-bit bucket key, and
+    products are grouped by sorting the keys. Within a bucket each member is
+    paired with the first and with its predecessor: clustering is
+    transitive, so that finds the same groups as comparing every pair in the
+    bucket while staying linear in its size. (A key collision only adds a
+    candidate, which verification rejects.)
+    """
+    import numpy as np
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    weights = np.random.default_rng(0).integers(0, 1 << 63, rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    found = []
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        same = keys[order[1:]] == keys[order[:-1]]
+        starts = np.arange(n)
+        starts[1:][same] = 0
+        first = order[np.maximum.accumulate(starts)]  # first member of each product's bucket
+        pairs = np.stack([np.concatenate([order[:-1][same], first[1:][same]]),
+                          np.concatenate([order[1:][same], order[1:][same]])], axis=1)
+        found.append(pairs[pairs[:, 0] != pairs[:, 1]])
+    pairs = np.unique(np.sort(np.concatenate(found), axis=1), axis=0)
+    return [(int(i), int(j)) for i, j in pairs]
+
+
+def find_duplicates(products, threshold=DUPLICATE_THRESHOLD):
+    """Clusters of near-duplicate products.
+
+    Returns a list of (sorted product indices, [(i, j, similarity)] of the
+    verified pairs that joined them), in order of their first product.
+    """
+    if len(products) < 2:
+        return []
+    sets = [shingles(normalize_title(p['title'])) for p in products]
+    volumes = [volume_key(p) for p in products]
+
+    parent = list(range(len(products)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    numbers = [number_key(p['title']) for p in products]
+
+    edges = []
+    for i, j in lsh_candidates(minhash_signatures(sets)):
+        if numbers[i] != numbers[j] or (volumes[i] and volumes[j] and volumes[i] != volumes[j]):
+            continue
+        similarity = jaccard(sets[i], sets[j])
+        if similarity >= threshold:
+            edges.append((i, j, round(similarity, 3)))
+            parent[root(j)] = root(i)
+
+    clusters = defaultdict(list)
+    for i in range(len(products)):
+        clusters[root(i)].append(i)
+    cluster_edges = defaultdict(list)
+    for edge in edges:
+        cluster_edges[root(edge[0])].append(edge)
+    return [(members, cluster_edges[r]) for r, members in sorted(clusters.items(), key=lambda c: c[1][0])
+            if len(members) > 1]
+
+
+def duplicate_report(products, clusters, threshold=DUPLICATE_THRESHOLD, merge_threshold=MERGE_THRESHOLD):
+    """JSON-serializable review report; each cluster says whether the merge rule applies."""
+    report = []
+    for members, edges in clusters:
+        report.append({
+            'similarity': min(similarity for _, _, similarity in edges),
+            'merge': mergeable(products, members, merge_threshold),
+            'products': [
+                {field: products[i].get(field) for field in ('brand', 'articleCode', 'title', 'volume', 'price')}
+                for i in members
+            ],
+        })
+    return {
+        'threshold': threshold,
+        'mergeThreshold': merge_threshold,
+        'products': len(products),
+        'clusters': report,
+    }
+
+
+def mergeable(products, members, merge_threshold=MERGE_THRESHOLD):
+    """Auto-merge rule: one brand, and every member within merge_threshold of the first.
+
+    Clusters spanning brands are only reported: the brand decides which
+    supplier and CMS brand a product belongs to, so a person picks.
+    """
+    first = products[members[0]]
+    if any(products[i]['brand'] != first['brand'] for i in members):
+        return False
+    first_set = shingles(normalize_title(first['title']))
+    return all(jaccard(first_set, shingles(normalize_title(products[i]['title']))) >= merge_threshold
+               for i in members[1:])
+
+
+def merge_duplicates(products, clusters, merge_threshold=MERGE_THRESHOLD):
+    """Drop the later members of mergeable clusters; the first keeps their codes in 'mergedFrom'.
+
+    Returns (kept products, number dropped). The first member is the one
+    parsed first, so the result doesn't depend on which duplicate is newer.
+    """
+    dropped = set()
+    for members, _ in clusters:
+        if not mergeable(products, members, merge_threshold):
+            continue
+        first = products[members[0]]
+        first.setdefault('mergedFrom', []).extend(
+            {'articleCode': products[i].get('articleCode'), 'title': products[i]['title']} for i in members[1:])
+        dropped.update(members[1:])
+    return [p for i, p in enumerate(products) if i not in dropped], len(dropped)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Change sets between two extractions of a brand's product list, so seeding
+and price updates only touch what the supplier actually changed.
+
+Products are matched by articleCode within a brand (repeated codes get a
+'#2', '#3'... suffix in file order, products without one fall back to their
+title). The previous list is indexed once in a dict of key -> tracked field
+values, and the new list is streamed against it, so a diff is linear in
+the number of products.
+
+A delta stays in products-delta.json until it has been seeded: a new
+extraction of a brand is composed with the brand's unapplied delta
+(merge_delta), other brands' deltas are kept, and seed-payload.py --delta
+drops a brand once it applied it without errors.
+
+Imported by extract-catalog-data.py (writes products-delta.json) and
+seed-payload.py (--delta).
+"""
+import os
+import json
+from collections import Counter
+
+from catalog_ndjson import iter_records, ndjson_paths
+
+# Fields whose change makes a product 'changed'; the numeric volume and unit
+# prices are listed so a delta carries their new values to the seeder
+DELTA_FIELDS = ('price', 'costPrice', 'volume', 'category', 'quantity', 'unit', 'pricePer100', 'costPer100')
+DELTA_FILE = 'products-delta.json'
+
+
+def product_keys(products):
+    """Yield (key, product) for every product, keys unique within the list."""
+    seen = Counter()
+    for product in products:
+        key = product.get('articleCode') or f"title:{product.get('title', '')}"
+        seen[key] += 1
+        if seen[key] > 1:
+            key = f"{key}#{seen[key]}"
+        yield key, product
+
+
+def index_products(products, fields=DELTA_FIELDS):
+    """{key: (tuple of tracked field values, product)}."""
+    return {key: (tuple(p.get(f) for f in fields), p) for key, p in product_keys(products)}
+
+
+def load_snapshot(directory, name):
+    """Products of the previous extraction of data set `name`, or None if there is none."""
+    if not ndjson_paths(directory, name) and not os.path.exists(os.path.join(directory, f"{name}.json")):
+        return None
+    return list(iter_records(directory, name))
+
+
+def diff_products(previous, current, fields=DELTA_FIELDS):
+    """Change set turning product list `previous` into `current`.
+
+    Returns {'previous', 'current', 'added', 'removed', 'changed'}: counts of
+    both lists, full records of added products, key/articleCode/title of
+    removed ones, and for changed ones the same plus {field: [old, new]}.
+    With no previous list (None) every product counts as added.
+    """
+    old = index_products(previous or [], fields)
+    added, changed = [], []
+    count = 0
+    for key, product in product_keys(current):
+        count += 1
+        values = tuple(product.get(f) for f in fields)
+        before = old.pop(key, None)
+        if before is None:
+            added.append(product)
+        elif before[0] != values:
+            entry = {
+                'key': key,
+                'articleCode': product.get('articleCode'),
+                'title': product['title'],
+                'changes': {f: [a, b] for f, a, b in zip(fields, before[0], values) if a != b},
+            }
+            if before[1]['title'] != product['title']:
+                entry['previousTitle'] = before[1]['title']
+            changed.append(entry)
+    removed = [{'key': key, 'articleCode': p.get('articleCode'), 'title': p['title']}
+               for key, (_, p) in old.items()]
+    return {
+        'previous': None if previous is None else len(previous),
+        'current': count,
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+    }
+
+
+def _key(entry):
+    """Key of a delta entry; added products (full records) are keyed like product_keys() without the suffix."""
+    return entry.get('key') or entry.get('articleCode') or f"title:{entry.get('title', '')}"
+
+
+def merge_delta(pending, delta):
+    """One change set with the effect of the unapplied `pending` followed by `delta` (same brand).
+
+    A product added and then changed stays added with its new record;
+    added and then removed cancels out; changes to one product are combined
+    into [first old value, last new value], and dropped where those agree.
+    Without a pending delta, or when `delta` has no previous list, `delta`
+    is returned as it is.
+    """
+    if pending is None or delta['previous'] is None:
+        return delta
+    added = {_key(p): p for p in pending['added']}
+    changed = {_key(e): e for e in pending['changed']}
+    removed = {_key(e): e for e in pending['removed']}
+    for product in delta['added']:
+        removed.pop(_key(product), None)  # dropped and back before it was seeded: create it again
+        added[_key(product)] = product
+    for entry in delta['changed']:
+        key = _key(entry)
+        if key in added:
+            added[key] = {**added[key], 'title': entry['title'],
+                          **{field: new for field, (_, new) in entry['changes'].items()}}
+            continue
+        earlier = changed.get(key)
+        if earlier is None:
+            changed[key] = entry
+            continue
+        changes = dict(earlier['changes'])
+        for field, (old, new) in entry['changes'].items():
+            changes[field] = [changes[field][0] if field in changes else old, new]
+        merged = {**entry, 'changes': {f: [a, b] for f, (a, b) in changes.items() if a != b}}
+        merged.pop('previousTitle', None)
+        first_title = earlier.get('previousTitle') or earlier['title']
+        if first_title != entry['title']:
+            merged['previousTitle'] = first_title
+        if merged['changes'] or 'previousTitle' in merged:
+            changed[key] = merged
+        else:
+            del changed[key]
+    for entry in delta['removed']:
+        key = _key(entry)
+        changed.pop(key, None)
+        if added.pop(key, None) is None:
+            removed[key] = entry
+    return {
+        'previous': pending['previous'],
+        'current': delta['current'],
+        'added': list(added.values()),
+        'removed': list(removed.values()),
+        'changed': list(changed.values()),
+    }
+
+
+def load_delta(directory):
+    """{brand: unapplied change set} of products-delta.json, or {} if there is none."""
+    path = os.path.join(directory, DELTA_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Responsive image derivatives: every source image is resized to a fixed set
+of widths and encoded as WebP and JPEG, so the storefront never has to
+download full catalog resolution and the server never needs sharp.
+
+File names are <hh>/<key>-<width>w-q<quality>.<ext>, where key hashes the
+source content together with DERIVATIVE_VERSION. A name therefore never
+changes meaning, which is what lets nginx serve them as immutable, and it
+doubles as the cache: derivatives whose file exists are not regenerated.
+
+Imported by extract-catalog-data.py (extracted images) and upload-media.py
+(prepared banners).
+"""
+import os
+import hashlib
+
+# Size name -> target width in px; sources narrower than a target are not
+# upscaled, so several sizes may share one file
+DERIVATIVE_SIZES = {'thumbnail': 300, 'card': 600, 'detail': 1200, 'hero': 1920}
+DERIVATIVE_FORMATS = {'webp': 'webp', 'jpeg': 'jpg'}
+DERIVATIVE_QUALITY = 80
+# Bump when resizing/encoding changes, so every derivative gets a new name
+DERIVATIVE_VERSION = 1
+
+
+def derivative_key(path):
+    """Content key of a source image (SHA-256 of version + file bytes)."""
+    h = hashlib.sha256(f"v{DERIVATIVE_VERSION}:".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def derivative_name(key, width, image_format, quality=DERIVATIVE_QUALITY):
+    """Deterministic relative path of one derivative file."""
+    return f"{key[:2]}/{key[:32]}-{width}w-q{quality}.{DERIVATIVE_FORMATS[image_format]}"
+
+
+def _flatten(im):
+    """RGB copy of im with transparency composited onto white (for JPEG)."""
+    from PIL import Image
+    if im.mode in ('RGB', 'L'):
+        return im
+    rgba = im.convert('RGBA')
+    background = Image.new('RGB', rgba.size, (255, 255, 255))
+    background.paste(rgba, mask=rgba.getchannel('A'))
+    return background
+
+
+def make_derivatives(path, out_dir, quality=DERIVATIVE_QUALITY):
+    """Write the derivative set of one image under out_dir; return its description.
+
+    Returns {size name: {'width', 'height', 'webp', 'jpeg'}} with paths
+    relative to out_dir. Only the image header is read when every file
+    already exists; otherwise the source is decoded once and each missing
+    width is resized from it.
+    """
+    from PIL import Image
+    key = derivative_key(path)
+    derivatives = {}
+    todo = {}  # width -> [(format, rel path)] still to be written
+    with Image.open(path) as im:
+        src_w, src_h = im.size
+        for size, target in DERIVATIVE_SIZES.items():
+            width = min(target, src_w)
+            height = max(1, round(src_h * width / src_w))
+            entry = {'width': width, 'height': height}
+            for image_format in DERIVATIVE_FORMATS:
+                rel = derivative_name(key, width, image_format, quality)
+                entry[image_format] = rel
+                if not os.path.exists(os.path.join(out_dir, rel)):
+                    todo.setdefault((width, height), set()).add((image_format, rel))
+            derivatives[size] = entry
+
+        if todo:
+            if im.mode not in ('RGB', 'RGBA', 'L'):
+                im = im.convert('RGBA' if im.mode in ('LA', 'PA', 'P') else 'RGB')
+            else:
+                im.load()
+            for (width, height), outputs in sorted(todo.items(), reverse=True):
+                resized = im if (width, height) == im.size else im.resize(
+                    (width, height), Image.LANCZOS, reducing_gap=3.0)
+                for image_format, rel in sorted(outputs):
+                    dest = os.path.join(out_dir, rel)
+                    os.makedirs(os.path.dirname(dest), exist_ok=True)
+                    tmp = f"{dest}.{os.getpid()}.tmp"
+                    if image_format == 'jpeg':
+                        _flatten(resized).save(tmp, format='JPEG', quality=quality, optimize=True, progressive=True)
+                    else:
+                        resized.save(tmp, format='WEBP', quality=quality, method=4)
+                    os.replace(tmp, dest)
+    return derivatives
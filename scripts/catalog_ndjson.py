@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+NDJSON seed-data files: one compact JSON record per line, optionally split
+into shards and gzip-compressed, written and read one record at a time.
+
+For a data set `name` in a directory the files are either
+    <name>.ndjson[.gz]                          (single file)
+    <name>.00000.ndjson[.gz], <name>.00001...   (shards, in order)
+and <name>.json (a plain JSON array, the default format) is the fallback.
+
+Imported by extract-catalog-data.py (writer) and seed-payload.py (reader).
+"""
+import os
+import io
+import glob
+import gzip
+import json
+
+
+def ndjson_paths(directory, name):
+    """Existing NDJSON files of data set `name`, in record order."""
+    base = os.path.join(glob.escape(directory), glob.escape(name))
+    single = glob.glob(f"{base}.ndjson") + glob.glob(f"{base}.ndjson.gz")
+    shards = sorted(glob.glob(f"{base}.[0-9][0-9][0-9][0-9][0-9].ndjson")
+                    + glob.glob(f"{base}.[0-9][0-9][0-9][0-9][0-9].ndjson.gz"))
+    return single + shards
+
+
+def remove_ndjson(directory, name):
+    """Delete NDJSON files of `name`, so a stale copy can't shadow newer output."""
+    for path in ndjson_paths(directory, name):
+        os.remove(path)
+
+
+def _open_text(path, mode, compress=None):
+    """Open a plain or gzip (by default: by .gz suffix) text file for reading ('r') or writing ('w')."""
+    newline = '\n' if mode == 'w' else None
+    if not (path.endswith('.gz') if compress is None else compress):
+        return open(path, mode, encoding='utf-8', newline=newline)
+    # mtime=0 keeps gzip output byte-identical across runs
+    stream = gzip.GzipFile(path, mode + 'b', compresslevel=6, mtime=0)
+    return io.TextIOWrapper(stream, encoding='utf-8', newline=newline)
+
+
+class NDJSONWriter:
+    """Writes records of data set `name` to NDJSON as they are produced.
+
+    With shard_size > 0 a new file is started every shard_size records;
+    compress=True gzips every file. Files are written under temporary names
+    and moved into place by close(), which then removes NDJSON files of the
+    previous output that weren't replaced, so readers never see a partial
+    file. Use as a context manager; on an exception the old files are kept.
+    """
+
+    def __init__(self, directory, name, shard_size=0, compress=False):
+        self.directory = directory
+        self.name = name
+        self.shard_size = shard_size
+        self.suffix = '.ndjson.gz' if compress else '.ndjson'
+        self.compress = compress
+        self.paths = []
+        self.count = 0
+        self._file = None
+        self._stale = ndjson_paths(directory, name)
+
+    def _next_file(self):
+        if self._file is not None:
+            self._file.close()
+        if self.shard_size:
+            filename = f"{self.name}.{len(self.paths):05d}{self.suffix}"
+        else:
+            filename = f"{self.name}{self.suffix}"
+        path = os.path.join(self.directory, filename)
+        self.paths.append(path)
+        self._file = _open_text(f"{path}.tmp", 'w', self.compress)
+
+    def write(self, record):
+        if self._file is None or (self.shard_size and self.count % self.shard_size == 0):
+            self._next_file()
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        self.count += 1
+
+    def close(self):
+        if self._file is None:
+            self._next_file()  # an empty data set still gets its (empty) file
+        self._file.close()
+        for path in self.paths:
+            os.replace(f"{path}.tmp", path)
+        for path in self._stale:
+            if path not in self.paths:
+                os.remove(path)
+
+    def abort(self):
+        """Drop everything written so far, keeping the previous files."""
+        if self._file is not None:
+            self._file.close()
+        for path in self.paths:
+            if os.path.exists(f"{path}.tmp"):
+                os.remove(f"{path}.tmp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_records(directory, name):
+    """Yield the records of data set `name`, one at a time.
+
+    Reads NDJSON (single, sharded and/or gzipped) line by line when present,
+    otherwise loads <name>.json.
+    """
+    paths = ndjson_paths(directory, name)
+    if not paths:
+        with open(os.path.join(directory, f"{name}.json"), 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+    for path in paths:
+        with _open_text(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
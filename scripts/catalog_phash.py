@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate catalog images: the same packshot stored at another
+resolution or compression (an Elgon catalog and its AFFIXX brochure), which
+the content-addressed blob store sees as different files.
+
+Every stored image gets a 64-bit difference hash (dHash): the image is
+shrunk to 9x8 gray pixels and each bit says whether a pixel is brighter
+than its right neighbour, so rescaling and recompression flip few bits.
+Hashes go into a multi-index hash table (see MultiIndex), so finding the
+near-duplicates of an image probes a few dozen buckets instead of
+comparing it with every other image.
+
+Imported by extract-catalog-data.py (keeps the highest-resolution image of
+each cluster) and upload-media.py (picks that image for every upload).
+"""
+import os
+
+HASH_SIZE = 8
+# Hamming distance (of 64 bits) up to which two images are the same picture
+DUPLICATE_DISTANCE = 6
+# Near-duplicates have the same shape; crops and different layouts don't
+ASPECT_TOLERANCE = 0.05
+# Hashes with fewer set (or unset) bits than this carry too little structure to match
+MIN_HASH_BITS = 4
+
+
+def dhash(path, size=HASH_SIZE):
+    """Difference hash of an image file as a size*size-bit int."""
+    from PIL import Image
+    with Image.open(path) as im:
+        im.draft('L', ((size + 1) * 4, size * 4))  # JPEG: decode at a fraction of full size
+        gray = im.convert('L').resize((size + 1, size), Image.BOX)
+    px = gray.tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            i = row * (size + 1) + col
+            bits = bits << 1 | (px[i] > px[i + 1])
+    return bits
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def informative(phash, size=HASH_SIZE):
+    """False for (nearly) uniform hashes, which flat images of any content share."""
+    ones = bin(phash).count('1')
+    return MIN_HASH_BITS <= ones <= size * size - MIN_HASH_BITS
+
+
+class MultiIndex:
+    """Multi-index hash table of (hash, item) for Hamming-radius lookups.
+
+    A hash is split into `chunks` pieces, each the key of its own table. Two
+    hashes within distance r agree to within r // chunks bits on at least
+    one piece (otherwise the pieces alone would differ in more than r
+    bits), so a lookup only probes the buckets of its own pieces and their
+    few-bit variants, then checks those candidates' full distance.
+    """
+
+    def __init__(self, radius, bits=HASH_SIZE * HASH_SIZE, chunks=4):
+        self.radius = radius
+        self.width = bits // chunks
+        self.tables = [{} for _ in range(chunks)]
+        self.flips = [0]  # piece-local bit patterns with at most radius // chunks bits set
+        for _ in range(radius // chunks):
+            self.flips = sorted({f | (1 << b) for f in self.flips for b in range(self.width)} | set(self.flips))
+
+    def _pieces(self, phash):
+        mask = (1 << self.width) - 1
+        return [(phash >> (self.width * c)) & mask for c in range(len(self.tables))]
+
+    def add(self, phash, item):
+        for table, piece in zip(self.tables, self._pieces(phash)):
+            table.setdefault(piece, []).append((phash, item))
+
+    def search(self, phash):
+        """[(distance, item)] of every item within the radius of phash."""
+        found = {}  # id(item) -> (distance, item), or None if too far
+        for table, piece in zip(self.tables, self._pieces(phash)):
+            for flip in self.flips:
+                for other, item in table.get(piece ^ flip, ()):
+                    if id(item) not in found:
+                        d = hamming(phash, other)
+                        found[id(item)] = (d, item) if d <= self.radius else None
+        return [match for match in found.values() if match is not None]
+
+
+def same_shape(a, b, tolerance=ASPECT_TOLERANCE):
+    """True if two images (dicts with width/height) have aspect ratios within tolerance."""
+    ra, rb = a['width'] / a['height'], b['width'] / b['height']
+    return abs(ra - rb) <= tolerance * max(ra, rb)
+
+
+def resolution(image):
+    """Sort key preferring more pixels, then more bytes (less compression)."""
+    return image['width'] * image['height'], image.get('bytes', 0)
+
+
+class ImageIndex:
+    """Stored images by perceptual hash; images are dicts with phash (hex), width, height."""
+
+    def __init__(self, images=(), distance=DUPLICATE_DISTANCE):
+        self.table = MultiIndex(distance)
+        for image in images:
+            self.add(image)
+
+    def add(self, image):
+        phash = int(image['phash'], 16)
+        if informative(phash):
+            self.table.add(phash, image)
+
+    def near(self, image):
+        """Indexed near-duplicates of `image` (which needs phash, width and height)."""
+        phash = int(image['phash'], 16)
+        if not informative(phash):
+            return []
+        return [item for _, item in self.table.search(phash) if same_shape(image, item)]
+
+    def best(self, image):
+        """Highest-resolution near-duplicate of `image`, or `image` itself."""
+        return max(self.near(image) + [image], key=resolution)
+
+
+def cluster_images(images, distance=DUPLICATE_DISTANCE):
+    """Clusters (lists of indices, in order) of near-duplicate images; singletons omitted.
+
+    Each image is looked up among those before it and then added, so every
+    near pair is found once; clusters are closed transitively.
+    """
+    parent = list(range(len(images)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = ImageIndex(distance=distance)
+    position = {}  # id of an indexed image -> its index in `images`
+    for i, image in enumerate(images):
+        for near in index.near(image):
+            parent[root(i)] = root(position[id(near)])
+        index.add(image)
+        position[id(image)] = i
+    clusters = {}
+    for i in range(len(images)):
+        clusters.setdefault(root(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def dedupe_manifest(manifest, distance=DUPLICATE_DISTANCE):
+    """Point every occurrence of a near-duplicate image at the highest-resolution one.
+
+    Entries keep their own name, page and source, take file, size, hash and
+    derivatives of the kept image, and record what they had in 'original'
+    (the first time; a manifest can be deduped again after a partial run).
+    Returns (manifest, number of clusters, number of entries repointed).
+    """
+    blobs = {}  # file -> first entry storing it
+    for entry in manifest:
+        if 'file' in entry and entry.get('phash'):
+            blobs.setdefault(entry['file'], entry)
+    images = list(blobs.values())
+    best = {}  # file -> entry of the image that replaces it
+    clusters = cluster_images(images, distance)
+    for members in clusters:
+        keep = max((images[i] for i in members), key=resolution)
+        for i in members:
+            if images[i] is not keep:
+                best[images[i]['file']] = keep
+
+    repointed = 0
+    for entry in manifest:
+        keep = best.get(entry.get('file'))
+        if keep is None:
+            continue
+        if 'original' not in entry:
+            entry['original'] = {field: entry[field] for field in ('file', 'width', 'height', 'bytes')}
+        for field in ('file', 'width', 'height', 'bytes', 'phash', 'derivatives'):
+            if field in keep:
+                entry[field] = keep[field]
+            else:
+                entry.pop(field, None)
+        repointed += 1
+    return manifest, len(clusters), repointed
+
+
+def file_image(path):
+    """Index lookup dict (phash, width, height, bytes, file) of an image file outside the manifest."""
+    from PIL import Image
+    with Image.open(path) as im:
+        width, height = im.size
+    return {'file': path, 'phash': f"{dhash(path):016x}", 'width': width, 'height': height,
+            'bytes': os.path.getsize(path)}
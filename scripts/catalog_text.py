@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Text normalization shared by the catalog scripts: Ukrainian slugs, volume
+extraction from product titles and volume parsing into numbers.
+
+Imported by extract-catalog-data.py and seed-payload.py (both run from
+this directory, so it is on sys.path), and by catalog_dedupe and
+catalog_variants for volume parsing.
+"""
+import re
+import string
+from functools import lru_cache
+
+TRANSLITERATION = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ye', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'yi', 'й': 'y',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'yu', 'я': 'ya', 'ъ': '', 'ы': 'y',
+    'э': 'e', "'": '',
+}
+
+
+class _SlugTable(dict):
+    """str.translate table that deletes every character it was not built with."""
+
+    def __missing__(self, codepoint):
+        self[codepoint] = None
+        return None
+
+
+# Transliterate, keep [a-z0-9-], turn separators into dashes and drop
+# everything else in a single str.translate call.
+_SLUG_TABLE = _SlugTable(str.maketrans({
+    **TRANSLITERATION,
+    **{ch: ch for ch in string.ascii_lowercase + string.digits + '-'},
+    ' ': '-', '_': '-', '.': '-', '/': '-',
+}))
+_SLUG_DASHES = re.compile(r'-{2,}')
+
+# Distinct titles remembered by slugify()/extract_volume()
+CACHE_SIZE = 65536
+
+_VOLUME = re.compile(r'(\d+)\s*(мл|гр|ml|gr|g)\b', re.IGNORECASE)
+_VOLUME_LOOSE = re.compile(r'(\d+)\s*(мл|гр)')
+_QUANTITY = re.compile(r'(\d+(?:[.,]\d+)?)\s*(мл|ml|л|l|кг|kg|гр|gr|г|g)\b', re.IGNORECASE)
+# Volume unit -> (canonical unit, factor)
+UNITS = {
+    'мл': ('ml', 1), 'ml': ('ml', 1), 'л': ('ml', 1000), 'l': ('ml', 1000),
+    'гр': ('g', 1), 'gr': ('g', 1), 'г': ('g', 1), 'g': ('g', 1), 'кг': ('g', 1000), 'kg': ('g', 1000),
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def slugify(text):
+    """Create URL-friendly slug from Ukrainian text (max 80 chars)."""
+    slug = text.lower().strip().translate(_SLUG_TABLE)
+    return _SLUG_DASHES.sub('-', slug).strip('-')[:80]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_volume(name):
+    """Extract volume from product name like '250 мл', '500 гр'."""
+    m = _VOLUME.search(name)
+    if m:
+        return f"{m.group(1)} {m.group(2).lower()}"
+    # Units glued to the next word ("250млx") only count in Cyrillic
+    m = _VOLUME_LOOSE.search(name) if 'мл' in name or 'гр' in name else None
+    if m:
+        return f"{m.group(1)} {m.group(2)}"
+    return None
+
+
+def _quantity(match):
+    unit, factor = UNITS[match.group(2).lower()]
+    quantity = float(match.group(1).replace(',', '.')) * factor
+    return (int(quantity) if quantity.is_integer() else quantity), unit
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_quantity(volume):
+    """(quantity, 'ml' or 'g') of a volume like '250 мл', '1 л' or '500 гр'; (None, None) if there is none."""
+    m = _QUANTITY.search(volume or '')
+    return _quantity(m) if m else (None, None)
+
+
+def strip_volume(text, repl=' '):
+    """`text` with every volume ('250 мл', '1,5 л', '500g') replaced by `repl`.
+
+    `repl` may also be a function of the volume's (quantity, unit), as
+    parse_quantity() returns them.
+    """
+    if callable(repl):
+        return _QUANTITY.sub(lambda m: repl(*_quantity(m)), text)
+    return _QUANTITY.sub(repl, text)
+
+
+def slugify_all(texts):
+    """slugify() over a list of texts."""
+    return list(map(slugify, texts))
+
+
+def extract_volumes(names):
+    """extract_volume() over a list of product names."""
+    return list(map(extract_volume, names))
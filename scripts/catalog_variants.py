@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Volume variants of one product line. Supplier lists have a row per size
+("Шампунь ... 250 мл", "Шампунь ... 1000 мл"); the store has one product
+with a variant per size.
+
+Rows are grouped by brand plus their title with the volume removed,
+lowercased and without punctuation. A group lists its rows smallest first
+and the product takes title (without the volume) and category from the
+first; every row keeps its own SKU and prices as a variant.
+
+Supplier lists put the sizes of a line next to each other, so a reader
+can also group a stream on the fly (iter_variant_runs): a run of adjacent
+rows ends where the key changes, and the rare key that comes back later is
+added to the product its first run created.
+
+Imported by seed-payload.py (full and --delta seeding) and
+extract-catalog-data.py (seed pipeline).
+"""
+import re
+from itertools import groupby
+
+from catalog_text import parse_quantity, strip_volume
+
+_SPACES = re.compile(r'\s{2,}')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def line_title(title):
+    """Product title without its volume ('Шампунь 250 мл' -> 'Шампунь'); the title if nothing is left."""
+    stripped = _SPACES.sub(' ', strip_volume(title)).strip(' ,.-–/')
+    return stripped or title
+
+
+def line_key(product):
+    """(brand, normalized volume-free title): rows with the same key are one product."""
+    return product.get('brand'), _NON_WORD.sub(' ', line_title(product['title']).lower()).strip()
+
+
+def _size(product):
+    quantity = product.get('quantity')
+    if quantity is None:
+        quantity, _ = parse_quantity(product.get('volume'))
+    return (quantity is None, quantity or 0)
+
+
+def group_variants(products):
+    """Lists of rows forming one product each, in order of their first row; rows sorted by size."""
+    groups = {}
+    for product in products:
+        groups.setdefault(line_key(product), []).append(product)
+    return [sorted(rows, key=_size) for rows in groups.values()]
+
+
+def iter_variant_runs(products):
+    """Yield (rows, seen before) for every run of adjacent rows with the same line_key, rows sorted by size.
+
+    Reads `products` one row at a time; `seen before` is True when an
+    earlier run had the same key.
+    """
+    seen = set()
+    for key, rows in groupby(products, key=line_key):
+        yield sorted(rows, key=_size), key in seen
+        seen.add(key)
@@ -3,24 +3,80 @@
 """
 Extract product data from catalog files (PDF, XLS, PPTX) for HAIR LAB store.
 Outputs JSON files to scripts/seed-data/
+
+Usage: python scripts/extract-catalog-data.py [run] [--only STAGE] [--skip-images] [--brand BRAND]
+       python scripts/extract-catalog-data.py products --brand inebrya
+       python scripts/extract-catalog-data.py {categories,brands,blog-posts,images}
+       python scripts/extract-catalog-data.py watch [--interval 1] [--settle 2]
+       python scripts/extract-catalog-data.py seed [--seed-threads 4] [--queue-size 32] [--save-json]
+
+pandas, PyMuPDF and Pillow are imported by the stages that need them,
+so a run that doesn't touch a format doesn't pay for its import. Check
+startup with: python -X importtime scripts/extract-catalog-data.py categories
 """
 import sys
 import os
 import re
 import json
+import time
+import shutil
+import hashlib
+import inspect
+import functools
+import zipfile
+import argparse
+import posixpath
+import queue
+import threading
+import contextlib
+import xml.etree.ElementTree as ET
+from collections import Counter, deque, namedtuple
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 sys.stdout.reconfigure(encoding='utf-8')
 
-import pandas as pd
-import fitz  # PyMuPDF
+from catalog_text import slugify, extract_volume, extract_volumes, parse_quantity
+from catalog_images import DERIVATIVE_QUALITY, make_derivatives
+from catalog_ndjson import NDJSONWriter, remove_ndjson
+from catalog_delta import DELTA_FILE, diff_products, load_delta, load_snapshot, merge_delta
+from catalog_dedupe import MERGE_THRESHOLD, REPORT_FILE, duplicate_report, find_duplicates, merge_duplicates
+from catalog_phash import dedupe_manifest, dhash
+from catalog_variants import group_variants, line_title
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CATALOG_DIR = os.path.join(os.path.dirname(BASE_DIR), 'NO_GIT_ONLY_DEV_CATALOGE')
 SEED_DIR = os.path.join(BASE_DIR, 'seed-data')
 IMG_DIR = os.path.join(SEED_DIR, 'images')
-
-os.makedirs(SEED_DIR, exist_ok=True)
-os.makedirs(IMG_DIR, exist_ok=True)
+DERIVATIVES_DIR = os.path.join(IMG_DIR, 'derivatives')
+CACHE_DIR = os.path.join(BASE_DIR, '.extract-cache')
+
+# Page-range size for splitting a PDF across worker processes
+PAGES_PER_JOB = 8
+# Page ranges submitted ahead of the consumer, bounds memory in pool mode
+PAGE_JOBS_IN_FLIGHT = 4
+# Catalog images smaller than this (px, either side) are logos/icons
+MIN_IMAGE_SIZE = 150
+# Encodings for catalog images that can't be copied as-is (--image-format);
+# 'png' decodes every image to lossless PNG, the pre-passthrough behaviour
+IMAGE_FORMATS = {'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+IMAGE_FORMAT = 'webp'
+IMAGE_QUALITY = 85
+# Decorative-image filter for PDF catalogs: an image is dropped (and kept in
+# the manifest with the reason) when one of its statistics is below the limit.
+#   alpha_coverage  share of pixels that aren't transparent
+#   std             luminance standard deviation (solid fills, blank boxes)
+#   colors          distinct colours at 4 bits per channel (flat banners)
+#   edge_density    share of pixels on an edge (gradients, soft shadows)
+IMAGE_FILTER = {'alpha_coverage': 0.05, 'std': 4.0, 'colors': 6, 'edge_density': 0.002}
+# Brand -> limits that differ from IMAGE_FILTER, e.g. 'mood': {'edge_density': 0.001}
+IMAGE_FILTER_BY_BRAND = {}
+# Statistics are taken on every n-th pixel so the longer side has at most this many
+IMAGE_STATS_SIZE = 256
+
+# Bump to invalidate every cached entry (e.g. after a PyMuPDF/pandas upgrade)
+CACHE_VERSION = 2
+USE_CACHE = True
 
 def find_file(keyword, ext=None):
     """Find a file in catalog dir by keyword."""
@@ -29,102 +85,572 @@ def find_file(keyword, ext=None):
             return os.path.join(CATALOG_DIR, f)
     return None
 
-def slugify(text):
-    """Create URL-friendly slug from Ukrainian text."""
-    transliteration = {
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
-        'є': 'ye', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'yi', 'й': 'y',
-        'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
-        'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
-        'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'yu', 'я': 'ya', 'ъ': '', 'ы': 'y',
-        'э': 'e', "'": '',
-    }
-    text = text.lower().strip()
-    result = []
-    for ch in text:
-        if ch in transliteration:
-            result.append(transliteration[ch])
-        elif ch.isascii() and (ch.isalnum() or ch == '-'):
-            result.append(ch)
-        elif ch in (' ', '_', '.', '/'):
-            result.append('-')
-    slug = '-'.join(part for part in ''.join(result).split('-') if part)
-    return slug[:80]
-
-def extract_volume(name):
-    """Extract volume from product name like '250 мл', '500 гр'."""
-    m = re.search(r'(\d+)\s*(мл|гр|ml|gr|g)\b', name, re.IGNORECASE)
-    if m:
-        return f"{m.group(1)} {m.group(2).lower()}"
-    m = re.search(r'(\d+)\s*(мл|гр)', name)
-    if m:
-        return f"{m.group(1)} {m.group(2)}"
-    return None
+def _read_page_range(path, start, stop):
+    """Extract text of pages [start, stop). Opens its own document handle."""
+    import fitz  # PyMuPDF
+    doc = fitz.open(path)
+    try:
+        return [doc[n].get_text() for n in range(start, stop)]
+    finally:
+        doc.close()
+
+def _iter_page_texts(path, pool=None):
+    """Yield page texts straight from the PDF, in page order."""
+    import fitz  # PyMuPDF
+    doc = fitz.open(path)
+    page_count = len(doc)
+    if pool is None or page_count <= PAGES_PER_JOB:
+        try:
+            for page in doc:
+                yield page.get_text()
+        finally:
+            doc.close()
+        return
+    doc.close()
+
+    def submit(start):
+        return pool.submit(_read_page_range, path, start, min(start + PAGES_PER_JOB, page_count))
+
+    starts = iter(range(0, page_count, PAGES_PER_JOB))
+    futures = deque(submit(start) for start in islice(starts, PAGE_JOBS_IN_FLIGHT))
+    while futures:
+        texts = futures.popleft().result()
+        futures.extend(submit(start) for start in islice(starts, 1))
+        yield from texts
+
+# path -> (pages, wall s, CPU s of the reading thread) of its last full read by
+# iter_pdf_pages(), parsing of the pages included, for the --profile report
+PDF_READS = {}
+
+def iter_pdf_pages(path, pool=None):
+    """Yield the text of every PDF page, in page order, one page at a time.
+
+    With a process pool, the document is split into page ranges of
+    PAGES_PER_JOB pages that are extracted in parallel and merged back in order.
+    Page texts are cached by file content hash, one JSON string per line, so
+    neither a cache hit nor a miss holds the whole document in memory.
+    """
+    wall, cpu = time.perf_counter(), time.thread_time()
+    pages = 0
+    for text in _iter_pdf_pages(path, pool):
+        pages += 1
+        yield text
+    PDF_READS[path] = (pages, time.perf_counter() - wall, time.thread_time() - cpu)
+
+def _iter_pdf_pages(path, pool=None):
+    cache_file = os.path.join(CACHE_DIR, 'pages', f"{cache_key([path])}.jsonl")
+    if USE_CACHE and os.path.exists(cache_file):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+        return
+
+    if not USE_CACHE:
+        yield from _iter_page_texts(path, pool)
+        return
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as out:
+            for text in _iter_page_texts(path, pool):
+                out.write(json.dumps(text, ensure_ascii=False) + '\n')
+                yield text
+        os.replace(tmp, cache_file)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def read_pdf_pages(path, pool=None):
+    """Return text of every PDF page as a list, in page order."""
+    return list(iter_pdf_pages(path, pool))
+
+def iter_lines(texts):
+    """Yield lines of consecutive page texts as if they were one document."""
+    for text in texts:
+        yield from text.split('\n')
+
+def iter_windows(lines, behind, ahead):
+    """Yield (previous, line, following) over a line stream.
+
+    `previous` holds up to `behind` earlier lines (oldest first) and
+    `following` up to `ahead` later lines; only that window is kept in memory.
+    """
+    it = iter(lines)
+    previous = deque(maxlen=behind)
+    following = deque(islice(it, ahead + 1))
+    while following:
+        line = following.popleft()
+        yield previous, line, following
+        previous.append(line)
+        following.extend(islice(it, 1))
+
+
+def write_json(path, data):
+    """Write JSON atomically: readers see the old file or the new one, never a partial one."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
 
 # ═══════════════════════════════════════════════════════════════
-# 1. ELGON XLS
+# EXTRACTION CACHE
 # ═══════════════════════════════════════════════════════════════
-def parse_elgon():
-    print("📦 Parsing Elgon XLS...")
-    f = find_file('Elgon', '.xls')
-    if not f:
-        print("  ⚠ Elgon XLS not found")
-        return []
-
-    df = pd.read_excel(f, header=None)
-    products = []
-    current_categories = []  # stack of category names by indent level
-
-    for i in range(10, len(df)):
-        row = df.iloc[i]
-        art = str(row[1]).strip() if pd.notna(row[1]) else ''
-        code = str(row[2]).strip() if pd.notna(row[2]) else ''
-        name_raw = str(row[3]) if pd.notna(row[3]) else ''
-        name = name_raw.strip()
-        cost_val = row[4] if pd.notna(row[4]) else None
-        price_val = row[5] if pd.notna(row[5]) else None
-
-        if not name:
-            continue
+# Entries live in CACHE_DIR/<kind>/<key>.json. A key combines the content
+# hash of every source file with the source code of the functions that
+# produced the entry, so editing a parse_* function invalidates its
+# products; --clear-cache or CACHE_VERSION wipe everything.
+_file_hashes = {}
+
+def file_hash(path):
+    """SHA-256 of file content, memoized per (path, size, mtime) for this run."""
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns)
+    if memo_key not in _file_hashes:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _file_hashes[memo_key] = h.hexdigest()
+    return _file_hashes[memo_key]
+
+def cache_key(paths, *funcs, params=()):
+    """Cache key from source file contents, the code of `funcs` and `params`."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}{params!r}".encode())
+    for func in funcs:
+        h.update(inspect.getsource(func).encode('utf-8'))
+    for path in paths:
+        h.update(file_hash(path).encode())
+    return h.hexdigest()[:32]
+
+def cache_load(kind, key):
+    """Return cached value or None."""
+    if not USE_CACHE:
+        return None
+    try:
+        with open(os.path.join(CACHE_DIR, kind, f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cache_store(kind, key, value):
+    """Write a cache entry atomically."""
+    if not USE_CACHE:
+        return
+    kind_dir = os.path.join(CACHE_DIR, kind)
+    os.makedirs(kind_dir, exist_ok=True)
+    path = os.path.join(kind_dir, f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp, path)
 
-        indent = len(name_raw) - len(name_raw.lstrip())
 
-        # Category row (no article)
-        if not art:
-            # Trim stack to current indent level
-            current_categories = [(lvl, cat) for lvl, cat in current_categories if lvl < indent]
-            current_categories.append((indent, name))
-            continue
+# ═══════════════════════════════════════════════════════════════
+# PROFILING (--profile)
+# ═══════════════════════════════════════════════════════════════
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def peak_rss_mb(children=False):
+    """Peak RSS so far of this process (or of its finished children) in MB; None if unknown."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return round(usage.ru_maxrss / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+def _profiled(func, *args):
+    """Call func(*args); return (result, wall seconds, CPU seconds of the calling thread).
+
+    Picklable, so it also wraps jobs sent to the process pool.
+    """
+    wall, cpu = time.perf_counter(), time.thread_time()
+    result = func(*args)
+    return result, time.perf_counter() - wall, time.thread_time() - cpu
+
+def _rate(count, seconds):
+    return round(count / seconds, 1) if count and seconds else None
+
+class Profiler:
+    """Per-stage and per-source-file timings for --profile.
+
+    Stages timed in this process report wall time, process CPU time (all
+    threads) and peak RSS so far. Work done in pool workers is reported with
+    the worker's own wall and CPU time. Recording is a no-op unless enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = []
+        self.files = []
+
+    def add_stage(self, name, wall, cpu, items=None, unit='items', **extra):
+        if not self.enabled:
+            return
+        self.stages.append({
+            'stage': name, 'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4),
+            'peak_rss_mb': peak_rss_mb(), 'items': items, 'unit': unit,
+            'items_per_sec': _rate(items, wall), **extra,
+        })
 
-        # Product row
+    @contextlib.contextmanager
+    def stage(self, name, unit='items'):
+        """Time the with-block as stage `name`; put the item count in the yielded dict."""
+        record = {'items': None}
+        wall, cpu = time.perf_counter(), time.process_time()
         try:
-            cost = int(float(cost_val)) if cost_val else None
-            price = int(float(price_val)) if price_val else None
-        except (ValueError, TypeError):
-            cost = None
-            price = None
+            yield record
+        finally:
+            self.add_stage(name, time.perf_counter() - wall, time.process_time() - cpu, record['items'], unit)
+
+    def add_file(self, stage, path, wall, cpu, pages=None, images=None, items=None, cached=False):
+        if not self.enabled:
+            return
+        self.files.append({
+            'stage': stage, 'file': os.path.basename(path), 'cached': cached,
+            'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4),
+            'pages': pages, 'pages_per_sec': _rate(pages, wall),
+            'images': images, 'images_per_sec': _rate(images, wall), 'items': items,
+        })
 
-        if not price and not cost:
-            continue
+    def report(self, wall, **run):
+        """The whole profile as a JSON-serializable dict."""
+        children = resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+        return {
+            'run': run,
+            'total': {
+                'wall_s': round(wall, 4),
+                'cpu_s': round(time.process_time(), 4),
+                'workers_cpu_s': round(children.ru_utime + children.ru_stime, 4) if children else None,
+                'peak_rss_mb': peak_rss_mb(),
+                'workers_peak_rss_mb': peak_rss_mb(children=True),
+            },
+            'stages': self.stages,
+            'files': self.files,
+        }
+
+    def print_summary(self):
+        print(f"  {'stage':28} {'wall s':>8} {'cpu s':>8} {'rss MB':>8} {'items/s':>10}")
+        for st in self.stages:
+            rate = f"{st['items_per_sec']:,.0f}" if st['items_per_sec'] else '-'
+            print(f"  {st['stage'][:28]:28} {st['wall_s']:8.3f} {st['cpu_s']:8.3f} "
+                  f"{st['peak_rss_mb'] or 0:8.1f} {rate:>10}")
+        for f in self.files:
+            if f['cached']:
+                continue
+            rates = ', '.join(f"{f[k]:,.1f} {k.split('_')[0]}/s" for k in ('pages_per_sec', 'images_per_sec') if f[k])
+            print(f"  {f['stage']:>6}  {f['file'][:40]:40} {f['wall_s']:8.3f}s  {rates}")
+
+PROFILE = Profiler()
+PROFILE_FILE = 'extract-profile.json'
+
+
+# ═══════════════════════════════════════════════════════════════
+# LINE TOKENS (shared by the PDF price-list parsers)
+# ═══════════════════════════════════════════════════════════════
+class KeywordMatcher:
+    """Finds every keyword occurring in a text in a single left-to-right scan.
+
+    The keywords are compiled into one prefix-trie regex, so each match
+    attempt costs at most one keyword length regardless of how many keywords
+    there are, and sre skips ahead to the next possible first character
+    between hits. A match is the longest keyword at its position; the shorter
+    keywords that are prefixes of it come from a precomputed table, and the
+    scan resumes one character after each match start so overlapping hits
+    are all reported.
+    """
+
+    def __init__(self, keywords):
+        keywords = set(keywords)
+        self._pattern = re.compile(self._trie_regex(keywords))
+        self._prefixes = {kw: frozenset(k for k in keywords if kw.startswith(k)) for kw in keywords}
+
+    @staticmethod
+    def _trie_regex(keywords):
+        trie = {}
+        for kw in keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def build(node):
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # Greedy optional: prefer the longer keyword, fall back to this one
+            return f"(?:{body})?" if '' in node else body
+
+        return build(trie)
+
+    def find(self, text):
+        """Return the set of keywords occurring in text."""
+        hits = set()
+        prefixes = self._prefixes
+        search = self._pattern.search
+        m = search(text)
+        while m:
+            hits.update(prefixes[m.group()])
+            m = search(text, m.start() + 1)
+        return hits
+
+    def search(self, text):
+        """True if any keyword occurs in text."""
+        return self._pattern.search(text) is not None
+
+
+# One token per stripped price-list line. `kind` is the line's primary type
+# (sku, price, volume, number, section, label, text, blank); the remaining
+# fields are precomputed features the parsers' name/price lookups use, so
+# no regex is run more than once per line.
+Token = namedtuple('Token', [
+    'kind', 'text',
+    'sku', 'sku_volume',  # SKU code and inline volume ("517908 - 250 мл")
+    'price',              # int for "NNN грн"
+    'volume',             # "250 мл" for a volume-only line
+    'number',             # int for a digits-only line
+    'lead_digits',        # length of the leading digit run
+    'unit_prefix',        # unit right after leading digits: грн|мл|гр|Vol|%
+    'label_prefix',       # Ціна|РРЦ|салону|Об'єм|мл|грн|pH|рН at line start
+    'numeric_only',       # only digits, spaces, ",", "." and г/р/н
+    'cyrillic',           # contains a Cyrillic letter
+])
+
+_LEAD_DIGITS = re.compile(r'\d*')
+_PRICE_LINE = re.compile(r'(\d+)\s*грн')
+_NUMBER_LINE = re.compile(r'\d+')
+_UNIT_PREFIX = re.compile(r'\d+\s*(грн|мл|гр|Vol|%)')
+_LABEL_PREFIX = re.compile(r"(Ціна|РРЦ|салону|Об'єм|мл|грн|pH|рН)")
+_NUMERIC_ONLY = re.compile(r'[\d\s,\.грн]+')
+_CYRILLIC = re.compile(r'[а-яА-ЯіІїЇєЄґҐ]')
+
+
+class LineTokenizer:
+    """Single-pass classifier of price-list lines into Tokens.
+
+    Brand differences are configuration: the SKU pattern (group 1 = code,
+    optional group 2 = inline volume), the units accepted on a volume line,
+    and the section keywords, matched by one KeywordMatcher either as-is or
+    against the upper-cased line. With `section_guard`, only lines longer
+    than 3 characters without a digit in the first 3 can be sections.
+    """
+
+    def __init__(self, sku, volume_units=None, sections=(), upper_sections=False, section_guard=False):
+        self.sku = re.compile(sku)
+        self.volume = re.compile(rf'(\d+)\s*({volume_units})\s*') if volume_units else None
+        self.sections = KeywordMatcher(sections) if sections else None
+        self.upper_sections = upper_sections
+        self.section_guard = section_guard
+
+    def is_section(self, line):
+        if self.sections is None or not line:
+            return False
+        if self.section_guard and (len(line) <= 3 or any(c.isdigit() for c in line[:3])):
+            return False
+        return self.sections.search(line.upper() if self.upper_sections else line)
+
+    def token(self, raw_line):
+        line = raw_line.strip()
+        lead = _LEAD_DIGITS.match(line).end()
+        sku = sku_volume = price = volume = number = unit_prefix = None
+        if lead:
+            m = self.sku.fullmatch(line)
+            if m:
+                sku = m.group(1)
+                sku_volume = m.group(2) if m.lastindex and m.lastindex >= 2 else None
+            m = _PRICE_LINE.fullmatch(line)
+            if m:
+                price = int(m.group(1))
+            m = self.volume.fullmatch(line) if self.volume else None
+            if m:
+                volume = f"{m.group(1)} {m.group(2)}"
+            if lead == len(line) and _NUMBER_LINE.fullmatch(line):
+                number = int(line)
+            m = _UNIT_PREFIX.match(line)
+            if m:
+                unit_prefix = m.group(1)
+        m = _LABEL_PREFIX.match(line)
+        label_prefix = m.group(1) if m else None
+
+        if sku is not None:
+            kind = 'sku'
+        elif price is not None:
+            kind = 'price'
+        elif volume is not None:
+            kind = 'volume'
+        elif number is not None:
+            kind = 'number'
+        elif self.is_section(line):
+            kind = 'section'
+        elif 'РРЦ' in line or 'салону' in line:
+            kind = 'label'
+        elif line:
+            kind = 'text'
+        else:
+            kind = 'blank'
+
+        return Token(kind, line, sku, sku_volume, price, volume, number, lead, unit_prefix,
+                     label_prefix, bool(_NUMERIC_ONLY.fullmatch(line)), bool(_CYRILLIC.search(line)))
+
+    def tokenize(self, lines):
+        """Yield a Token for every line."""
+        for line in lines:
+            yield self.token(line)
+
+
+# ═══════════════════════════════════════════════════════════════
+# PRICE LIST JOIN (suppliers with separate trade and retail lists)
+# ═══════════════════════════════════════════════════════════════
+PRICE_JOIN_FILE = 'price-joins.json'
+
+def join_price_lists(retail, trade, key='articleCode'):
+    """Hash join of a supplier's retail and trade price lists on `key`.
+
+    The trade list is indexed once in a dict and the retail list streamed
+    against it, so the join is linear in both. Every retail product keeps
+    its own fields and gets costPrice from its trade row (that list's cost
+    slot, else its price); retail products without one are kept as they are,
+    trade-only products are left out. Returns (products in retail order,
+    {'matched', 'retailOnly', 'tradeOnly'} with the unmatched keys).
+    """
+    index = {}
+    for product in trade:
+        index.setdefault(product[key], product)
+    joined = []
+    retail_only = []
+    for product in retail:
+        match = index.pop(product[key], None)
+        if match is None:
+            retail_only.append(product[key])
+            joined.append(product)
+        else:
+            joined.append({**product, 'costPrice': match['costPrice'] or match['price']})
+    return joined, {
+        'matched': len(joined) - len(retail_only),
+        'retailOnly': retail_only,
+        'tradeOnly': list(index),
+    }
+
+# brand -> join report of the last parse (or cache hit) of brands whose parser joins two lists
+PRICE_JOINS = {}
+
+def print_price_join(report):
+    """Print a join's unmatched keys."""
+    for side, label in (('retailOnly', 'only in the retail list'), ('tradeOnly', 'only in the trade list')):
+        if report[side]:
+            shown = ', '.join(report[side][:5]) + (', ...' if len(report[side]) > 5 else '')
+            print(f"  ⚠ {len(report[side])} SKUs {label}: {shown}")
+
+def save_price_joins(brands):
+    """Store PRICE_JOINS of the re-parsed `brands` in PRICE_JOIN_FILE, keeping the other brands' reports.
+
+    Returns the brands with a report, or None if the file needn't change.
+    """
+    path = os.path.join(SEED_DIR, PRICE_JOIN_FILE)
+    saved = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    reports = {brand: report for brand, report in saved.items() if brand not in brands}
+    reports.update((brand, PRICE_JOINS[brand]) for brand in brands if brand in PRICE_JOINS)
+    if reports == saved:
+        return None
+    write_json(path, reports)
+    return [brand for brand in brands if brand in PRICE_JOINS]
 
-        # Determine category from stack
-        cat_name = ''
-        if current_categories:
-            # Use the deepest meaningful category
-            cat_name = current_categories[-1][1] if current_categories else ''
 
-        products.append({
-            'title': name,
+# ═══════════════════════════════════════════════════════════════
+# 1. ELGON XLS
+# ═══════════════════════════════════════════════════════════════
+def find_elgon_files():
+    return [find_file('Elgon', '.xls')]
+
+def _text_cells(col):
+    """Column-wise `str(v) if pd.notna(v) else ''`."""
+    return col.astype(object).where(col.notna(), '').map(str)
+
+def _int_cells(col):
+    """Column-wise `int(float(v)) if v else None`.
+
+    Returns (nullable Int64 values, mask of cells float() rejects).
+    """
+    import numpy as np
+    import pandas as pd
+    truthy = col.notna() & col.astype(object).astype(bool)
+    values = pd.Series(pd.NA, index=col.index, dtype='Int64')
+    failed = pd.Series(False, index=col.index)
+    if pd.api.types.is_numeric_dtype(col):
+        numbers = col[truthy].astype('float64')
+    else:
+        # Text cells go through Python's float() for exact parity
+        def to_float(v):
+            try:
+                return float(v)
+            except (ValueError, TypeError):
+                return float('nan')
+        numbers = col[truthy].map(to_float).astype('float64')
+        failed[truthy] = numbers.isna()
+    values[truthy] = np.trunc(numbers).astype('Int64')
+    return values, failed
+
+def parse_elgon_frame(df):
+    """Turn the raw Elgon price sheet into product dicts, column-wise.
+
+    Rows after the 10-line header are either category rows (name, no
+    article) or product rows. The deepest open category is always the most
+    recent category row, so the category hint is a forward fill of category
+    names. Cost and price become None together if either cell is not a number.
+    """
+    body = df.iloc[10:]
+    name = _text_cells(body[3]).str.strip()
+    art = _text_cells(body[1]).str.strip()
+    code = _text_cells(body[2]).str.strip()
+
+    has_name = name != ''
+    is_category = has_name & (art == '')
+    hint = name.where(is_category).ffill().fillna('')
+
+    cost, cost_failed = _int_cells(body[4])
+    price, price_failed = _int_cells(body[5])
+    failed = cost_failed | price_failed
+    cost = cost.mask(failed)
+    price = price.mask(failed)
+
+    is_product = has_name & ~is_category & (cost.fillna(0).ne(0) | price.fillna(0).ne(0))
+
+    def column(series):
+        return series[is_product].astype(object).where(series[is_product].notna(), None).tolist()
+
+    titles = column(name)
+    return [
+        {
+            'title': title,
             'brand': 'elgon',
             'categoryHint': cat_name,
-            'articleCode': art,
-            'supplierCode': code,
-            'price': price,
-            'costPrice': cost,
-            'volume': extract_volume(name),
+            'articleCode': article,
+            'supplierCode': supplier_code,
+            'price': price_val,
+            'costPrice': cost_val,
+            'volume': volume,
             'inStock': True,
-        })
+        }
+        for title, volume, cat_name, article, supplier_code, price_val, cost_val in zip(
+            titles, extract_volumes(titles), column(hint), column(art), column(code), column(price), column(cost))
+    ]
+
+def parse_elgon():
+    import pandas as pd
+    print("📦 Parsing Elgon XLS...")
+    f = find_elgon_files()[0]
+    if not f:
+        print("  ⚠ Elgon XLS not found")
+        return []
+
+    products = parse_elgon_frame(pd.read_excel(f, header=None))
 
     print(f"  ✅ Elgon: {len(products)} products")
     return products
@@ -133,233 +659,195 @@ def parse_elgon():
 # ═══════════════════════════════════════════════════════════════
 # 2. MOOD PDF
 # ═══════════════════════════════════════════════════════════════
-def parse_mood():
-    print("📦 Parsing MOOD Price PDF...")
+def find_mood_files():
     f = find_file('MOOD', '.pdf')
     # Find the price PDF specifically
     for fn in os.listdir(CATALOG_DIR):
         if 'MOOD' in fn and '2026' in fn and fn.endswith('.pdf'):
             f = os.path.join(CATALOG_DIR, fn)
             break
+    return [f]
+
+def parse_mood(pool=None):
+    print("📦 Parsing MOOD Price PDF...")
+    f = find_mood_files()[0]
 
     if not f:
         print("  ⚠ MOOD price PDF not found")
         return []
 
-    doc = fitz.open(f)
-    full_text = ''
-    for page in doc:
-        full_text += page.get_text() + '\n'
-    doc.close()
+    tokenizer = LineTokenizer(
+        sku=r'(\d{6,10})\s*(?:-\s*)?(\d+\s*(?:мл|гр|ml))?\s*',
+        volume_units='мл|гр|ml',
+        sections=['DREAM CURLS', 'BODY BUILDER', 'ULTRA CARE', 'KERATIN',
+                  'INTENSE REPAIR', 'SILVER SPECIFIC', 'DERMA CLEANSING', 'COLOR PROTECT',
+                  'DAILY', 'CELL FORCE', 'BODYGUARD', 'SUNCARE', 'HAIR BODYGUARD'],
+        upper_sections=True, section_guard=True)
 
     products = []
-
-    # Parse structured data: look for patterns like
-    # SKU number + volume + prices
-    lines = full_text.split('\n')
-    i = 0
+    seen = set()
     current_section = ''
-    current_product_name = ''
-
-    while i < len(lines):
-        line = lines[i].strip()
 
+    # Parse structured data: look for patterns like
+    # SKU number + volume + prices. Lines stream across page boundaries;
+    # names are looked up to 7 lines back and prices up to 9 lines ahead.
+    lines = iter_lines(iter_pdf_pages(f, pool))
+    for previous, tok, following in iter_windows(tokenizer.tokenize(lines), 7, 9):
         # Track section headers (all caps or known sections)
-        if line and len(line) > 3 and not any(c.isdigit() for c in line[:3]):
-            # Check if this might be a section or product name
-            if any(kw in line.upper() for kw in ['DREAM CURLS', 'BODY BUILDER', 'ULTRA CARE', 'KERATIN',
-                'INTENSE REPAIR', 'SILVER SPECIFIC', 'DERMA CLEANSING', 'COLOR PROTECT',
-                'DAILY', 'CELL FORCE', 'BODYGUARD', 'SUNCARE', 'HAIR BODYGUARD']):
-                current_section = line
-                i += 1
-                continue
-
-        # Look for article codes (6-10 digit numbers that are SKUs)
-        sku_match = re.match(r'^(\d{6,10})\s*(?:-\s*)?(\d+\s*(?:мл|гр|ml))?\s*$', line)
-        if not sku_match:
-            # Try pattern: "SKU - volume"
-            sku_match = re.match(r'^(\d{6,10})\s*-\s*(\d+\s*(?:мл|гр|ml))\s*$', line)
-        if not sku_match:
-            # Try just SKU on its own line
-            sku_match = re.match(r'^(\d{6,10})$', line)
-
-        if sku_match:
-            sku = sku_match.group(1)
-            volume_from_sku = sku_match.group(2) if sku_match.lastindex and sku_match.lastindex >= 2 else None
-
-            # Look backward for product name
-            name = ''
-            for j in range(i-1, max(i-8, -1), -1):
-                prev = lines[j].strip()
-                if prev and not re.match(r'^\d+\s*(грн|мл|гр|Vol|%)', prev) and len(prev) > 5:
-                    if not re.match(r'^(Ціна|РРЦ|салону)', prev):
-                        name = prev
-                        break
-
-            # Look forward for prices
-            cost_price = None
-            retail_price = None
-            volume = volume_from_sku
-
-            for j in range(i+1, min(i+10, len(lines))):
-                next_line = lines[j].strip()
-                # Volume line
-                vol_m = re.match(r'^(\d+)\s*(мл|гр|ml)\s*$', next_line)
-                if vol_m and not volume:
-                    volume = f"{vol_m.group(1)} {vol_m.group(2)}"
-                    continue
+        if tok.kind == 'section':
+            current_section = tok.text
+            continue
 
-                # Price line: "NNN грн"
-                price_m = re.match(r'^(\d+)\s*грн$', next_line)
-                if price_m:
-                    val = int(price_m.group(1))
-                    if cost_price is None:
-                        cost_price = val
-                    elif retail_price is None:
-                        retail_price = val
-                        break
-                    continue
+        # Article codes: "SKU", "SKU volume" or "SKU - volume"
+        if tok.kind != 'sku':
+            continue
 
-                # Check for "Ціна салону" / "РРЦ" labels
-                if 'РРЦ' in next_line or 'салону' in next_line:
-                    continue
+        sku = tok.sku
 
-                # Stop at next section or product
-                if re.match(r'^(\d{6,10})', next_line):
+        # Look backward for product name
+        name = ''
+        for prev in reversed(previous):
+            if prev.text and not prev.unit_prefix and len(prev.text) > 5:
+                if prev.label_prefix not in ('Ціна', 'РРЦ', 'салону'):
+                    name = prev.text
                     break
 
-            if name and (retail_price or cost_price):
-                # For MOOD: first price is cost (salon), second is retail (РРЦ)
-                if retail_price and cost_price and retail_price < cost_price:
-                    cost_price, retail_price = retail_price, cost_price
+        # Look forward for prices
+        cost_price = None
+        retail_price = None
+        volume = tok.sku_volume
 
-                products.append({
-                    'title': name,
-                    'brand': 'mood',
-                    'categoryHint': current_section,
-                    'articleCode': sku,
-                    'supplierCode': '',
-                    'price': retail_price or cost_price,
-                    'costPrice': cost_price if retail_price else None,
-                    'volume': volume,
-                    'inStock': True,
-                })
+        for nxt in following:
+            # Volume line
+            if nxt.volume and not volume:
+                volume = nxt.volume
+                continue
 
-            i += 1
-            continue
+            # Price line: "NNN грн"
+            if nxt.price is not None:
+                if cost_price is None:
+                    cost_price = nxt.price
+                elif retail_price is None:
+                    retail_price = nxt.price
+                    break
+                continue
 
-        i += 1
+            # Skip "Ціна салону" / "РРЦ" labels
+            if nxt.kind == 'label':
+                continue
 
-    # Deduplicate by SKU
-    seen = set()
-    unique = []
-    for p in products:
-        if p['articleCode'] not in seen:
-            seen.add(p['articleCode'])
-            unique.append(p)
+            # Stop at next product
+            if nxt.lead_digits >= 6:
+                break
 
-    print(f"  ✅ MOOD: {len(unique)} products")
-    return unique
+        # Deduplicate by SKU (first occurrence wins)
+        if name and (retail_price or cost_price) and sku not in seen:
+            # For MOOD: first price is cost (salon), second is retail (РРЦ)
+            if retail_price and cost_price and retail_price < cost_price:
+                cost_price, retail_price = retail_price, cost_price
+
+            seen.add(sku)
+            products.append({
+                'title': name,
+                'brand': 'mood',
+                'categoryHint': current_section,
+                'articleCode': sku,
+                'supplierCode': '',
+                'price': retail_price or cost_price,
+                'costPrice': cost_price if retail_price else None,
+                'volume': volume,
+                'inStock': True,
+            })
+
+    print(f"  ✅ MOOD: {len(products)} products")
+    return products
 
 
 # ═══════════════════════════════════════════════════════════════
 # 3. NEVITALY PDF
 # ═══════════════════════════════════════════════════════════════
-def parse_nevitaly():
-    print("📦 Parsing Nevitaly catalog PDF...")
-    f = None
+def find_nevitaly_files():
     for fn in os.listdir(CATALOG_DIR):
         if 'Nevitaly' in fn and fn.endswith('.pdf'):
-            f = os.path.join(CATALOG_DIR, fn)
-            break
+            return [os.path.join(CATALOG_DIR, fn)]
+    return [None]
+
+def parse_nevitaly(pool=None):
+    print("📦 Parsing Nevitaly catalog PDF...")
+    f = find_nevitaly_files()[0]
 
     if not f:
         print("  ⚠ Nevitaly PDF not found")
         return []
 
-    doc = fitz.open(f)
-    products = []
+    tokenizer = LineTokenizer(
+        sku=r'(10\d{5,7})\s*',
+        sections=['NEV COLOR', 'CURL SUBLIME', 'FILLER SUBLIME', 'COLOR SUBLIME',
+                  'HYDRA SOURCE', 'SHIMMER', 'PRECIOUS', 'BLONDE SUBLIME', 'BLOND SUBLIME',
+                  'STYLING', 'GENTLE', 'SCALP', 'PURIFYING', 'ENERGY', 'SOOTHING',
+                  'DETOX', 'AHA', 'TERRAE', 'SYNUOSA'],
+        upper_sections=True)
 
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        lines = text.split('\n')
+    products = []
 
-        current_product_name = ''
+    for text in read_pdf_pages(f, pool):
         current_section = ''
 
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
+        # Names are looked up to 9 lines back, values 5 back to 9 ahead
+        for previous, tok, following in iter_windows(tokenizer.tokenize(text.split('\n')), 9, 9):
             # Track section headers
-            for sec in ['NEV COLOR', 'CURL SUBLIME', 'FILLER SUBLIME', 'COLOR SUBLIME',
-                       'HYDRA SOURCE', 'SHIMMER', 'PRECIOUS', 'BLONDE SUBLIME', 'BLOND SUBLIME',
-                       'STYLING', 'GENTLE', 'SCALP', 'PURIFYING', 'ENERGY', 'SOOTHING',
-                       'DETOX', 'AHA', 'TERRAE', 'SYNUOSA']:
-                if sec in line.upper():
-                    current_section = line
-                    break
+            if tok.kind == 'section':
+                current_section = tok.text
+                continue
 
             # Look for SKU pattern (7 digits)
-            sku_m = re.match(r'^(10\d{5})\s*$', line)
-            if not sku_m:
-                sku_m = re.match(r'^(10\d{5,7})\s*$', line)
-
-            if sku_m:
-                sku = sku_m.group(1)
-
-                # Look backward for product name
-                name = ''
-                for j in range(i-1, max(i-10, -1), -1):
-                    prev = lines[j].strip()
-                    if prev and len(prev) > 5 and not re.match(r'^[\d\s,\.грн]+$', prev):
-                        if not re.match(r'^(Об\'єм|Ціна|мл|грн|pH|рН)', prev):
-                            name = prev
-                            break
-
-                # Look for volume and prices nearby
-                volume = None
-                cost_price = None
-                retail_price = None
-
-                for j in range(i-5, min(i+10, len(lines))):
-                    check = lines[j].strip() if 0 <= j < len(lines) else ''
-
-                    vol_m = re.match(r'^(\d+)$', check)
-                    if vol_m and not volume:
-                        val = int(vol_m.group(1))
-                        if 50 <= val <= 1500:
-                            volume = f"{val} мл"
-
-                    price_m = re.match(r'^(\d{3,5})$', check)
-                    if price_m:
-                        val = int(price_m.group(1))
-                        if 200 <= val <= 5000:
-                            if cost_price is None:
-                                cost_price = val
-                            elif retail_price is None:
-                                retail_price = val
-
-                if name and (cost_price or retail_price):
-                    if retail_price and cost_price and retail_price < cost_price:
-                        cost_price, retail_price = retail_price, cost_price
-
-                    products.append({
-                        'title': name,
-                        'brand': 'nevitaly',
-                        'categoryHint': current_section,
-                        'articleCode': sku,
-                        'supplierCode': '',
-                        'price': retail_price or cost_price,
-                        'costPrice': cost_price if retail_price else None,
-                        'volume': volume,
-                        'inStock': True,
-                    })
+            if tok.kind != 'sku':
+                continue
 
-            i += 1
+            sku = tok.sku
 
-    doc.close()
+            # Look backward for product name
+            name = ''
+            for prev in reversed(previous):
+                if prev.text and len(prev.text) > 5 and not prev.numeric_only:
+                    if prev.label_prefix not in ("Об'єм", 'Ціна', 'мл', 'грн', 'pH', 'рН'):
+                        name = prev.text
+                        break
+
+            # Look for volume and prices nearby
+            volume = None
+            cost_price = None
+            retail_price = None
+
+            for check in [*islice(previous, max(len(previous) - 5, 0), None), tok, *following]:
+                if check.number is None:
+                    continue
+                val = check.number
+
+                if not volume and 50 <= val <= 1500:
+                    volume = f"{val} мл"
+
+                if 3 <= len(check.text) <= 5 and 200 <= val <= 5000:
+                    if cost_price is None:
+                        cost_price = val
+                    elif retail_price is None:
+                        retail_price = val
+
+            if name and (cost_price or retail_price):
+                if retail_price and cost_price and retail_price < cost_price:
+                    cost_price, retail_price = retail_price, cost_price
+
+                products.append({
+                    'title': name,
+                    'brand': 'nevitaly',
+                    'categoryHint': current_section,
+                    'articleCode': sku,
+                    'supplierCode': '',
+                    'price': retail_price or cost_price,
+                    'costPrice': cost_price if retail_price else None,
+                    'volume': volume,
+                    'inStock': True,
+                })
 
     # Deduplicate
     seen = set()
@@ -377,9 +865,8 @@ def parse_nevitaly():
 # ═══════════════════════════════════════════════════════════════
 # 4. INEBRYA PDFs
 # ═══════════════════════════════════════════════════════════════
-def parse_inebrya():
-    print("📦 Parsing Inebrya Price PDFs...")
-    # Use "магазини" version (higher margin)
+def find_inebrya_files():
+    """Return [shop_file, salon_file]."""
     shop_file = None
     salon_file = None
     for fn in os.listdir(CATALOG_DIR):
@@ -389,101 +876,85 @@ def parse_inebrya():
                 shop_file = path
             elif 'салон' in fn.lower():
                 salon_file = path
+    return [shop_file, salon_file]
 
-    if not shop_file:
-        print("  ⚠ Inebrya shop PDF not found")
-        return []
+def _parse_inebrya_list(path, pool=None):
+    """Products of one Inebrya price list (shop or salon), deduplicated by SKU."""
+    tokenizer = LineTokenizer(
+        sku=r'(\d{7})\s*',
+        volume_units='мл|гр',
+        sections=['НОВИНКИ', 'ФАРБА', 'ОКИСНИК', 'ОСВІТЛЕННЯ', 'BLONDESSE',
+                  'ICE CREAM', 'STYLE-IN', 'SHECARE', 'COLOR PERFECT',
+                  'KARYN', 'HAIR LIFT', 'Перманентна', 'Деміперманентна'])
 
-    doc = fitz.open(shop_file)
     products = []
     current_section = ''
 
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        lines = text.split('\n')
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
+    for text in iter_pdf_pages(path, pool):
+        # Name, volume and prices follow the SKU within 11 lines
+        for _, tok, following in iter_windows(tokenizer.tokenize(text.split('\n')), 0, 12):
             # Track sections
-            for sec in ['НОВИНКИ', 'ФАРБА', 'ОКИСНИК', 'ОСВІТЛЕННЯ', 'BLONDESSE',
-                       'ICE CREAM', 'STYLE-IN', 'SHECARE', 'COLOR PERFECT',
-                       'KARYN', 'HAIR LIFT', 'Перманентна', 'Деміперманентна']:
-                if sec in line:
-                    current_section = line
-                    break
+            if tok.kind == 'section':
+                current_section = tok.text
+                continue
 
             # SKU pattern for Inebrya: 7 digits
-            sku_m = re.match(r'^(10\d{5})\s*$', line)
-            if not sku_m:
-                sku_m = re.match(r'^(\d{7})\s*$', line)
-
-            if sku_m:
-                sku = sku_m.group(1)
-
-                # Look forward for: product name, volume, prices
-                name = ''
-                volume = None
-                shop_price = None
-                retail_price = None
-
-                for j in range(i+1, min(i+12, len(lines))):
-                    next_l = lines[j].strip()
-
-                    # Product name: multi-word line with Ukrainian text
-                    if not name and len(next_l) > 10 and re.search(r'[а-яА-ЯіІїЇєЄґҐ]', next_l):
-                        if not re.match(r'^[\d\s,\.грн]+$', next_l):
-                            name = next_l
-                            # Check next line too for continuation
-                            if j+1 < len(lines):
-                                cont = lines[j+1].strip()
-                                if cont and re.search(r'[а-яА-ЯіІїЇєЄ]', cont) and not re.match(r'^\d+\s*(мл|гр|грн)', cont):
-                                    if len(cont) > 3 and not re.match(r'^(Ціна|РРЦ)', cont):
-                                        name += ' ' + cont
-                            continue
+            if tok.kind != 'sku':
+                continue
+
+            sku = tok.sku
+
+            # Look forward for: product name, volume, prices
+            name = ''
+            volume = None
+            shop_price = None
+            retail_price = None
 
-                    # Volume
-                    vol_m = re.match(r'^(\d+)\s*(мл|гр)\s*$', next_l)
-                    if vol_m:
-                        volume = f"{vol_m.group(1)} {vol_m.group(2)}"
-                        continue
-
-                    # Price: "NNN грн"
-                    price_m = re.match(r'^(\d+)\s*грн$', next_l)
-                    if price_m:
-                        val = int(price_m.group(1))
-                        if shop_price is None:
-                            shop_price = val
-                        elif retail_price is None:
-                            retail_price = val
-                            break
-
-                    # Next SKU means end of current
-                    if re.match(r'^\d{7}$', next_l):
+            for j, nxt in enumerate(islice(following, 11)):
+                # Product name: multi-word line with Ukrainian text
+                if not name and len(nxt.text) > 10 and nxt.cyrillic and not nxt.numeric_only:
+                    name = nxt.text
+                    # Check next line too for continuation
+                    if j + 1 < len(following):
+                        cont = following[j + 1]
+                        if cont.text and cont.cyrillic and cont.unit_prefix not in ('мл', 'гр', 'грн'):
+                            if len(cont.text) > 3 and cont.label_prefix not in ('Ціна', 'РРЦ'):
+                                name += ' ' + cont.text
+                    continue
+
+                # Volume
+                if nxt.volume:
+                    volume = nxt.volume
+                    continue
+
+                # Price: "NNN грн"
+                if nxt.price is not None:
+                    if shop_price is None:
+                        shop_price = nxt.price
+                    elif retail_price is None:
+                        retail_price = nxt.price
                         break
 
-                if name and (shop_price or retail_price):
-                    # Shop price = our costPrice, retail = selling price
-                    if retail_price and shop_price and retail_price < shop_price:
-                        shop_price, retail_price = retail_price, shop_price
-
-                    products.append({
-                        'title': name,
-                        'brand': 'inebrya',
-                        'categoryHint': current_section,
-                        'articleCode': sku,
-                        'supplierCode': '',
-                        'price': retail_price or shop_price,
-                        'costPrice': shop_price if retail_price else None,
-                        'volume': volume,
-                        'inStock': True,
-                    })
+                # Next SKU means end of current
+                if nxt.kind == 'sku':
+                    break
 
-            i += 1
+            if name and (shop_price or retail_price):
+                # Shop price = our costPrice, retail = selling price
+                if retail_price and shop_price and retail_price < shop_price:
+                    shop_price, retail_price = retail_price, shop_price
 
-    doc.close()
+                products.append({
+                    'title': name,
+                    'brand': 'inebrya',
+                    'categoryHint': current_section,
+                    'articleCode': sku,
+                    'supplierCode': '',
+                    'price': retail_price or shop_price,
+                    'costPrice': shop_price if retail_price else None,
+                    'volume': volume,
+                    'inStock': True,
+                })
 
     # Deduplicate
     seen = set()
@@ -492,99 +963,524 @@ def parse_inebrya():
         if p['articleCode'] not in seen:
             seen.add(p['articleCode'])
             unique.append(p)
-
-    print(f"  ✅ Inebrya: {len(unique)} products")
     return unique
 
+def parse_inebrya(pool=None):
+    """Shop list products with costPrice from the salon list (joined by SKU).
+
+    The two PDFs are read in one pass each, concurrently when there is a
+    process pool; without a salon list the shop list's own prices are used.
+    Returns (products, join report or None); the report is cached with the
+    products and printed and saved by the caller.
+    """
+    print("📦 Parsing Inebrya Price PDFs...")
+    shop_file, salon_file = find_inebrya_files()
+
+    if not shop_file:
+        print("  ⚠ Inebrya shop PDF not found")
+        return [], None
+    if not salon_file:
+        print("  ⚠ Inebrya salon PDF not found, cost prices from the shop list")
+        products = _parse_inebrya_list(shop_file, pool)
+        print(f"  ✅ Inebrya: {len(products)} products")
+        return products, None
+
+    if pool is None:
+        shop, salon = (_parse_inebrya_list(path) for path in (shop_file, salon_file))
+    else:
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            shop, salon = threads.map(_parse_inebrya_list, (shop_file, salon_file), (pool, pool))
+    products, report = join_price_lists(shop, salon)
+    print(f"  ✅ Inebrya: {len(products)} products ({report['matched']} with salon prices)")
+    return products, report
+
 
 # ═══════════════════════════════════════════════════════════════
 # 5. EXTRACT IMAGES from PDFs
 # ═══════════════════════════════════════════════════════════════
-def extract_images():
+def _submit(pool, func, *args):
+    """Run func in the pool, or right away when there is no pool. Returns a Future."""
+    if pool is not None:
+        return pool.submit(func, *args)
+    fut = Future()
+    try:
+        fut.set_result(func(*args))
+    except Exception as e:
+        fut.set_exception(e)
+    return fut
+
+# Extracted images are content-addressed: every occurrence in the manifest
+# points at images/blobs/<hh>/<sha256>.<ext>, so an image reused across pages
+# or catalogs is stored (and decoded) once, and reruns skip existing blobs.
+def blob_file(key, ext):
+    """Manifest path (relative to SEED_DIR) of a stored image blob."""
+    return f"images/blobs/{key[:2]}/{key}.{ext}"
+
+def _write_blob(rel_path, write):
+    """Create a blob via write(tmp_path) unless it already exists. Returns True if written."""
+    path = os.path.join(SEED_DIR, rel_path)
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+    return True
+
+def _blob_phash(rel_path):
+    """Perceptual hash (hex dHash, see catalog_phash) of a stored blob; None if Pillow can't read it."""
+    try:
+        return f"{dhash(os.path.join(SEED_DIR, rel_path)):016x}"
+    except Exception:
+        return None
+
+def _pdf_image_key(doc, img):
+    """Content hash of an embedded PDF image: raw stream(s) plus decode parameters.
+
+    Independent of xref numbers, so the same photo embedded in two PDFs
+    hashes the same.
+    """
+    xref, smask = img[0], img[1]
+    h = hashlib.sha256(repr(img[2:7] + (img[8],)).encode())  # size, bpc, colorspaces, filter
+    h.update(doc.xref_stream_raw(xref))
+    if smask:
+        h.update(doc.xref_stream_raw(smask))
+    return h.hexdigest()
+
+_ICC_REF = re.compile(r'/ICCBased\s+(\d+)\s+0\s+R')
+
+def _colorspace_components(doc, xref):
+    """Number of color components of an image's /ColorSpace, or None if unknown."""
+    kind, value = doc.xref_get_key(xref, 'ColorSpace')
+    if kind == 'name':
+        return {'/DeviceGray': 1, '/DeviceRGB': 3, '/DeviceCMYK': 4}.get(value)
+    if kind == 'xref':
+        value = doc.xref_object(int(value.split()[0]))
+    m = _ICC_REF.search(value)
+    if m:
+        kind, n = doc.xref_get_key(int(m.group(1)), 'N')
+        return int(n) if kind == 'int' else None
+    return None
+
+def _is_web_jpeg(doc, img):
+    """True if the image's raw stream is a JPEG browsers display correctly.
+
+    That is a plain /DCTDecode stream in gray or RGB, with no soft mask,
+    color-key mask or /Decode inversion (CMYK JPEGs from print PDFs are
+    usually stored inverted and must be converted).
+    """
+    xref, smask = img[0], img[1]
+    if smask or img[4] != 8 or doc.xref_get_key(xref, 'Filter') != ('name', '/DCTDecode'):
+        return False
+    if any(doc.xref_get_key(xref, key)[0] != 'null' for key in ('Decode', 'Mask', 'ImageMask')):
+        return False
+    return _colorspace_components(doc, xref) in (1, 3)
+
+def image_filter(brand):
+    """Decorative-image limits for a brand: IMAGE_FILTER with its overrides."""
+    return {**IMAGE_FILTER, **IMAGE_FILTER_BY_BRAND.get(brand, {})}
+
+def _rgb_pixmap(doc, xref):
+    """Decoded image as a gray or RGB Pixmap."""
+    import fitz  # PyMuPDF
+    pix = fitz.Pixmap(doc, xref)
+    if pix.colorspace is None or pix.colorspace.n not in (1, 3):  # CMYK, Lab, ...
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    return pix
+
+def _samples(pix):
+    """(height, width, n) uint8 NumPy view of a Pixmap's samples, without copying them."""
+    import numpy as np
+    h, w, n = pix.height, pix.width, pix.n
+    return np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(h, pix.stride)[:, :w * n].reshape(h, w, n)
+
+def image_stats(pix, mask=None):
+    """Cheap statistics of a Pixmap (see IMAGE_FILTER), sampled on a grid.
+
+    `mask` is the image's soft mask (a gray Pixmap, any size), which gives
+    the alpha. Samples are read through NumPy views of the Pixmaps'
+    buffers, so only the sampled pixels are ever copied.
+    """
+    import numpy as np
+    samples = _samples(pix)
+    h, w = samples.shape[:2]
+    step = max(1, -(-max(h, w) // IMAGE_STATS_SIZE))
+    grid = samples[::step, ::step]
+    colour = grid[..., :pix.n - pix.alpha]
+    if pix.alpha:
+        visible = grid[..., -1] > 16
+    elif mask is not None:  # nearest mask pixel of every grid point
+        alpha = _samples(mask)[..., 0]
+        rows = np.arange(0, h, step) * alpha.shape[0] // h
+        cols = np.arange(0, w, step) * alpha.shape[1] // w
+        visible = alpha[rows[:, None], cols] > 16
+    else:
+        visible = np.ones(grid.shape[:2], dtype=bool)
+    if not visible.any():
+        return {'alpha_coverage': 0.0, 'std': 0.0, 'colors': 0, 'edge_density': 0.0}
+
+    gray = colour.mean(axis=2, dtype=np.float32)
+    quantized = (colour >> 4).astype(np.uint16)
+    packed = quantized[..., 0]
+    for c in range(1, colour.shape[2]):
+        packed = (packed << 4) | quantized[..., c]
+    inner = visible[:-1, :-1]
+    edges = (np.abs(np.diff(gray, axis=1))[:-1] + np.abs(np.diff(gray, axis=0))[:, :-1]) > 32
+    return {
+        'alpha_coverage': round(float(visible.mean()), 4),
+        'std': round(float(gray[visible].std()), 2),
+        'colors': int(np.unique(packed[visible]).size),
+        'edge_density': round(float(edges[inner].mean()) if inner.any() else 0.0, 4),
+    }
+
+def decorative_reason(stats, limits):
+    """Why an image with these statistics is decorative, or None if it isn't."""
+    for stat, reason in (('alpha_coverage', 'transparent'), ('std', 'blank'),
+                         ('colors', 'flat'), ('edge_density', 'smooth')):
+        if stats[stat] < limits[stat]:
+            return reason
+    return None
+
+def _extract_pdf_images(filepath, brand, start, stop, image_format=IMAGE_FORMAT, quality=IMAGE_QUALITY,
+                        limits=None):
+    """Store images from PDF pages [start, stop); return their manifest entries.
+
+    Runs in a worker process with its own document handle. Small images are
+    skipped from get_images() metadata before anything is decoded, and only
+    one Pixmap is alive at a time. With `limits` (see image_filter) every
+    image is decoded once to check it isn't decorative; rejected images get
+    an entry with 'rejected' and 'stats' instead of a file. Otherwise images
+    already in the blob store are not decoded at all. Unless `image_format`
+    is 'png', web-ready JPEG streams are copied byte for byte and the rest
+    is encoded as `image_format` at `quality`.
+    """
+    import fitz  # PyMuPDF
+    fn = os.path.basename(filepath)
+    slug = slugify(fn.rsplit('.', 1)[0])
+    entries = []
+    keys = {}  # xref -> content hash, for images reused across pages
+    verdicts = {}  # xref -> (reject reason or None, stats)
+    phashes = {}  # blob -> perceptual hash
+    doc = fitz.open(filepath)
+    try:
+        for page_num in range(start, stop):
+            images = doc[page_num].get_images(full=True)
+            for img_idx, img in enumerate(images):
+                xref, width, height = img[0], img[2], img[3]
+                if width < MIN_IMAGE_SIZE or height < MIN_IMAGE_SIZE:
+                    continue
+                try:
+                    entry = {
+                        'name': f"{slug}_p{page_num+1}_img{img_idx+1}.png",
+                        'brand': brand,
+                        'source': fn,
+                        'page': page_num + 1,
+                        'index': img_idx + 1,
+                        'width': width,
+                        'height': height,
+                    }
+                    pix = None
+                    if limits is not None:
+                        if xref not in verdicts:
+                            pix = _rgb_pixmap(doc, xref)
+                            stats = image_stats(pix, fitz.Pixmap(doc, img[1]) if img[1] else None)
+                            verdicts[xref] = (decorative_reason(stats, limits), stats)
+                        reason, stats = verdicts[xref]
+                        if reason:
+                            entries.append({**entry, 'rejected': reason, 'stats': stats})
+                            continue
+                    if xref not in keys:
+                        keys[xref] = _pdf_image_key(doc, img)
+                    if image_format != 'png' and _is_web_jpeg(doc, img):
+                        rel_path = blob_file(keys[xref], 'jpg')
+
+                        def write_image(tmp):
+                            with open(tmp, 'wb') as fout:
+                                fout.write(doc.xref_stream_raw(xref))
+                    else:
+                        key = keys[xref]
+                        if image_format != 'png':  # lossy: same source at another quality is another blob
+                            key = hashlib.sha256(f"{key}:{image_format}:{quality}".encode()).hexdigest()
+                        rel_path = blob_file(key, IMAGE_FORMATS[image_format])
+
+                        def write_image(tmp, pix=pix):
+                            if pix is None:
+                                pix = _rgb_pixmap(doc, xref)
+                            if image_format == 'png':
+                                pix.save(tmp, output='png')
+                                return
+                            if pix.alpha and image_format == 'jpeg':
+                                pix = fitz.Pixmap(pix, 0)
+                            pix.pil_save(tmp, format=image_format.upper(), quality=quality)
+
+                    _write_blob(rel_path, write_image)
+                    pix = None
+                    if rel_path not in phashes:
+                        phashes[rel_path] = _blob_phash(rel_path)
+                    entries.append({
+                        'file': rel_path,
+                        **entry,
+                        'bytes': os.path.getsize(os.path.join(SEED_DIR, rel_path)),
+                        'phash': phashes[rel_path],
+                    })
+                except Exception:
+                    pass
+    finally:
+        doc.close()
+    return entries
+
+# PPTX decks are read as the zip archives they are: slide XML gives the
+# pictures and their displayed size, image parts are streamed to the blob store.
+_OOXML_NS = {
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+_R_ID = f"{{{_OOXML_NS['r']}}}id"
+_R_EMBED = f"{{{_OOXML_NS['r']}}}embed"
+_P_PIC = f"{{{_OOXML_NS['p']}}}pic"
+# Slide tree children python-pptx counts as shapes (shape index in names)
+_SHAPE_TAGS = {f"{{{_OOXML_NS['p']}}}{tag}" for tag in ('sp', 'grpSp', 'graphicFrame', 'cxnSp', 'pic', 'contentPart')}
+# Pillow format of a picture -> blob extension (as python-pptx's content type gave it)
+PPTX_IMAGE_EXTS = {'BMP': 'bmp', 'GIF': 'gif', 'JPEG': 'jpg', 'PNG': 'png', 'TIFF': 'tiff', 'WMF': 'x-wmf'}
+
+def _zip_rels(z, part, rel_type=None):
+    """{rId: part name} of a package part's internal relationships, optionally of one type."""
+    folder, name = posixpath.split(part)
+    try:
+        root = ET.fromstring(z.read(posixpath.join(folder, '_rels', f"{name}.rels")))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iterfind('rel:Relationship', _OOXML_NS):
+        if rel.get('TargetMode') == 'External':
+            continue
+        if rel_type and not rel.get('Type', '').endswith(f"/{rel_type}"):
+            continue
+        rels[rel.get('Id')] = posixpath.normpath(posixpath.join(folder, rel.get('Target'))).lstrip('/')
+    return rels
+
+def _stream_zip_image(z, part):
+    """Copy an image part into the blob store in 1 MB chunks, hashing on the way.
+
+    Returns (blob path, extension, width, height, bytes), or None if Pillow
+    can't identify the image. Only its header is decoded, for format and size.
+    """
+    from PIL import Image
+    blob_dir = os.path.join(SEED_DIR, 'images', 'blobs')
+    os.makedirs(blob_dir, exist_ok=True)
+    tmp = os.path.join(blob_dir, f".{os.getpid()}.tmp")
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with z.open(part) as src, open(tmp, 'wb') as out:
+            for chunk in iter(lambda: src.read(1 << 20), b''):
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        try:
+            with Image.open(tmp) as im:
+                ext = PPTX_IMAGE_EXTS.get(im.format)
+                width, height = im.size
+        except Exception:
+            ext = None
+        if ext is None:
+            return None
+        rel_path = blob_file(h.hexdigest(), ext)
+        path = os.path.join(SEED_DIR, rel_path)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path)
+        return rel_path, ext, width, height, size
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _extract_pptx_images(filepath, brand):
+    """Store the pictures of a PPTX deck; return their manifest entries.
+
+    Picture shapes (not placeholders or videos) are found in the slide XML
+    and their image parts streamed straight out of the zip, never held in
+    memory whole. An image part shown on several slides gets one entry, at
+    its first appearance.
+    """
+    fn = os.path.basename(filepath)
+    slug = slugify(fn.rsplit('.', 1)[0])
+    entries = []
+    seen = set()  # image parts already in the manifest (or unreadable)
+    with zipfile.ZipFile(filepath) as z:
+        presentation = next(iter(_zip_rels(z, '', 'officeDocument').values()))
+        slide_parts = _zip_rels(z, presentation)
+        slide_ids = ET.fromstring(z.read(presentation)).iterfind('p:sldIdLst/p:sldId', _OOXML_NS)
+        for slide_idx, slide_id in enumerate(slide_ids):
+            slide = slide_parts[slide_id.get(_R_ID)]
+            rels = _zip_rels(z, slide)
+            tree = ET.fromstring(z.read(slide)).find('p:cSld/p:spTree', _OOXML_NS)
+            shapes = [elm for elm in tree if elm.tag in _SHAPE_TAGS]
+            for shape_idx, shape in enumerate(shapes):
+                if shape.tag != _P_PIC or shape.find('p:nvPicPr/p:nvPr/p:ph', _OOXML_NS) is not None \
+                        or shape.find('p:nvPicPr/p:nvPr/a:videoFile', _OOXML_NS) is not None:
+                    continue
+                # Displayed size (EMU at 96 dpi) decides what is a logo/icon
+                extent = shape.find('p:spPr/a:xfrm/a:ext', _OOXML_NS)
+                cx, cy = (int(extent.get('cx', 0)), int(extent.get('cy', 0))) if extent is not None else (0, 0)
+                if cx / 914400 * 96 < MIN_IMAGE_SIZE or cy / 914400 * 96 < MIN_IMAGE_SIZE:
+                    continue
+                blip = shape.find('p:blipFill/a:blip', _OOXML_NS)
+                part = rels.get(blip.get(_R_EMBED)) if blip is not None else None
+                if part is None or part in seen:
+                    continue
+                seen.add(part)
+                stored = _stream_zip_image(z, part)
+                if stored is None:
+                    continue
+                rel_path, ext, width, height, size = stored
+                entries.append({
+                    'file': rel_path,
+                    'name': f"{slug}_s{slide_idx+1}_img{shape_idx+1}.{ext}",
+                    'brand': brand,
+                    'source': fn,
+                    'page': slide_idx + 1,
+                    'index': shape_idx + 1,
+                    'width': width,
+                    'height': height,
+                    'bytes': size,
+                    'phash': _blob_phash(rel_path),
+                })
+    return entries
+
+# Catalog file name fragment -> brand of its images
+IMAGE_BRANDS = {
+    'Elgon_ua': 'elgon', 'Elgon_Scalpcare': 'elgon', 'AFFIXX': 'elgon',
+    'YES ESSENTIAL': 'elgon', 'MOOD': 'mood', 'DREAM CURLS': 'mood',
+    'BODY BUILDER': 'mood', 'KERATIN': 'mood', 'SUNCARE': 'mood',
+    'BODYGUARD': 'mood', 'Nevitaly': 'nevitaly', 'Inebrya': 'inebrya',
+}
+
+def catalog_brand(fn):
+    """Brand of a catalog file's images, 'unknown' if the name doesn't say."""
+    for key, val in IMAGE_BRANDS.items():
+        if key.lower() in fn.lower():
+            return val
+    return 'unknown'
+
+def extract_images(pool=None, image_format=IMAGE_FORMAT, quality=IMAGE_QUALITY, brands=None, filter_images=True):
+    """Extract catalog images, returning the manifest.
+
+    With a process pool, PDFs are split into page ranges decoded in parallel
+    and PPTX decks are handled by their own worker; entries are merged back
+    in file and page order, so the manifest matches a serial run. `brands`
+    limits extraction to those brands' catalogs. With `filter_images`,
+    decorative PDF images are rejected by their brand's image_filter().
+    """
+    import fitz  # PyMuPDF
     print("🖼️  Extracting images from catalogs...")
     manifest = []
-    brands_map = {
-        'Elgon_ua': 'elgon', 'Elgon_Scalpcare': 'elgon', 'AFFIXX': 'elgon',
-        'YES ESSENTIAL': 'elgon', 'MOOD': 'mood', 'DREAM CURLS': 'mood',
-        'BODY BUILDER': 'mood', 'KERATIN': 'mood', 'SUNCARE': 'mood',
-        'BODYGUARD': 'mood', 'Nevitaly': 'nevitaly', 'Inebrya': 'inebrya',
-    }
 
+    jobs = []  # (filename, cache key, [Future]) in listing order
     for fn in os.listdir(CATALOG_DIR):
         filepath = os.path.join(CATALOG_DIR, fn)
-        brand = 'unknown'
-        for key, val in brands_map.items():
-            if key.lower() in fn.lower():
-                brand = val
-                break
+        brand = catalog_brand(fn)
 
-        brand_dir = os.path.join(IMG_DIR, brand)
-        os.makedirs(brand_dir, exist_ok=True)
+        if not fn.endswith(('.pdf', '.pptx')):
+            continue
+        if brands and brand not in brands:
+            continue
+        limits = image_filter(brand) if filter_images else None
+        key = cache_key([filepath], _extract_pdf_images, _pdf_image_key, _is_web_jpeg, _colorspace_components,
+                        _rgb_pixmap, _samples, image_stats, decorative_reason, _blob_phash, dhash,
+                        _extract_pptx_images, _zip_rels, _stream_zip_image, params=(image_format, quality, json.dumps(limits, sort_keys=True)))
+        cached = cache_load('images', key)
+        if cached is not None and all(os.path.exists(os.path.join(SEED_DIR, e['file'])) for e in cached if 'file' in e):
+            jobs.append((filepath, None, None, [_submit(None, _profiled, list, cached)]))
+            continue
 
         if fn.endswith('.pdf'):
             try:
                 doc = fitz.open(filepath)
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    images = page.get_images(full=True)
-                    for img_idx, img in enumerate(images):
-                        xref = img[0]
-                        try:
-                            pix = fitz.Pixmap(doc, xref)
-                            if pix.width < 150 or pix.height < 150:
-                                continue
-                            if pix.n - pix.alpha > 3:  # CMYK
-                                pix = fitz.Pixmap(fitz.csRGB, pix)
-
-                            img_name = f"{slugify(fn.rsplit('.', 1)[0])}_p{page_num+1}_img{img_idx+1}.png"
-                            img_path = os.path.join(brand_dir, img_name)
-                            pix.save(img_path)
-                            manifest.append({
-                                'file': f"images/{brand}/{img_name}",
-                                'brand': brand,
-                                'source': fn,
-                                'page': page_num + 1,
-                                'width': pix.width,
-                                'height': pix.height,
-                            })
-                        except Exception as e:
-                            pass
+                page_count = len(doc)
                 doc.close()
             except Exception as e:
                 print(f"  ⚠ Error processing {fn}: {e}")
-
-        elif fn.endswith('.pptx'):
+                continue
+            step = PAGES_PER_JOB if pool is not None else max(page_count, 1)
+            futures = [
+                _submit(pool, _profiled, _extract_pdf_images, filepath, brand, start,
+                        min(start + step, page_count), image_format, quality, limits)
+                for start in range(0, page_count, step)
+            ]
+        else:
+            page_count = None
+            futures = [_submit(pool, _profiled, _extract_pptx_images, filepath, brand)]
+        jobs.append((filepath, key, page_count, futures))
+
+    for filepath, key, page_count, futures in jobs:
+        entries = []
+        failed = False
+        wall = cpu = 0.0  # summed over the file's page-range jobs
+        for fut in futures:
             try:
-                from pptx import Presentation
-                from pptx.util import Emu
-                prs = Presentation(filepath)
-                for slide_idx, slide in enumerate(prs.slides):
-                    for shape_idx, shape in enumerate(slide.shapes):
-                        if shape.shape_type == 13:  # Picture
-                            image = shape.image
-                            w = shape.width / 914400 * 96 if shape.width else 0
-                            h = shape.height / 914400 * 96 if shape.height else 0
-                            if w < 150 or h < 150:
-                                continue
-                            ext = image.content_type.split('/')[-1]
-                            if ext == 'jpeg':
-                                ext = 'jpg'
-                            img_name = f"{slugify(fn.rsplit('.', 1)[0])}_s{slide_idx+1}_img{shape_idx+1}.{ext}"
-                            img_path = os.path.join(brand_dir, img_name)
-                            with open(img_path, 'wb') as fout:
-                                fout.write(image.blob)
-                            manifest.append({
-                                'file': f"images/{brand}/{img_name}",
-                                'brand': brand,
-                                'source': fn,
-                                'page': slide_idx + 1,
-                                'width': int(w),
-                                'height': int(h),
-                            })
+                result, job_wall, job_cpu = fut.result()
             except Exception as e:
-                print(f"  ⚠ Error processing {fn}: {e}")
+                print(f"  ⚠ Error processing {os.path.basename(filepath)}: {e}")
+                failed = True
+                continue
+            entries.extend(result)
+            wall += job_wall
+            cpu += job_cpu
+        manifest.extend(entries)
+        if key and not failed:
+            cache_store('images', key, entries)
+        PROFILE.add_file('images', filepath, wall, cpu, pages=page_count, images=len(entries), cached=key is None)
+
+    blobs = {entry['file']: entry['bytes'] for entry in manifest if 'file' in entry}
+    rejected = Counter(entry['rejected'] for entry in manifest if 'rejected' in entry)
+    print(f"  ✅ Extracted {len(manifest) - sum(rejected.values())} images ({len(blobs)} unique files, "
+          f"{sum(blobs.values()) / 1e6:.1f} MB)")
+    if rejected:
+        print(f"  🚫 Rejected {sum(rejected.values())} decorative images "
+              f"({', '.join(f'{n} {reason}' for reason, n in rejected.most_common())})")
+    return manifest
 
-    print(f"  ✅ Extracted {len(manifest)} images")
+
+# ═══════════════════════════════════════════════════════════════
+# IMAGE DERIVATIVES
+# ═══════════════════════════════════════════════════════════════
+def add_derivatives(manifest, pool=None, quality=DERIVATIVE_QUALITY):
+    """Generate responsive derivatives for every stored image (see catalog_images).
+
+    Each unique blob is handled once, on the pool when there is one, and
+    every manifest entry gets a 'derivatives' set with paths relative to
+    SEED_DIR. Existing derivative files are reused as-is.
+    """
+    print("🖼️  Generating image derivatives...")
+    prefix = os.path.relpath(DERIVATIVES_DIR, SEED_DIR).replace(os.sep, '/')
+    futures = {}
+    for entry in manifest:
+        if 'file' in entry and entry['file'] not in futures:
+            src = os.path.join(SEED_DIR, entry['file'])
+            futures[entry['file']] = _submit(pool, make_derivatives, src, DERIVATIVES_DIR, quality)
+
+    sets = {}
+    for rel_path, fut in futures.items():
+        try:
+            derivatives = fut.result()
+        except Exception as e:
+            print(f"  ⚠ Error processing {rel_path}: {e}")
+            continue
+        for spec in derivatives.values():
+            for image_format in ('webp', 'jpeg'):
+                spec[image_format] = f"{prefix}/{spec[image_format]}"
+        sets[rel_path] = derivatives
+
+    for entry in manifest:
+        if entry.get('file') in sets:
+            entry['derivatives'] = sets[entry['file']]
+
+    files = {path for derivatives in sets.values() for spec in derivatives.values()
+             for path in (spec['webp'], spec['jpeg'])}
+    print(f"  ✅ {len(sets)} derivative sets ({len(files)} files)")
     return manifest
 
 
@@ -784,175 +1680,840 @@ def generate_blog_posts():
 # ═══════════════════════════════════════════════════════════════
 # CATEGORY ASSIGNMENT LOGIC
 # ═══════════════════════════════════════════════════════════════
-def assign_category(product):
-    """Assign category slug based on product title and categoryHint."""
-    title = product['title'].lower()
-    hint = product.get('categoryHint', '').lower()
-
+# Ordered rules; the first one that matches wins. Each rule is
+# (category slug, required groups, excluded groups) where a group is
+# (field, keywords): every required group needs at least one keyword in the
+# lower-cased field ('title' or 'hint'), and no excluded group may have one.
+COLOR_WORDS = ('title', ['фарба', 'крем-фарба', 'color', 'colour'])
+AMPOULE_WORDS = ('title', ['ампул', 'лосьйон', 'lotion', 'концентрат', 'treatment'])
+
+CATEGORY_RULES = [
     # Hair dye / color
-    if any(w in title for w in ['фарба', 'крем-фарба', 'color', 'colour']):
-        if any(w in title for w in ['безаміачн', 'bionic']):
-            return 'bezamіachna-farba'
-        if any(w in title for w in ['деміперманент', 'demi']):
-            return 'demipermanentna-farba'
-        return 'permanentna-farba'
+    ('bezamіachna-farba', [COLOR_WORDS, ('title', ['безаміачн', 'bionic'])], []),
+    ('demipermanentna-farba', [COLOR_WORDS, ('title', ['деміперманент', 'demi'])], []),
+    ('permanentna-farba', [COLOR_WORDS], []),
 
     # Toning
-    if any(w in title for w in ['тонуюч', 'i-care', 'i-light', 'тонер', 'tonalight', 'пігмент прямої']):
-        return 'tonuyuchi-zasoby'
+    ('tonuyuchi-zasoby', [('title', ['тонуюч', 'i-care', 'i-light', 'тонер', 'tonalight', 'пігмент прямої'])], []),
 
     # Oxidants
-    if any(w in title for w in ['окисл', 'оксид', 'окисник', 'активатор', 'activator', 'oxidant', 'oxydant']):
-        return 'okyslyuvachi'
+    ('okyslyuvachi', [('title', ['окисл', 'оксид', 'окисник', 'активатор', 'activator', 'oxidant', 'oxydant'])], []),
 
     # Bleach/lightening
-    if any(w in title for w in ['пудра', 'знебарвл', 'освітл', 'bleach', 'blonde', 'lightener']):
-        return 'osvitlennya-ta-znebarvlennya'
+    ('osvitlennya-ta-znebarvlennya', [('title', ['пудра', 'знебарвл', 'освітл', 'bleach', 'blonde', 'lightener'])], []),
 
     # Color masks
-    if any(w in hint for w in ['кольоров', 'terrae']):
-        return 'kolorovi-masky'
+    ('kolorovi-masky', [('hint', ['кольоров', 'terrae'])], []),
 
     # Perm / waving
-    if any(w in title for w in ['завивк', 'waving', 'fixing lotion', 'біозавівк']):
-        return 'khimichna-zavyvka'
+    ('khimichna-zavyvka', [('title', ['завивк', 'waving', 'fixing lotion', 'біозавівк'])], []),
 
     # Sets
-    if any(w in title for w in ['набір', 'gift box', 'kit']):
-        return 'nabory'
+    ('nabory', [('title', ['набір', 'gift box', 'kit'])], []),
 
     # Men
-    if any(w in title for w in ['man ', 'man,', 'для чоловік', 'elgon man']):
-        return 'dlya-cholovikiv'
-    if 'для чоловік' in hint:
-        return 'dlya-cholovikiv'
+    ('dlya-cholovikiv', [('title', ['man ', 'man,', 'для чоловік', 'elgon man'])], []),
+    ('dlya-cholovikiv', [('hint', ['для чоловік'])], []),
 
     # Suncare
-    if any(w in title for w in ['сонцезахис', 'suncare', 'aftersun', 'sun ']):
-        return 'sontsezakhyst'
-    if 'suncare' in hint.lower():
-        return 'sontsezakhyst'
+    ('sontsezakhyst', [('title', ['сонцезахис', 'suncare', 'aftersun', 'sun '])], []),
+    ('sontsezakhyst', [('hint', ['suncare'])], []),
 
     # Scalp care
-    if any(w in title for w in ['проти лупи', 'purifying', 'purif']):
-        return 'proty-lupy'
-    if any(w in title for w in ['проти випад', 'anti hairloss', 'stimulat', 'випадіння', 'anti-hairloss', 'scalp awake']):
-        return 'proty-vypadinnya'
-    if any(w in title for w in ['детокс', 'detox', 'пілінг', 'peeling', 'глибокого очищення шкіри', 'rebalancing', 'deep clean']):
-        return 'detoks'
-    if any(w in title for w in ['скальп', 'scalp', 'шкіри голови', 'шкіри гол']):
-        return 'skalp-doglyad'
+    ('proty-lupy', [('title', ['проти лупи', 'purifying', 'purif'])], []),
+    ('proty-vypadinnya', [('title', ['проти випад', 'anti hairloss', 'stimulat', 'випадіння', 'anti-hairloss', 'scalp awake'])], []),
+    ('detoks', [('title', ['детокс', 'detox', 'пілінг', 'peeling', 'глибокого очищення шкіри', 'rebalancing', 'deep clean'])], []),
+    ('skalp-doglyad', [('title', ['скальп', 'scalp', 'шкіри голови', 'шкіри гол'])], []),
 
     # Color care
-    if any(w in title for w in ['colorcare', 'color protect', 'color sublime', 'за кольором', 'silver shamp', 'silver cond', 'anti-red', 'anti-yellow', 'фіолетовими пігмент', 'нейтралізац']):
-        return 'doglyad-za-kolorom'
-    if 'silver' in hint.lower() or 'anti-red' in hint.lower() or 'color' in hint.lower():
-        if not any(w in title for w in ['фарба', 'color,', 'крем-фарба']):
-            return 'doglyad-za-kolorom'
+    ('doglyad-za-kolorom', [('title', ['colorcare', 'color protect', 'color sublime', 'за кольором', 'silver shamp', 'silver cond', 'anti-red', 'anti-yellow', 'фіолетовими пігмент', 'нейтралізац'])], []),
+    ('doglyad-za-kolorom', [('hint', ['silver', 'anti-red', 'color'])], [('title', ['фарба', 'color,', 'крем-фарба'])]),
 
     # Keratin
-    if any(w in title for w in ['кератин', 'keratin']):
-        return 'keratynovi-zasoby'
+    ('keratynovi-zasoby', [('title', ['кератин', 'keratin'])], []),
 
     # Lamination
-    if any(w in title for w in ['ламінуванн', 'lamination']):
-        return 'laminuvannya'
+    ('laminuvannya', [('title', ['ламінуванн', 'lamination'])], []),
 
     # Ampoules
-    if any(w in title for w in ['ампул', 'лосьйон', 'lotion', 'концентрат', 'treatment']):
-        if 'випадіння' in title or 'hairloss' in title:
-            return 'proty-vypadinnya'
-        if 'лупи' in title or 'purif' in title:
-            return 'proty-lupy'
-        return 'ampuly-ta-kontsentraty'
+    ('proty-vypadinnya', [AMPOULE_WORDS, ('title', ['випадіння', 'hairloss'])], []),
+    ('proty-lupy', [AMPOULE_WORDS, ('title', ['лупи', 'purif'])], []),
+    ('ampuly-ta-kontsentraty', [AMPOULE_WORDS], []),
 
     # Styling products
-    if any(w in title for w in ['лак ', 'лак,', 'hairspray', 'hair spray', 'fix it', 'eco spray', 'total fix', 'logic style']):
-        return 'laky'
-    if any(w in title for w in ['мус ', 'мус,', 'mousse', 'піна', 'foam']):
-        return 'musy-ta-piny'
-    if any(w in title for w in ['паста', 'paste', 'віск', 'wax', 'гума', 'gum', 'гель', 'gel', 'пудра для об', 'hair lift', 'volumizing powder']):
-        if 'знебарвл' not in title:
-            return 'pasty-ta-vosky'
-    if any(w in title for w in ['термозахис', 'thermo', 'heat defend', 'straight look']):
-        return 'termozakhyst'
-    if any(w in hint for w in ['стайлінг', 'styling', 'affixx', 'bodyguard', 'style-in']):
-        return 'staylinh'
+    ('laky', [('title', ['лак ', 'лак,', 'hairspray', 'hair spray', 'fix it', 'eco spray', 'total fix', 'logic style'])], []),
+    ('musy-ta-piny', [('title', ['мус ', 'мус,', 'mousse', 'піна', 'foam'])], []),
+    ('pasty-ta-vosky', [('title', ['паста', 'paste', 'віск', 'wax', 'гума', 'gum', 'гель', 'gel', 'пудра для об', 'hair lift', 'volumizing powder'])], [('title', ['знебарвл'])]),
+    ('termozakhyst', [('title', ['термозахис', 'thermo', 'heat defend', 'straight look'])], []),
+    ('staylinh', [('hint', ['стайлінг', 'styling', 'affixx', 'bodyguard', 'style-in'])], []),
 
     # Care products
-    if any(w in title for w in ['шампунь', 'shampoo', 'cleanser', 'cleancer']):
-        return 'shampuni'
-    if any(w in title for w in ['маска', 'mask', 'pack']):
-        return 'masky-ta-balzamy'
-    if any(w in title for w in ['кондиціонер', 'conditioner', 'бальзам']):
-        return 'kondytsionery'
-    if any(w in title for w in ['незмивн', 'leave-in', 'leave in', 'крем для', 'cream', 'флюїд', 'fluid', 'праймер', 'primer']):
-        return 'nezmyvni-zasoby'
-    if any(w in title for w in ['олія', 'oil', 'сироватк', 'serum']):
-        return 'oliyi-ta-syrovatky'
-    if any(w in title for w in ['спрей', 'spray', 'mist', 'тонік', 'tonic']):
-        return 'spreyi'
+    ('shampuni', [('title', ['шампунь', 'shampoo', 'cleanser', 'cleancer'])], []),
+    ('masky-ta-balzamy', [('title', ['маска', 'mask', 'pack'])], []),
+    ('kondytsionery', [('title', ['кондиціонер', 'conditioner', 'бальзам'])], []),
+    ('nezmyvni-zasoby', [('title', ['незмивн', 'leave-in', 'leave in', 'крем для', 'cream', 'флюїд', 'fluid', 'праймер', 'primer'])], []),
+    ('oliyi-ta-syrovatky', [('title', ['олія', 'oil', 'сироватк', 'serum'])], []),
+    ('spreyi', [('title', ['спрей', 'spray', 'mist', 'тонік', 'tonic'])], []),
+]
+
+# Fallback to parent care
+DEFAULT_CATEGORY = 'doglyad-za-volossynam'
+
+
+class CategoryClassifier:
+    """Compiled form of CATEGORY_RULES.
+
+    Each field is scanned once by a KeywordMatcher; only rules whose first
+    required group was hit are evaluated, in rule order, so the cost per
+    product does not grow with the number of rules. Results are memoized
+    per (title, hint).
+    """
+
+    def __init__(self, rules, default):
+        self.default = default
+        self.rules = [
+            (category,
+             [(field, frozenset(words)) for field, words in required],
+             [(field, frozenset(words)) for field, words in excluded])
+            for category, required, excluded in rules
+        ]
+        keywords = {'title': set(), 'hint': set()}
+        self._triggers = {'title': {}, 'hint': {}}  # field -> keyword -> rule indexes
+        for idx, (_, required, excluded) in enumerate(self.rules):
+            for field, words in required + excluded:
+                keywords[field] |= words
+            field, words = required[0]
+            for word in words:
+                self._triggers[field].setdefault(word, []).append(idx)
+        self._matchers = {field: KeywordMatcher(words) for field, words in keywords.items()}
+        self.classify = functools.lru_cache(maxsize=1 << 16)(self._classify)
+
+    def _classify(self, title, hint):
+        hits = {
+            'title': self._matchers['title'].find(title.lower()),
+            'hint': self._matchers['hint'].find(hint.lower()) if hint else set(),
+        }
+        candidates = set()
+        for field, words in hits.items():
+            triggers = self._triggers[field]
+            for word in words:
+                if word in triggers:
+                    candidates.update(triggers[word])
+        for idx in sorted(candidates):
+            category, required, excluded = self.rules[idx]
+            if all(hits[field] & words for field, words in required) and \
+                    not any(hits[field] & words for field, words in excluded):
+                return category
+        return self.default
+
+
+CLASSIFIER = CategoryClassifier(CATEGORY_RULES, DEFAULT_CATEGORY)
 
-    # Fallback to parent care
-    return 'doglyad-za-volossynam'
+
+def assign_category(product):
+    """Assign category slug based on product title and categoryHint."""
+    return CLASSIFIER.classify(product['title'], product.get('categoryHint', ''))
+
+
+def assign_categories(products):
+    """Set 'category' on every product in place; returns the list."""
+    classify = CLASSIFIER.classify
+    for p in products:
+        p['category'] = classify(p['title'], p.get('categoryHint', ''))
+    return products
 
 
 # ═══════════════════════════════════════════════════════════════
-# MAIN
+# UNIT PRICES
 # ═══════════════════════════════════════════════════════════════
-def main():
-    print("=" * 60)
-    print("  HAIR LAB — Catalog Data Extraction")
-    print("=" * 60)
+def add_unit_prices(products):
+    """Set quantity, unit ('ml'/'g'), pricePer100 and costPer100 on every product; returns the list.
+
+    Volumes are parsed once per distinct string (parse_quantity is cached),
+    then the list's prices are divided in one NumPy pass; extract() and the
+    seed pipeline call it once per brand, as each parser finishes. Fields
+    are None when the volume or the price is unknown.
+    """
+    import numpy as np
+    parsed = [parse_quantity(p.get('volume')) for p in products]
+    quantity = np.array([q or np.nan for q, _ in parsed], dtype=np.float64)
+    prices = np.array([[p.get('price') or np.nan, p.get('costPrice') or np.nan] for p in products],
+                      dtype=np.float64).reshape(-1, 2)
+    per100 = np.round(prices / quantity[:, None] * 100, 2)
+    per100 = np.where(np.isnan(per100), None, per100).tolist()  # NaN -> None, floats -> Python floats
+    for p, (q, unit), (price, cost) in zip(products, parsed, per100):
+        p['quantity'] = q
+        p['unit'] = unit
+        p['pricePer100'] = price
+        p['costPer100'] = cost
+    return products
 
-    # Parse all brands
-    elgon = parse_elgon()
-    mood = parse_mood()
-    nevitaly = parse_nevitaly()
-    inebrya = parse_inebrya()
 
-    # Assign categories
-    all_products = elgon + mood + nevitaly + inebrya
-    for p in all_products:
-        p['category'] = assign_category(p)
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+# brand -> (parser, source file locator, helpers whose code feeds the cache key)
+PARSERS = {
+    'elgon': (parse_elgon, find_elgon_files, [parse_elgon_frame, _int_cells, _text_cells]),
+    'mood': (parse_mood, find_mood_files, [iter_lines, iter_windows, LineTokenizer, KeywordMatcher]),
+    'nevitaly': (parse_nevitaly, find_nevitaly_files, [iter_windows, LineTokenizer, KeywordMatcher]),
+    'inebrya': (parse_inebrya, find_inebrya_files,
+                [_parse_inebrya_list, join_price_lists, iter_windows, LineTokenizer, KeywordMatcher]),
+}
+
+
+def lost_source(brand, products):
+    """Why a parse of `brand` must not replace its saved products, or None.
+
+    A brand whose price list is missing (or briefly gone while it is being
+    renamed or re-uploaded) parses to nothing; diffing that against the
+    saved file would queue every product for retirement.
+    """
+    if not any(PARSERS[brand][1]()):
+        return 'source file not found'
+    if not products and load_snapshot(SEED_DIR, f'products-{brand}'):
+        return 'no products parsed'
+    return None
 
-    # Generate supporting data
-    categories = generate_categories()
-    brands = generate_brands()
-    blog_posts = generate_blog_posts()
 
-    # Extract images
-    images_manifest = extract_images()
+def iter_parsers(pool=None, brands=None):
+    """Yield (brand, products) for the brand parsers (all, or those in `brands`) as each finishes.
+
+    Brands whose source files and parser code are unchanged are served from
+    the extraction cache, first. With a process pool the remaining parsers
+    run concurrently: Elgon in a worker process, the PDF parsers in threads
+    that fan their page ranges out to the same pool; they are yielded in
+    the order they finish. Each brand's products are identical to a serial
+    run. Parsers that join two price lists return (products, report); the
+    report is cached along with the products, printed and kept in
+    PRICE_JOINS.
+    """
+    def joined(brand, report):
+        PRICE_JOINS.pop(brand, None)
+        if report is not None:
+            PRICE_JOINS[brand] = report
+            print_price_join(report)
+
+    pending = {}
+    for brand, (parse, locate, helpers) in PARSERS.items():
+        if brands and brand not in brands:
+            continue
+        wall, cpu = time.perf_counter(), time.process_time()
+        sources = [path for path in locate() if path]
+        key = cache_key(sources, parse, extract_volume, extract_volumes, *helpers) if sources else None
+        cached = cache_load('products', f"{brand}-{key}") if key else None
+        if cached is not None:
+            print(f"  ♻ {brand}: {len(cached['products'])} products (cached)")
+            joined(brand, cached['priceJoin'])
+            PROFILE.add_stage(parse.__name__, time.perf_counter() - wall, time.process_time() - cpu,
+                              len(cached['products']), 'products', cached=True)
+            yield brand, cached['products']
+        else:
+            pending[brand] = (parse, key, sources)
+
+    def finish(brand, result, wall, cpu):
+        parse, key, sources = pending[brand]
+        products, report = result if isinstance(result, tuple) else (result, None)
+        if key:
+            cache_store('products', f"{brand}-{key}", {'products': products, 'priceJoin': report})
+        joined(brand, report)
+        PROFILE.add_stage(parse.__name__, wall, cpu, len(products), 'products')
+        # PDFs are timed per file as they are read; another source file gets the
+        # parser's time only when it is the brand's only one
+        for path in sources:
+            if path in PDF_READS:
+                pages, file_wall, file_cpu = PDF_READS.pop(path)
+                PROFILE.add_file('parse', path, file_wall, file_cpu, pages=pages,
+                                 items=len(products) if len(sources) == 1 else None)
+            elif len(sources) == 1:
+                PROFILE.add_file('parse', path, wall, cpu, items=len(products))
+        return brand, products
+
+    # Each parse runs under _profiled(), so its timing is measured where it runs
+    if pool is None:
+        for brand, (parse, _, _) in pending.items():
+            yield finish(brand, *_profiled(parse))
+        return
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as threads:
+        futures = {}
+        for brand, (parse, _, _) in pending.items():
+            if brand == 'elgon':
+                futures[pool.submit(_profiled, parse)] = brand
+            else:
+                futures[threads.submit(_profiled, parse, pool)] = brand
+        for fut in as_completed(futures):
+            yield finish(futures[fut], *fut.result())
+
+
+# Output stages in run order; `run` does all of them unless narrowed down
+STAGES = ('products', 'categories', 'brands', 'blog-posts', 'images')
+STAGE_HELP = {
+    'products': 'parse supplier price lists into products-<brand> files',
+    'categories': 'write categories.json',
+    'brands': 'write brands.json',
+    'blog-posts': 'write blog-posts.json',
+    'images': 'extract catalog images and derivatives into images-manifest.json',
+}
+
+
+def parse_args(argv):
+    """Parse the command line; args.stages is the set of stages to run."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=1,
+                        help='worker processes for parsing and image extraction (default: 1, serial)')
+    common.add_argument('--no-cache', action='store_true',
+                        help='ignore and do not write the extraction cache')
+    common.add_argument('--clear-cache', action='store_true',
+                        help=f'delete {os.path.basename(CACHE_DIR)}/ before running')
+    profile_options = argparse.ArgumentParser(add_help=False)
+    profile_options.add_argument('--profile', action='store_true',
+                                 help=f'time every stage and source file, write {PROFILE_FILE} to the seed data dir')
+
+    brand_options = argparse.ArgumentParser(add_help=False)
+    brand_options.add_argument('--brand', action='append', choices=list(PARSERS),
+                               help='only this supplier\'s price lists and catalogs (repeatable)')
+
+    product_options = argparse.ArgumentParser(add_help=False)
+    product_options.add_argument('--output-format', choices=['json', 'ndjson'], default='json',
+                                 help='product files: pretty-printed JSON arrays (default) or one record per line')
+    product_options.add_argument('--shard-size', type=int, default=0,
+                                 help='with ndjson, start a new file every N products (default: 0, one file)')
+    product_options.add_argument('--gzip', action='store_true',
+                                 help='with ndjson, gzip-compress the product files')
+    product_options.add_argument('--no-dedupe', action='store_true',
+                                 help=f'skip the near-duplicate check across brands ({REPORT_FILE})')
+    product_options.add_argument('--merge-duplicates', action='store_true',
+                                 help='merge near-duplicates of one brand that are at least '
+                                      f'{MERGE_THRESHOLD:.0%} similar, keeping the first parsed')
+    product_options.add_argument('--no-delta', action='store_true',
+                                 help=f'do not diff against the previous product files into {DELTA_FILE}')
+
+    image_options = argparse.ArgumentParser(add_help=False)
+    image_options.add_argument('--image-format', choices=list(IMAGE_FORMATS), default=IMAGE_FORMAT,
+                               help='encoding for images that are not web-ready JPEGs '
+                                    f'(default: {IMAGE_FORMAT}; png decodes every image losslessly)')
+    image_options.add_argument('--image-quality', type=int, default=IMAGE_QUALITY,
+                               help=f'WebP/JPEG quality, 1-100 (default: {IMAGE_QUALITY})')
+    image_options.add_argument('--derivative-quality', type=int, default=DERIVATIVE_QUALITY,
+                               help=f'quality of the responsive WebP/JPEG derivatives (default: {DERIVATIVE_QUALITY})')
+    image_options.add_argument('--no-derivatives', action='store_true',
+                               help='skip generating responsive image derivatives')
+    image_options.add_argument('--keep-decorative', action='store_true',
+                               help='store every catalog image, skipping the decorative-image filter')
+    image_options.add_argument('--keep-image-duplicates', action='store_true',
+                               help='keep near-duplicate images (same picture at another resolution '
+                                    'or compression) as separate files')
+
+    parser = argparse.ArgumentParser(description='Extract HAIR LAB seed data from supplier catalogs.',
+                                     epilog='Without a command, "run" is assumed.')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    run = commands.add_parser('run', help='every stage (default)',
+                              parents=[common, profile_options, brand_options, product_options, image_options])
+    run.add_argument('--only', action='append', choices=STAGES,
+                     help='run just this stage (repeatable)')
+    run.add_argument('--skip-images', action='store_true',
+                     help='skip image extraction and derivatives')
+    stage_parents = {
+        'products': [common, profile_options, brand_options, product_options],
+        'images': [common, profile_options, brand_options, image_options],
+    }
+    for stage in STAGES:
+        commands.add_parser(stage, help=STAGE_HELP[stage], parents=stage_parents.get(stage, [common, profile_options]))
+    seed = commands.add_parser('seed', help='parse products straight into the Payload CMS, brand by brand',
+                               parents=[common, brand_options])
+    seed.add_argument('--seed-threads', type=int, default=SEED_THREADS,
+                      help=f'threads creating products through the API (default: {SEED_THREADS})')
+    seed.add_argument('--queue-size', type=int, default=SEED_QUEUE_SIZE,
+                      help='products parsed ahead of the API before parsing waits '
+                           f'(default: {SEED_QUEUE_SIZE})')
+    seed.add_argument('--save-json', action='store_true',
+                      help='also write the products-<brand>.json files')
+    watch = commands.add_parser('watch', help='re-extract the brand of every supplier file that changes',
+                                parents=[common, product_options, image_options])
+    watch.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                       help=f'seconds between scans of the catalog dir (default: {WATCH_INTERVAL})')
+    watch.add_argument('--settle', type=float, default=WATCH_SETTLE,
+                       help='seconds a changed file must stay unchanged before it is read, '
+                            f'so partially copied files are skipped (default: {WATCH_SETTLE})')
+    watch.add_argument('--skip-images', action='store_true',
+                       help='only re-extract products')
+
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv = ['run', *argv]
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        args.stages = set(args.only or STAGES)
+        if args.skip_images:
+            args.stages.discard('images')
+    elif args.command in ('watch', 'seed'):
+        args.stages = set()  # decided per change / not written
+    else:
+        args.stages = {args.command}
+    args.brand = getattr(args, 'brand', None)
+    args.profile = getattr(args, 'profile', False)
+    return args
+
+
+def merge_manifest(manifest, brands):
+    """Fresh entries of `brands` plus the saved manifest's entries of every other brand."""
+    path = os.path.join(SEED_DIR, 'images-manifest.json')
+    if not brands or not os.path.exists(path):
+        return manifest
+    with open(path, 'r', encoding='utf-8') as f:
+        kept = [entry for entry in json.load(f) if entry['brand'] not in brands]
+    return kept + manifest
+
+
+def extract(args):
+    """Run args.stages (for args.brand, if set) and save their seed-data files."""
+    PROFILE.enabled = args.profile
+    started = time.perf_counter()
+    products = categories = brands = blog_posts = images_manifest = duplicates = None
+
+    # Seed-data files
+    os.makedirs(SEED_DIR, exist_ok=True)
 
-    # Save JSON files
     def save_json(data, filename):
-        path = os.path.join(SEED_DIR, filename)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with PROFILE.stage(f'save {filename}', 'records') as st:
+            write_json(os.path.join(SEED_DIR, filename), data)
+            st['items'] = len(data)
         print(f"  💾 Saved {filename} ({len(data)} items)")
 
-    save_json(elgon, 'products-elgon.json')
-    save_json(mood, 'products-mood.json')
-    save_json(nevitaly, 'products-nevitaly.json')
-    save_json(inebrya, 'products-inebrya.json')
-    save_json(categories, 'categories.json')
-    save_json(brands, 'brands.json')
-    save_json(blog_posts, 'blog-posts.json')
-    save_json(images_manifest, 'images-manifest.json')
+    def save_products(products, name):
+        """Product list as <name>.json, or as NDJSON streamed record by record."""
+        if args.output_format == 'json':
+            save_json(products, f'{name}.json')
+            remove_ndjson(SEED_DIR, name)  # the seeder prefers NDJSON when present
+            return
+        with PROFILE.stage(f'save {name}.ndjson', 'records') as st:
+            with NDJSONWriter(SEED_DIR, name, args.shard_size, args.gzip) as writer:
+                for product in products:
+                    writer.write(product)
+            st['items'] = writer.count
+        files = f"{len(writer.paths)} files" if len(writer.paths) > 1 else os.path.basename(writer.paths[0])
+        print(f"  💾 Saved {name} ({writer.count} items, {files})")
+
+    delta = {} if 'products' in args.stages and not args.no_delta else None
+
+    def keep_saved(brand, items):
+        """True, with a warning, if `items` must not replace the brand's saved products (see lost_source())."""
+        reason = lost_source(brand, items)
+        if reason:
+            print(f"  ⚠ {brand}: {reason}, keeping products-{brand} and its delta as they are")
+        return reason is not None
+
+    def save_brand(brand, items):
+        """Diff a brand's products against the file about to be overwritten, then write it.
+
+        A brand whose source is gone or parsed nothing keeps its file and
+        gets no delta, so none of its products are retired.
+        """
+        if keep_saved(brand, items):
+            return
+        if delta is not None:
+            with PROFILE.stage(f'diff products-{brand}', 'products') as st:
+                delta[brand] = diff_products(load_snapshot(SEED_DIR, f'products-{brand}'), items)
+                st['items'] = len(items)
+        save_products(items, f'products-{brand}')
+
+    needs_pool = args.workers > 1 and args.stages & {'products', 'images'}
+    pool = ProcessPoolExecutor(max_workers=args.workers) if needs_pool else None
+    try:
+        # Parse brands, assign categories and unit prices. Each brand's file is
+        # written as soon as its parser finishes, unless duplicates are to be
+        # merged, which needs every brand first.
+        if 'products' in args.stages:
+            products = {}
+            for brand, items in iter_parsers(pool, args.brand):
+                if keep_saved(brand, items):
+                    continue  # left out of products, so dedupe takes its saved file
+                with PROFILE.stage(f'assign_category {brand}', 'products') as st:
+                    assign_categories(items)
+                    st['items'] = len(items)
+                with PROFILE.stage(f'add_unit_prices {brand}', 'products') as st:
+                    add_unit_prices(items)
+                    st['items'] = len(items)
+                products[brand] = items
+                if not args.merge_duplicates:
+                    save_brand(brand, items)
+            products = {brand: products[brand] for brand in PARSERS if brand in products}
+
+        # Near-duplicates across all brands; brands a --brand run (or a watch
+        # re-extract) didn't parse take part with their saved product files
+        if products is not None and not args.no_dedupe:
+            with PROFILE.stage('find_duplicates', 'products') as st:
+                all_products = [p for brand in PARSERS
+                                for p in (products[brand] if brand in products
+                                          else load_snapshot(SEED_DIR, f'products-{brand}') or [])]
+                clusters = find_duplicates(all_products)
+                duplicates = duplicate_report(all_products, clusters)
+                st['items'] = len(all_products)
+            print(f"🔍 Near-duplicates: {len(clusters)} clusters "
+                  f"({sum(len(members) for members, _ in clusters)} products)")
+            if args.merge_duplicates:
+                # Only parsed products can be dropped; saved files are merged when their brand is extracted
+                parsed = {id(p) for items in products.values() for p in items}
+                kept, dropped = merge_duplicates(
+                    all_products, [c for c in clusters if all(id(all_products[i]) in parsed for i in c[0])])
+                kept_ids = set(map(id, kept))
+                products = {brand: [p for p in items if id(p) in kept_ids] for brand, items in products.items()}
+                duplicates['merged'] = dropped
+                print(f"  🔗 Merged {dropped} duplicate products")
+
+        # Generate supporting data
+        if 'categories' in args.stages:
+            with PROFILE.stage('generate_categories', 'categories') as st:
+                categories = generate_categories()
+                st['items'] = len(categories)
+        if 'brands' in args.stages:
+            with PROFILE.stage('generate_brands', 'brands') as st:
+                brands = generate_brands()
+                st['items'] = len(brands)
+        if 'blog-posts' in args.stages:
+            with PROFILE.stage('generate_blog_posts', 'posts') as st:
+                blog_posts = generate_blog_posts()
+                st['items'] = len(blog_posts)
+
+        # Extract images
+        if 'images' in args.stages:
+            with PROFILE.stage('extract_images', 'images') as st:
+                images_manifest = extract_images(pool, args.image_format, args.image_quality, args.brand,
+                                                 not args.keep_decorative)
+                st['items'] = len(images_manifest)
+            if not args.no_derivatives:
+                with PROFILE.stage('add_derivatives', 'images') as st:
+                    add_derivatives(images_manifest, pool, args.derivative_quality)
+                    st['items'] = len({e['file'] for e in images_manifest if 'file' in e})
+            images_manifest = merge_manifest(images_manifest, args.brand)
+            if not args.keep_image_duplicates:
+                with PROFILE.stage('dedupe_images', 'images') as st:
+                    images_manifest, clusters, repointed = dedupe_manifest(images_manifest)
+                    st['items'] = len(images_manifest)
+                print(f"🔍 Near-duplicate images: {clusters} clusters, "
+                      f"{repointed} occurrences moved to the highest-resolution copy")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Save JSON files
+    if products is not None and args.merge_duplicates:
+        for brand, items in products.items():
+            save_brand(brand, items)
+    if delta is not None:
+        delta = {brand: delta[brand] for brand in products if brand in delta}
+    if products is not None:
+        joined = save_price_joins(products)
+        if joined is not None:
+            print(f"  💾 Saved {PRICE_JOIN_FILE} ({', '.join(joined) or 'no joins'})")
+    if duplicates is not None:
+        write_json(os.path.join(SEED_DIR, REPORT_FILE), duplicates)
+        print(f"  💾 Saved {REPORT_FILE} ({len(duplicates['clusters'])} clusters)")
+    if delta is not None:
+        # Compose with what the seeder hasn't applied yet; other brands' deltas stay
+        pending = load_delta(SEED_DIR)
+        pending = {**pending, **{brand: merge_delta(pending.get(brand), d) for brand, d in delta.items()}}
+        write_json(os.path.join(SEED_DIR, DELTA_FILE), pending)
+        print(f"  💾 Saved {DELTA_FILE} (+{sum(len(d['added']) for d in pending.values())} "
+              f"~{sum(len(d['changed']) for d in pending.values())} "
+              f"-{sum(len(d['removed']) for d in pending.values())} unapplied)")
+    if categories is not None:
+        save_json(categories, 'categories.json')
+    if brands is not None:
+        save_json(brands, 'brands.json')
+    if blog_posts is not None:
+        save_json(blog_posts, 'blog-posts.json')
+    if images_manifest is not None:
+        save_json(images_manifest, 'images-manifest.json')
 
     # Summary
     print("\n" + "=" * 60)
     print("  SUMMARY")
     print("=" * 60)
-    print(f"  Elgon:    {len(elgon)} products")
-    print(f"  MOOD:     {len(mood)} products")
-    print(f"  Nevitaly: {len(nevitaly)} products")
-    print(f"  Inebrya:  {len(inebrya)} products")
-    print(f"  TOTAL:    {len(all_products)} products")
-    print(f"  Images:   {len(images_manifest)} extracted")
-    print(f"  Categories: {sum(1 + len(c.get('children', [])) for c in categories)}")
-    print(f"  Blog posts: {len(blog_posts)}")
+    if products is not None:
+        names = {'elgon': 'Elgon', 'mood': 'MOOD', 'nevitaly': 'Nevitaly', 'inebrya': 'Inebrya'}
+        for brand, items in products.items():
+            print(f"  {names[brand] + ':':9} {len(items)} products")
+        print(f"  TOTAL:    {sum(map(len, products.values()))} products")
+    if duplicates is not None:
+        print(f"  Near-duplicates: {len(duplicates['clusters'])} clusters"
+              + (f", {duplicates['merged']} merged" if 'merged' in duplicates else ''))
+    if delta is not None:
+        for brand, d in delta.items():
+            if d['previous'] is None:
+                print(f"  Δ {brand}: no previous snapshot, {d['current']} added")
+            elif d['added'] or d['changed'] or d['removed']:
+                print(f"  Δ {brand}: +{len(d['added'])} added, ~{len(d['changed'])} changed, "
+                      f"-{len(d['removed'])} removed")
+    if images_manifest is not None:
+        stored = [e['file'] for e in images_manifest if 'file' in e]
+        print(f"  Images:   {len(stored)} extracted ({len(set(stored))} unique, "
+              f"{len(images_manifest) - len(stored)} decorative rejected)")
+    if categories is not None:
+        print(f"  Categories: {sum(1 + len(c.get('children', [])) for c in categories)}")
+    if brands is not None:
+        print(f"  Brands:     {len(brands)}")
+    if blog_posts is not None:
+        print(f"  Blog posts: {len(blog_posts)}")
+    print("=" * 60)
+
+    if args.profile:
+        # Versions of the heavy libraries this run actually imported
+        versions = {name: getattr(sys.modules[module], attr)
+                    for name, module, attr in (('pymupdf', 'fitz', 'VersionBind'), ('pandas', 'pandas', '__version__'))
+                    if module in sys.modules}
+        report = PROFILE.report(
+            time.perf_counter() - started,
+            argv=sys.argv[1:], command=args.command, stages=sorted(args.stages), brands=args.brand,
+            workers=args.workers, cache=USE_CACHE, python=sys.version.split()[0], **versions,
+        )
+        write_json(os.path.join(SEED_DIR, PROFILE_FILE), report)
+        print("\n  PROFILE")
+        PROFILE.print_summary()
+        print(f"  📈 Saved {PROFILE_FILE}")
+        print("=" * 60)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SEED PIPELINE
+# ═══════════════════════════════════════════════════════════════
+# Threads posting products to the CMS, and product groups queued ahead of
+# them: a full queue blocks the parser loop, so a slow API slows extraction
+# down instead of piling products up in memory
+SEED_THREADS = 4
+SEED_QUEUE_SIZE = 32
+
+def load_seeder():
+    """Import seed-payload.py (not importable by name because of the dash)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('seed_payload', os.path.join(BASE_DIR, 'seed-payload.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def product_problem(product, brand_map):
+    """Why a parsed product can't be seeded (no title or handle, bad price, brand not in the CMS), or None."""
+    if not product.get('title'):
+        return 'no title'
+    if not slugify(line_title(product['title'])):
+        return 'no handle'
+    price = product.get('price')
+    if price is not None and (not isinstance(price, (int, float)) or price < 0):
+        return f"bad price {price!r}"
+    if product.get('brand') not in brand_map:
+        return f"unknown brand {product.get('brand')!r}"
+    return None
+
+def seed_pipeline(args):
+    """Parse the supplier price lists and post products to Payload while the other brands still parse.
+
+    Categories and brands are seeded first (from generate_categories() and
+    generate_brands(), not from the JSON files). Then every brand, as soon
+    as its parser finishes, gets categories and unit prices, is validated,
+    grouped into volume variants and queued; args.seed_threads threads
+    create the products through seed-payload.py. The queue holds at most
+    args.queue_size products, and the seeder retries throttled requests, so
+    the API sets the pace. Product files are only written with --save-json.
+    """
+    seeder = load_seeder()
+    started = time.perf_counter()
+    seeder.check_api()
+    seeder.login()
+    print('\n📁 Seeding categories...')
+    category_map = seeder.seed_categories(generate_categories())
+    print('\n🏷️  Seeding brands...')
+    brand_map = seeder.seed_brands(generate_brands())
+
+    print('\n📦 Streaming products...')
+    pending = queue.Queue(maxsize=args.queue_size)
+    counts = Counter()
+    first_product = []  # seconds from start to the first product created
+    lock = threading.Lock()
+
+    def seed_worker():
+        while True:
+            group = pending.get()
+            if group is None:
+                return
+            try:
+                status = seeder.create_product(group, category_map, brand_map)
+            except Exception as e:  # e.g. the connection dropped: lose this product, not the run
+                status = str(e)
+            with lock:
+                if status in ('created', 'skipped'):
+                    counts[status] += 1
+                    if status == 'created' and not first_product:
+                        first_product.append(time.perf_counter() - started)
+                        print(f"    ⏱ First product after {first_product[0]:.1f}s")
+                    if status == 'created' and counts['created'] % 100 == 0:
+                        print(f"    ... {counts['created']} created")
+                else:
+                    counts['errors'] += 1
+                    if counts['errors'] <= 5:
+                        print(f"    ⚠ {group[0]['title'][:50]}: {str(status)[:100]}")
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    threads = [threading.Thread(target=seed_worker, daemon=True) for _ in range(max(1, args.seed_threads))]
+    for thread in threads:
+        thread.start()
+    rows = {}
+    if args.save_json:
+        os.makedirs(SEED_DIR, exist_ok=True)
+    try:
+        for brand, products in iter_parsers(pool, args.brand):
+            assign_categories(products)
+            add_unit_prices(products)
+            valid = []
+            for product in products:
+                problem = product_problem(product, brand_map)
+                if problem is None:
+                    valid.append(product)
+                    continue
+                with lock:
+                    counts['invalid'] += 1
+                    if counts['invalid'] <= 5:
+                        print(f"    ⚠ {brand}: {product.get('title', '')[:50]!r} not seeded: {problem}")
+            if args.save_json:
+                write_json(os.path.join(SEED_DIR, f'products-{brand}.json'), products)
+                remove_ndjson(SEED_DIR, f'products-{brand}')  # the seeder prefers NDJSON when present
+                save_price_joins([brand])
+            groups = group_variants(valid)
+            rows[brand] = len(products)
+            print(f"  📦 {brand}: {len(products)} rows parsed, {len(groups)} products queued")
+            for group in groups:
+                pending.put(group)  # blocks while the seeders are a full queue behind
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 60)
+    print("  SUMMARY")
+    print("=" * 60)
+    print(f"  Rows:     {sum(rows.values())} parsed ({', '.join(f'{b} {n}' for b, n in rows.items())})")
+    print(f"  Products: {counts['created']} created, {counts['skipped']} skipped, "
+          f"{counts['errors']} errors, {counts['invalid']} rows invalid")
+    if first_product:
+        print(f"  First product after {first_product[0]:.1f}s, all done in {elapsed:.1f}s")
+    else:
+        print(f"  Done in {elapsed:.1f}s")
     print("=" * 60)
 
+
+# ═══════════════════════════════════════════════════════════════
+# WATCH MODE
+# ═══════════════════════════════════════════════════════════════
+# Polling (not inotify) so it works the same on every OS and on network shares
+WATCH_INTERVAL = 1.0
+WATCH_SETTLE = 2.0
+
+def scan_catalogs():
+    """{file name: (size, mtime)} of the catalog dir, minus hidden and Office lock files."""
+    with os.scandir(CATALOG_DIR) as entries:
+        return {
+            entry.name: (stat.st_size, stat.st_mtime_ns)
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(('.', '~$'))
+            for stat in (entry.stat(),)
+        }
+
+def catalog_sources():
+    """{brand: set of price list paths its parser reads}, via the same find_* functions."""
+    return {brand: {path for path in locate() if path} for brand, (_, locate, _) in PARSERS.items()}
+
+def changed_brands(names, before, after):
+    """(parser brands, image brands) a set of changed catalog file names affects.
+
+    A parser brand is affected when one of its price lists changed or the
+    set of files its find_* function picks changed (a file added, removed
+    or renamed); an image brand when one of its PDF/PPTX catalogs changed.
+    """
+    paths = {os.path.join(CATALOG_DIR, name) for name in names}
+    products = [brand for brand in PARSERS if before[brand] != after[brand] or after[brand] & paths]
+    images = sorted({catalog_brand(name) for name in names if name.endswith(('.pdf', '.pptx'))})
+    return products, images
+
+def watch(args):
+    """Poll CATALOG_DIR and re-extract only the brands whose files changed.
+
+    A changed file is read once it has kept its size and mtime for
+    args.settle seconds, so a copy in progress is never parsed; changes that
+    settle together are handled in one extraction. A brand with fewer price
+    lists than at its last extraction waits until they are back. Runs until
+    interrupted.
+    """
+    if not os.path.isdir(CATALOG_DIR):
+        print(f"  ⚠ Catalog dir not found: {CATALOG_DIR}")
+        sys.exit(1)
+    print(f"👀 Watching {CATALOG_DIR} (scan every {args.interval:g}s, settle {args.settle:g}s), Ctrl+C to stop")
+    known = scan_catalogs()
+    sources = catalog_sources()
+    pending = {}  # file name -> monotonic time of its last observed change
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = scan_catalogs()
+            now = time.monotonic()
+            for name in current.keys() | known.keys():
+                if current.get(name) != known.get(name):
+                    pending[name] = now
+            known = current
+            if not pending or now - max(pending.values()) < args.settle:
+                continue
+
+            names = sorted(pending)
+            pending.clear()
+            after = catalog_sources()
+            product_brands, image_brands = changed_brands(names, sources, after)
+            # A price list gone mid-rename or re-upload would empty its brand;
+            # it is extracted again once its files are back
+            gone = [brand for brand in product_brands if len(after[brand]) < len(sources[brand])]
+            if gone:
+                product_brands = [brand for brand in product_brands if brand not in gone]
+                after = {**after, **{brand: sources[brand] for brand in gone}}
+            sources = after
+            if args.skip_images:
+                image_brands = []
+            print(f"\n🔄 Changed: {', '.join(names)}")
+            if gone:
+                print(f"  ⚠ Source files missing for {', '.join(gone)}, not re-extracting until they are back")
+            if not product_brands and not image_brands:
+                if not gone:
+                    print("  No parser or image catalog uses these files")
+                continue
+            try:
+                if product_brands:
+                    extract(argparse.Namespace(**{**vars(args), 'stages': {'products'}, 'brand': product_brands}))
+                if image_brands:
+                    extract(argparse.Namespace(**{**vars(args), 'stages': {'images'}, 'brand': image_brands}))
+            except Exception as e:
+                print(f"  ⚠ Extraction failed: {e}")
+            print(f"👀 Watching {CATALOG_DIR}")
+    except KeyboardInterrupt:
+        print("\n  Stopped watching")
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    global USE_CACHE
+    USE_CACHE = not args.no_cache
+    if args.clear_cache:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    print("=" * 60)
+    print("  HAIR LAB — Catalog Data Extraction")
+    print("=" * 60)
+
+    if args.command == 'watch':
+        watch(args)
+    elif args.command == 'seed':
+        seed_pipeline(args)
+    else:
+        extract(args)
+
 if __name__ == '__main__':
     main()
@@ -245,6 +245,16 @@ CREATE TYPE public.enum_products_status AS ENUM (
 );
 
 
+--
+-- Name: enum_products_variants_unit; Type: TYPE; Schema: public; Owner: -
+--
+
+CREATE TYPE public.enum_products_variants_unit AS ENUM (
+    'ml',
+    'g'
+);
+
+
 --
 -- Name: enum_promotions_currency; Type: TYPE; Schema: public; Owner: -
 --
@@ -2006,7 +2016,11 @@ CREATE TABLE public.products_variants (
     inventory numeric DEFAULT 0,
     cost_price numeric,
     supplier_code character varying,
-    article_code character varying
+    article_code character varying,
+    quantity numeric,
+    unit public.enum_products_variants_unit,
+    price_per100 numeric,
+    cost_per100 numeric
 );
 
 
@@ -4706,6 +4720,27 @@ CREATE INDEX products_variants_order_idx ON public.products_variants USING btree
 CREATE INDEX products_variants_parent_id_idx ON public.products_variants USING btree (_parent_id);
 
 
+--
+-- Name: products_variants_price_per100_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX products_variants_price_per100_idx ON public.products_variants USING btree (price_per100);
+
+
+--
+-- Name: products_variants_quantity_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX products_variants_quantity_idx ON public.products_variants USING btree (quantity);
+
+
+--
+-- Name: products_variants_unit_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX products_variants_unit_idx ON public.products_variants USING btree (unit);
+
+
 --
 -- Name: promo_blocks_created_at_idx; Type: INDEX; Schema: public; Owner: -
 --
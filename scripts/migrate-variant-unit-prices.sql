@@ -0,0 +1,16 @@
+-- Migration: product variant volume and unit prices (quantity, unit, price/cost per 100 ml or g)
+-- Run: docker exec -i beauty-postgres psql -U payload_user -d payload < scripts/migrate-variant-unit-prices.sql
+
+DO $$ BEGIN
+  CREATE TYPE enum_products_variants_unit AS ENUM ('ml', 'g');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+ALTER TABLE products_variants ADD COLUMN IF NOT EXISTS quantity numeric;
+ALTER TABLE products_variants ADD COLUMN IF NOT EXISTS unit enum_products_variants_unit;
+ALTER TABLE products_variants ADD COLUMN IF NOT EXISTS price_per100 numeric;
+ALTER TABLE products_variants ADD COLUMN IF NOT EXISTS cost_per100 numeric;
+
+CREATE INDEX IF NOT EXISTS products_variants_quantity_idx ON products_variants USING btree (quantity);
+CREATE INDEX IF NOT EXISTS products_variants_unit_idx ON products_variants USING btree (unit);
+CREATE INDEX IF NOT EXISTS products_variants_price_per100_idx ON products_variants USING btree (price_per100);
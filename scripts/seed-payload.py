@@ -4,15 +4,34 @@
 Seed Payload CMS via REST API for HAIR LAB
 Requires: dev server running at localhost:3200
 
-Usage: python scripts/seed-payload.py
+Usage: python scripts/seed-payload.py [--delta]
+
+Rows that differ only in volume become one product with a variant per size
+(see catalog_variants).
+
+--delta seeds products from products-delta.json (written by
+extract-catalog-data.py) instead of the full product files: new products
+are created (or get the new size as a variant), changed ones patched and
+removed ones marked out of stock. Brands applied without errors are
+removed from the file.
+
+Requests that get a busy answer (429/502/503/504) are retried with
+backoff. `extract-catalog-data.py seed` imports this module to create
+products while the catalogs are still being parsed.
 """
 import sys
 import os
 import json
 import time
-import re
+import argparse
+import threading
 import requests
 
+from catalog_text import slugify, extract_volume
+from catalog_ndjson import iter_records
+from catalog_delta import DELTA_FILE, load_delta
+from catalog_variants import group_variants, iter_variant_runs, line_title
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 BASE_URL = 'http://localhost:3200/api'
@@ -23,8 +42,25 @@ AUTH_TOKEN = None
 HEADERS = {'Content-Type': 'application/json'}
 
 
+# Responses that mean "busy, try again": the server is throttling or restarting
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRIES = 5
+RETRY_DELAY = 0.5  # seconds, doubled on every retry unless the server sends Retry-After
+
+_local = threading.local()
+
+
+def _session():
+    """requests.Session of the calling thread (keeps connections alive between calls)."""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
 def api(method, collection, data=None, params=None):
-    """Make API call to Payload REST API."""
+    """Make API call to Payload REST API; busy responses are retried with backoff."""
+    if method not in ('GET', 'POST', 'PATCH'):
+        raise ValueError(f'Unknown method: {method}')
     url = f'{BASE_URL}/{collection}'
     kwargs = {'headers': HEADERS, 'timeout': 30}
     if params:
@@ -32,14 +68,12 @@ def api(method, collection, data=None, params=None):
     if data:
         kwargs['json'] = data
 
-    if method == 'GET':
-        r = requests.get(url, **kwargs)
-    elif method == 'POST':
-        r = requests.post(url, **kwargs)
-    elif method == 'PATCH':
-        r = requests.patch(url, **kwargs)
-    else:
-        raise ValueError(f'Unknown method: {method}')
+    for attempt in range(MAX_RETRIES + 1):
+        r = _session().request(method, url, **kwargs)
+        if r.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        retry_after = r.headers.get('Retry-After', '')
+        time.sleep(float(retry_after) if retry_after.isdigit() else RETRY_DELAY * 2 ** attempt)
 
     if r.status_code >= 400:
         try:
@@ -89,34 +123,254 @@ def read_json(filename):
         return json.load(f)
 
 
-def slugify(text):
-    tr = {
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
-        'є': 'ye', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'yi', 'й': 'y',
-        'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
-        'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
-        'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'yu', 'я': 'ya', 'ъ': '', 'ы': 'y',
-        'э': 'e', "'": '',
+BRAND_DISPLAY = {
+    'elgon': 'Elgon',
+    'mood': 'MOOD',
+    'nevitaly': 'Nevitaly',
+    'inebrya': 'Inebrya',
+}
+
+# Numeric volume and unit prices from the extractor, stored on the variant
+# (indexed in the Products collection for size and value filters)
+UNIT_FIELDS = ('quantity', 'unit', 'pricePer100', 'costPer100')
+
+
+def product_variant(product):
+    """Payload variant of one extracted row."""
+    variant = {
+        'title': product.get('volume') or 'Стандарт',
+        'sku': product.get('articleCode') or None,
+        'price': product.get('price') or 0,
+        'inStock': product.get('inStock', True),
+        'inventory': 10,
     }
-    lower = text.lower().strip()
-    result = []
-    for ch in lower:
-        if ch in tr:
-            result.append(tr[ch])
-        elif re.match(r'[a-z0-9-]', ch):
-            result.append(ch)
-        elif ch in ' _./':
-            result.append('-')
-    slug = re.sub(r'-+', '-', ''.join(result)).strip('-')
-    return slug[:80]
+    if product.get('costPrice'):
+        variant['costPrice'] = product['costPrice']
+    if product.get('supplierCode'):
+        variant['supplierCode'] = product['supplierCode']
+    if product.get('articleCode'):
+        variant['articleCode'] = product['articleCode']
+    for field in UNIT_FIELDS:
+        if product.get(field) is not None:
+            variant[field] = product[field]
+    return variant
+
+
+def create_product(rows, category_map, brand_map, extend=False):
+    """Create one product from a group of rows (see catalog_variants) unless its handle exists.
+
+    With `extend`, an existing product gets the rows whose SKU it doesn't
+    have yet appended as variants. Returns 'created', 'updated',
+    'skipped' (exists), None (no handle) or the API error.
+    """
+    product = rows[0]
+    title = line_title(product['title'])
+    handle = slugify(title)
+    if not handle:
+        return None
 
+    # Check if exists
+    existing = find_one('products', 'handle', handle)
+    if existing:
+        if not extend:
+            return 'skipped'
+        variants = existing.get('variants') or []
+        skus = {variant.get('sku') for variant in variants}
+        new = [product_variant(row) for row in rows if not row.get('articleCode') or row['articleCode'] not in skus]
+        if not new:
+            return 'skipped'
+        _, err = api('PATCH', f"products/{existing['id']}", {'variants': variants + new})
+        return str(err) if err else 'updated'
+
+    cat_slug = product.get('category', 'doglyad-za-volossynam')
+    cat_id = category_map.get(cat_slug)
+    brand_id = brand_map.get(product['brand'])
+
+    data = {
+        'title': title,
+        'handle': handle,
+        'subtitle': BRAND_DISPLAY.get(product['brand'], product['brand']),
+        'variants': [product_variant(row) for row in rows],
+        'status': 'active',
+    }
+    if cat_id:
+        data['categories'] = [cat_id]
+    if brand_id:
+        data['brand'] = brand_id
+
+    result, err = api('POST', 'products', data)
+    if err:
+        err_str = str(err)
+        if 'duplicate' in err_str.lower() or 'unique' in err_str.lower():
+            return 'skipped'
+        return err_str
+    return 'created'
+
+
+def seed_products(category_map, brand_map):
+    """Create every extracted product that doesn't exist yet, one per group of volume variants.
+
+    Returns the number of products created.
+    """
+    # products-<brand>.json, or NDJSON (sharded/gzipped) if extracted with --output-format ndjson
+    product_files = [
+        'products-elgon',
+        'products-mood',
+        'products-nevitaly',
+        'products-inebrya',
+    ]
 
-def main():
-    print('=' * 60)
-    print('  HAIR LAB — Payload CMS Seed (REST API)')
-    print('=' * 60)
+    product_count = 0
+    skip_count = 0
+    error_count = 0
+
+    for pfile in product_files:
+        brand_name = pfile.replace('products-', '')
+        print(f'  📦 {brand_name}...')
+
+        # Records are streamed: a product is posted once the run of rows of its line ends,
+        # and a line that shows up again later gets those rows added as variants
+        row_count = 0
+        group_count = 0
+        for group, seen in iter_variant_runs(iter_records(SEED_DIR, pfile)):
+            row_count += len(group)
+            group_count += not seen
+            status = create_product(group, category_map, brand_map, extend=seen)
+            if status is None or status == 'updated':
+                continue
+            if status == 'created':
+                product_count += 1
+                if product_count % 100 == 0:
+                    print(f'    ... {product_count} created')
+            elif status == 'skipped':
+                skip_count += 1
+            else:
+                error_count += 1
+                if error_count <= 5:
+                    print(f'    ⚠ {group[0]["title"][:50]}: {status[:100]}')
+
+        print(f'    {brand_name}: {row_count} rows read, {group_count} products')
+
+    print(f'  ✅ Products: {product_count} created, {skip_count} skipped, {error_count} errors')
+    return product_count
+
+
+def find_delta_product(entry):
+    """CMS product and the index of its variant for a changed/removed delta entry.
 
-    # Check API
+    Products are looked up by their volume-free title, then by the full
+    title (products seeded one per row), each also for the previous title.
+    The variant is the one with the entry's SKU, else the one titled with
+    its volume, else the only one.
+    """
+    titles = [entry['title']] + ([entry['previousTitle']] if entry.get('previousTitle') else [])
+    existing = None
+    for handle in dict.fromkeys(slugify(t) for title in titles for t in (line_title(title), title)):
+        existing = find_one('products', 'handle', handle)
+        if existing:
+            break
+    if not existing:
+        return None, None
+    variants = existing.get('variants') or []
+    for i, variant in enumerate(variants):
+        if entry.get('articleCode') and variant.get('sku') == entry['articleCode']:
+            return existing, i
+    volume = extract_volume(entry['title'])
+    for i, variant in enumerate(variants):
+        if volume and variant.get('title') == volume:
+            return existing, i
+    return existing, 0 if len(variants) == 1 else None
+
+
+def update_product(entry, category_map):
+    """Patch the fields a delta entry reports as changed. Returns 'updated', 'missing' or the API error."""
+    existing, index = find_delta_product(entry)
+    if existing is None:
+        return 'missing'
+    changes = {field: new for field, (old, new) in entry['changes'].items()}
+    data = {}
+    variants = existing.get('variants') or []
+    if index is not None and changes.keys() & {'price', 'costPrice', 'volume', *UNIT_FIELDS}:
+        variant = variants[index]
+        if 'price' in changes:
+            variant['price'] = changes['price'] or 0
+        if 'costPrice' in changes and changes['costPrice']:
+            variant['costPrice'] = changes['costPrice']
+        if 'volume' in changes:
+            variant['title'] = changes['volume'] or 'Стандарт'
+        for field in UNIT_FIELDS:
+            if field in changes:
+                variant[field] = changes[field]
+        data['variants'] = variants
+    if 'category' in changes and category_map.get(changes['category']):
+        data['categories'] = [category_map[changes['category']]]
+    if not data:
+        return 'missing'
+    _, err = api('PATCH', f"products/{existing['id']}", data)
+    return str(err) if err else 'updated'
+
+
+def retire_product(entry):
+    """Mark the variant of a product the supplier dropped as out of stock."""
+    existing, index = find_delta_product(entry)
+    if existing is None or index is None:
+        return 'missing'
+    variants = existing['variants']
+    variants[index]['inStock'] = False
+    _, err = api('PATCH', f"products/{existing['id']}", {'variants': variants})
+    return str(err) if err else 'updated'
+
+
+def drop_applied_delta(brand, applied):
+    """Remove a brand's change set from products-delta.json unless an extraction replaced it meanwhile."""
+    delta = load_delta(SEED_DIR)
+    if delta.get(brand) != applied:
+        return
+    del delta[brand]
+    path = os.path.join(SEED_DIR, DELTA_FILE)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2)
+    os.replace(f'{path}.tmp', path)
+
+
+def seed_products_delta(category_map, brand_map):
+    """Apply products-delta.json instead of walking every product; returns the number created.
+
+    A brand applied without errors is removed from the file, the others
+    stay for the next run.
+    """
+    delta = read_json(DELTA_FILE)
+    counts = {'created': 0, 'updated': 0, 'skipped': 0, 'missing': 0, 'errors': 0}
+
+    def count(status, title):
+        if status is None:
+            return
+        if status in counts:
+            counts[status] += 1
+            return
+        counts['errors'] += 1
+        if counts['errors'] <= 5:
+            print(f'    ⚠ {title[:50]}: {status[:100]}')
+
+    for brand_name, d in delta.items():
+        print(f'  📦 {brand_name}: +{len(d["added"])} ~{len(d["changed"])} -{len(d["removed"])}')
+        errors = counts['errors']
+        for group in group_variants(d['added']):
+            count(create_product(group, category_map, brand_map, extend=True), group[0]['title'])
+        for entry in d['changed']:
+            count(update_product(entry, category_map), entry['title'])
+        for entry in d['removed']:
+            count(retire_product(entry), entry['title'])
+        if counts['errors'] == errors:
+            drop_applied_delta(brand_name, d)
+
+    print(f'  ✅ Products: {counts["created"]} created, {counts["updated"]} updated, '
+          f'{counts["skipped"]} skipped, {counts["missing"]} not found, {counts["errors"]} errors')
+    return counts['created']
+
+
+def check_api():
+    """Exit with a hint unless the Payload API answers."""
     try:
         r = requests.get(f'{BASE_URL}/categories?limit=0', timeout=5)
         r.raise_for_status()
@@ -125,14 +379,10 @@ def main():
         print(f'   Make sure dev server is running: cd frontend && npm run dev')
         sys.exit(1)
 
-    login()
 
+def seed_categories(categories_data):
+    """Create missing categories and their children; returns {slug: id} of all of them."""
     category_map = {}  # slug -> id
-    brand_map = {}     # slug -> id
-
-    # ── 1. CATEGORIES ──
-    print('\n📁 Seeding categories...')
-    categories_data = read_json('categories.json')
     cat_count = 0
 
     for cat in categories_data:
@@ -183,10 +433,12 @@ def main():
             api('PATCH', f'categories/{parent_id}', {'subcategories': child_ids})
 
     print(f'  ✅ Categories: {cat_count} created, {len(category_map)} total')
+    return category_map
 
-    # ── 2. BRANDS ──
-    print('\n🏷️  Seeding brands...')
-    brands_data = read_json('brands.json')
+
+def seed_brands(brands_data):
+    """Create missing brands; returns {slug: id} of all of them."""
+    brand_map = {}  # slug -> id
     brand_count = 0
 
     for brand in brands_data:
@@ -215,88 +467,36 @@ def main():
         brand_count += 1
 
     print(f'  ✅ Brands: {brand_count} created')
+    return brand_map
 
-    # ── 3. PRODUCTS ──
-    print('\n📦 Seeding products...')
-    product_files = [
-        'products-elgon.json',
-        'products-mood.json',
-        'products-nevitaly.json',
-        'products-inebrya.json',
-    ]
 
-    brand_display = {
-        'elgon': 'Elgon',
-        'mood': 'MOOD',
-        'nevitaly': 'Nevitaly',
-        'inebrya': 'Inebrya',
-    }
-
-    product_count = 0
-    skip_count = 0
-    error_count = 0
-
-    for pfile in product_files:
-        products = read_json(pfile)
-        brand_name = pfile.replace('products-', '').replace('.json', '')
-        print(f'  📦 {brand_name}: {len(products)} products...')
-
-        for product in products:
-            handle = slugify(product['title'])
-            if not handle:
-                continue
+def main():
+    parser = argparse.ArgumentParser(description='Seed Payload CMS with the extracted HAIR LAB data.')
+    parser.add_argument('--delta', action='store_true',
+                        help=f'seed products from {DELTA_FILE} (new, changed, removed) instead of every product')
+    args = parser.parse_args()
 
-            # Check if exists
-            existing = find_one('products', 'handle', handle)
-            if existing:
-                skip_count += 1
-                continue
+    print('=' * 60)
+    print('  HAIR LAB — Payload CMS Seed (REST API)')
+    print('=' * 60)
 
-            cat_slug = product.get('category', 'doglyad-za-volossynam')
-            cat_id = category_map.get(cat_slug)
-            brand_id = brand_map.get(product['brand'])
+    check_api()
+    login()
 
-            variant = {
-                'title': product.get('volume') or 'Стандарт',
-                'sku': product.get('articleCode') or None,
-                'price': product.get('price') or 0,
-                'inStock': product.get('inStock', True),
-                'inventory': 10,
-            }
-            if product.get('costPrice'):
-                variant['costPrice'] = product['costPrice']
-            if product.get('supplierCode'):
-                variant['supplierCode'] = product['supplierCode']
-            if product.get('articleCode'):
-                variant['articleCode'] = product['articleCode']
-
-            data = {
-                'title': product['title'],
-                'handle': handle,
-                'subtitle': brand_display.get(product['brand'], product['brand']),
-                'variants': [variant],
-                'status': 'active',
-            }
-            if cat_id:
-                data['categories'] = [cat_id]
-            if brand_id:
-                data['brand'] = brand_id
+    # ── 1. CATEGORIES ──
+    print('\n📁 Seeding categories...')
+    category_map = seed_categories(read_json('categories.json'))
 
-            result, err = api('POST', 'products', data)
-            if err:
-                err_str = str(err)
-                if 'duplicate' in err_str.lower() or 'unique' in err_str.lower():
-                    skip_count += 1
-                else:
-                    error_count += 1
-                    if error_count <= 5:
-                        print(f'    ⚠ {product["title"][:50]}: {err_str[:100]}')
-            else:
-                product_count += 1
-                if product_count % 100 == 0:
-                    print(f'    ... {product_count} created')
+    # ── 2. BRANDS ──
+    print('\n🏷️  Seeding brands...')
+    brand_map = seed_brands(read_json('brands.json'))
 
-    print(f'  ✅ Products: {product_count} created, {skip_count} skipped, {error_count} errors')
+    # ── 3. PRODUCTS ──
+    print('\n📦 Seeding products...')
+    if args.delta:
+        product_count = seed_products_delta(category_map, brand_map)
+    else:
+        product_count = seed_products(category_map, brand_map)
 
     # ── 4. BLOG POSTS ──
     print('\n📝 Seeding blog posts...')
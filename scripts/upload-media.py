@@ -9,18 +9,33 @@ import sys
 import os
 import json
 import time
+import shutil
+import mimetypes
 import requests
 from PIL import Image
 
+from catalog_images import make_derivatives
+from catalog_phash import ImageIndex, file_image
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 BASE_URL = 'http://localhost:3200/api'
 SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed-data')
 IMAGES_DIR = os.path.join(SEED_DIR, 'images')
+DERIVATIVES_DIR = os.path.join(IMAGES_DIR, 'derivatives')
+# Served by nginx at /media/derivatives/ with immutable cache headers
+MEDIA_DERIVATIVES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'media', 'derivatives')
+MEDIA_DERIVATIVES_URL = '/media/derivatives'
 
 AUTH_TOKEN = None
 HEADERS = {}  # No Content-Type for multipart uploads
 
+# Payload media id -> derivative set, saved to seed-data/media-derivatives.json
+MEDIA_DERIVATIVES = {}
+# Image file -> upload result; picks that resolve to the same image upload it once
+UPLOADED = {}
+
 
 def api_json(method, path, data=None, params=None):
     """JSON API call."""
@@ -52,15 +67,35 @@ def api_json(method, path, data=None, params=None):
     return r.json(), None
 
 
+def publish_derivatives(filepath):
+    """Generate (or reuse) the responsive derivatives of an image and copy them to frontend/media.
+
+    Returns {size: {width, height, webp, jpeg}} with /media/derivatives/ URLs.
+    """
+    derivatives = make_derivatives(filepath, DERIVATIVES_DIR)
+    for spec in derivatives.values():
+        for image_format in ('webp', 'jpeg'):
+            rel = spec[image_format]
+            dest = os.path.join(MEDIA_DERIVATIVES_DIR, rel)
+            if not os.path.exists(dest):  # names are content-addressed
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                shutil.copyfile(os.path.join(DERIVATIVES_DIR, rel), dest)
+            spec[image_format] = f'{MEDIA_DERIVATIVES_URL}/{rel}'
+    return derivatives
+
+
 def upload_media(filepath, alt_text):
-    """Upload image file to Payload media collection."""
+    """Upload image file to Payload media collection (once per file; repeats reuse the first upload)."""
+    if filepath in UPLOADED:
+        return UPLOADED[filepath], None
     url = f'{BASE_URL}/media'
     headers = {}
     if AUTH_TOKEN:
         headers['Authorization'] = f'JWT {AUTH_TOKEN}'
 
     with open(filepath, 'rb') as f:
-        files = {'file': (os.path.basename(filepath), f, 'image/png')}
+        mime = mimetypes.guess_type(filepath)[0] or 'image/png'
+        files = {'file': (os.path.basename(filepath), f, mime)}
         data = {'alt': alt_text}
         r = requests.post(url, headers=headers, files=files, data=data, timeout=60)
 
@@ -70,7 +105,13 @@ def upload_media(filepath, alt_text):
         except Exception:
             err = r.text[:300]
         return None, err
-    return r.json(), None
+    result = r.json()
+    UPLOADED[filepath] = result
+    try:
+        MEDIA_DERIVATIVES[str(result['doc']['id'])] = publish_derivatives(filepath)
+    except Exception as e:
+        print(f'    Derivatives failed: {e}')
+    return result, None
 
 
 def find_one(collection, field, value):
@@ -112,9 +153,60 @@ def login():
     return True
 
 
+def load_manifest():
+    """Entries of images-manifest.json, [] if images weren't extracted."""
+    path = os.path.join(SEED_DIR, 'images-manifest.json')
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_image_index(manifest):
+    """Map (brand, occurrence name) -> stored image path from images-manifest.json.
+
+    Extracted images are content-addressed blobs (JPEG, WebP or PNG); the
+    manifest keeps the original '<catalog>_p<page>_img<n>.png' name of every
+    occurrence, already pointing at the highest-resolution copy of
+    near-duplicates. Images the extractor rejected as decorative have no
+    file and are left out.
+    """
+    return {
+        (entry['brand'], entry['name']): os.path.join(SEED_DIR, entry['file'])
+        for entry in manifest if 'name' in entry and 'file' in entry
+    }
+
+
+def load_phash_index(manifest):
+    """Perceptual-hash index of the stored images (absolute paths in 'file')."""
+    images = {}
+    for entry in manifest:
+        if entry.get('file') and entry.get('phash'):
+            images.setdefault(entry['file'], {**entry, 'file': os.path.join(SEED_DIR, entry['file'])})
+    return ImageIndex(images.values())
+
+
+MANIFEST = load_manifest()
+IMAGE_INDEX = load_image_index(MANIFEST)
+PHASH_INDEX = load_phash_index(MANIFEST)
+
+
 def img_path(brand, filename):
-    """Get full path to image."""
-    return os.path.join(IMAGES_DIR, brand, filename)
+    """Get full path to image.
+
+    Names missing from the manifest fall back to images/<brand>/, replaced by
+    a higher-resolution near-duplicate from the manifest when there is one.
+    """
+    path = IMAGE_INDEX.get((brand, filename))
+    if path:
+        return path
+    path = os.path.join(IMAGES_DIR, brand, filename)
+    if MANIFEST and os.path.exists(path):
+        try:
+            return PHASH_INDEX.best(file_image(path))['file']
+        except Exception:
+            pass
+    return path
 
 
 def main():
@@ -301,7 +393,7 @@ def main():
     # Upload all product images
     uploaded_product_images = []  # list of {media_id, brand, keywords, alt}
     for i, pimg in enumerate(product_images):
-        filepath = os.path.join(IMAGES_DIR, pimg['file'])
+        filepath = img_path(*pimg['file'].split('/', 1))
         if not os.path.exists(filepath):
             print(f'  Skip (not found): {pimg["file"]}')
             continue
@@ -630,8 +722,12 @@ def main():
     print(f'  Products updated:   {assigned}')
     print(f'  Blog posts:         {blog_count}')
     print(f'  Homepage banners:   {banner_count}')
+    print(f'  Derivative sets:    {len(MEDIA_DERIVATIVES)}')
     print('=' * 60)
 
+    with open(os.path.join(SEED_DIR, 'media-derivatives.json'), 'w', encoding='utf-8') as f:
+        json.dump(MEDIA_DERIVATIVES, f, ensure_ascii=False, indent=2)
+
 
 if __name__ == '__main__':
     main()